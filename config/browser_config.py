@@ -1,11 +1,16 @@
 """
 Browser Configuration
-Reads browser types, versions, and capabilities from JSON file
+Reads browser types, versions, and capabilities from JSON file, and merges them with the Settings
+env vars and a named launch profile into the launch/context options every browser is started with
 """
 
 import json
+import os
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+from config.settings import Settings
 
 # Default path to browser config JSON file
 _DEFAULT_CONFIG_JSON_PATH = Path(__file__).parent / "browser_config.json"
@@ -13,14 +18,121 @@ _DEFAULT_CONFIG_JSON_PATH = Path(__file__).parent / "browser_config.json"
 # Available browsers in Playwright
 BROWSERS = ["chromium", "firefox", "webkit"]
 
+# Capabilities that are BrowserType.launch() options; the rest (e.g. blocking_profile) are ours
+LAUNCH_OPTION_KEYS = ("headless", "slow_mo", "args", "channel", "chromium_sandbox", "devtools", "timeout",
+                      "firefox_user_prefs", "ignore_default_args", "env", "proxy")
+
+_CI_VIEWPORT = {"viewport": {"width": 1280, "height": 720}, "device_scale_factor": 1, "reduced_motion": "reduce"}
+
+# Launch and context options per profile and browser. "default" keeps Playwright's defaults.
+# "ci" is for headless runs on CI agents: Playwright already disables extensions, background
+# networking and first-run work, so it adds no GPU, /tmp instead of the small /dev/shm of containers,
+# no smooth scrolling or telemetry, and a smaller viewport to paint.
+LAUNCH_PROFILES: Dict[str, Dict[str, Dict[str, Dict[str, Any]]]] = {
+    "default": {},
+    "ci": {
+        "chromium": {
+            "launch": {
+                "headless": True,
+                "args": ["--disable-gpu", "--disable-dev-shm-usage", "--disable-smooth-scrolling"],
+            },
+            "context": _CI_VIEWPORT,
+        },
+        "firefox": {
+            "launch": {
+                "headless": True,
+                "firefox_user_prefs": {
+                    "general.smoothScroll": False,
+                    "toolkit.telemetry.enabled": False,
+                    "datareporting.healthreport.uploadEnabled": False,
+                    "browser.safebrowsing.malware.enabled": False,
+                    "browser.safebrowsing.phishing.enabled": False,
+                },
+            },
+            "context": _CI_VIEWPORT,
+        },
+        "webkit": {
+            "launch": {"headless": True},
+            "context": _CI_VIEWPORT,
+        },
+    },
+}
+
+# Parsed JSON per file, with the modification time it was read at
+_config_cache: Dict[Path, Tuple[int, Any]] = {}
+
+
+@dataclass(frozen=True)
+class BrowserProfile:
+    """Everything needed to start one browser: merged launch and context options, and the blocking profile"""
+
+    browser_name: str
+    launch_profile: str
+    launch_options: Dict[str, Any] = field(default_factory=dict)
+    context_options: Dict[str, Any] = field(default_factory=dict)
+    blocking_profile: str = "none"
+
+
+def _validate_browser_config(config: Any, json_path: Path):
+    """Raise ValueError listing every malformed entry of a browser config JSON"""
+
+    entries = config.get("browsers") if isinstance(config, dict) else config
+    errors = []
+
+    if not isinstance(entries, list):
+        raise ValueError(f"{json_path}: expected a list of browser entries or {{\"browsers\": [...]}}")
+
+    for i, entry in enumerate(entries):
+        where = f"entry {i}"
+
+        if not isinstance(entry, dict) or not isinstance(entry.get("name"), str):
+            errors.append(f"{where}: must be an object with a 'name'")
+            continue
+
+        where = f"entry '{entry['name']}'"
+        browser_name = entry.get("browser_name", entry["name"])
+
+        if browser_name not in BROWSERS:
+            errors.append(f"{where}: browser_name '{browser_name}' is not one of {', '.join(BROWSERS)}")
+
+        for key in ("capabilities", "context"):
+            if not isinstance(entry.get(key, {}), dict):
+                errors.append(f"{where}: '{key}' must be an object")
+
+        capabilities = entry.get("capabilities") if isinstance(entry.get("capabilities"), dict) else {}
+
+        if not isinstance(capabilities.get("headless", False), bool):
+            errors.append(f"{where}: 'headless' must be true or false")
+
+        slow_mo = capabilities.get("slow_mo", 0)
+
+        if isinstance(slow_mo, bool) or not isinstance(slow_mo, int) or slow_mo < 0:
+            errors.append(f"{where}: 'slow_mo' must be a non-negative integer")
+
+        if not isinstance(capabilities.get("args", []), list):
+            errors.append(f"{where}: 'args' must be a list")
+
+        if capabilities.get("launch_profile", "default") not in LAUNCH_PROFILES:
+            errors.append(f"{where}: unknown launch_profile '{capabilities['launch_profile']}'")
+
+    if errors:
+        raise ValueError(f"Invalid browser configuration in {json_path}:\n  " + "\n  ".join(errors))
+
 
 def load_browser_config(config_path: Optional[str] = None) -> Dict:
+    """
+    Parsed and validated browser config JSON. The file is only read again after it changed on disk,
+    so the result is shared between callers and must not be modified.
+    """
+
     if config_path:
         json_path = Path(config_path)
     else:
         json_path = _DEFAULT_CONFIG_JSON_PATH
-    
-    if not json_path.exists():
+
+    try:
+        mtime = json_path.stat().st_mtime_ns
+    except FileNotFoundError:
         # Return default configuration if file doesn't exist
         return {
             "browsers": [
@@ -31,69 +143,167 @@ def load_browser_config(config_path: Optional[str] = None) -> Dict:
                 }
             ]
         }
-    
+
+    cached = _config_cache.get(json_path)
+
+    if cached and cached[0] == mtime:
+        return cached[1]
+
     try:
         with open(json_path, 'r') as f:
             config = json.load(f)
-            
-        return config
     except (json.JSONDecodeError, IOError) as e:
         raise ValueError(f"Error loading browser configuration from {json_path}: {e}")
 
+    _validate_browser_config(config, json_path)
+    _config_cache[json_path] = (mtime, config)
+
+    return config
+
 
 def get_browsers_from_config(config_path: Optional[str] = None):
     """
     Get list of browser names from JSON configuration
-    
+
     Args:
         config_path: Optional path to JSON file. If None, uses default.
-    
+
     Returns:
         list: List of browser names to run tests against
     """
     config = load_browser_config(config_path)
-    
+
     if config:
         return config
-    
+
     raise ValueError("No browsers configured")
 
 
 def get_browser_config(browser_name: str, config_path: Optional[str] = None) -> Optional[Dict]:
     """
     Get configuration for a specific browser from JSON config
-    
+
     Args:
         browser_name: Name of the browser (chromium, firefox, webkit)
         config_path: Optional path to JSON file. If None, uses default.
-    
+
     Returns:
         dict: Browser configuration with name, version, and capabilities, or None if not found
     """
     config = load_browser_config(config_path)
-    
-    if "browsers" in config:
-        for browser_config in config["browsers"]:
-            if browser_config.get("name") == browser_name:
-                return browser_config
-    
+
+    # The JSON file is either a list of browser entries or {"browsers": [...]}
+    browser_configs = config.get("browsers", []) if isinstance(config, dict) else config
+
+    for browser_config in browser_configs:
+        if browser_name in (browser_config.get("name"), browser_config.get("browser_name")):
+            return browser_config
+
     return None
 
 
 def get_browser_capabilities(browser_name: str, config_path: Optional[str] = None) -> Dict:
     """
     Get capabilities for a specific browser from JSON config
-    
+
     Args:
         browser_name: Name of the browser (chromium, firefox, webkit)
         config_path: Optional path to JSON file. If None, uses default.
-    
+
     Returns:
         dict: Browser capabilities (launch args and context args)
     """
     browser_config = get_browser_config(browser_name, config_path)
-    
+
     if browser_config and "capabilities" in browser_config:
         return browser_config["capabilities"]
-    
+
     return {}
+
+
+def resolve_launch_profile(browser_name: Optional[str] = None, config_path: Optional[str] = None) -> str:
+    """
+    Name of the launch profile to use: LAUNCH_PROFILE env var first, then the 'launch_profile'
+    capability of the browser in config/browser_config.json, then 'default'
+    """
+
+    if Settings.LAUNCH_PROFILE:
+        return Settings.LAUNCH_PROFILE
+
+    capabilities = get_browser_capabilities(browser_name or Settings.BROWSER, config_path)
+
+    return capabilities.get("launch_profile", "default")
+
+
+def _merge_options(base: Dict[str, Any], overrides: Dict[str, Any]) -> Dict[str, Any]:
+    """Shallow merge where 'args' lists are concatenated (without duplicates) and prefs dicts combined"""
+
+    merged = dict(base)
+
+    for key, value in overrides.items():
+        if key == "args":
+            merged[key] = list(dict.fromkeys(merged.get(key, []) + list(value)))
+        elif key == "firefox_user_prefs":
+            merged[key] = {**merged.get(key, {}), **value}
+        else:
+            merged[key] = value
+
+    return merged
+
+
+def get_browser_profile(browser_name: Optional[str] = None,
+                        launch_profile: Optional[str] = None,
+                        config_path: Optional[str] = None) -> BrowserProfile:
+    """
+    Launch and context options for a browser, from lowest to highest precedence: Settings defaults,
+    the launch profile, the browser's entry in the JSON config, then HEADLESS / SLOW_MO env vars
+    when they are set. A headless setting of the launch profile beats the JSON config.
+
+    Args:
+        browser_name: chromium, firefox or webkit (default from settings)
+        launch_profile: Name from LAUNCH_PROFILES (default: resolve_launch_profile)
+        config_path: Optional path to JSON file. If None, uses default.
+
+    Returns:
+        BrowserProfile
+    """
+
+    browser_name = browser_name or Settings.BROWSER
+
+    if browser_name not in BROWSERS:
+        raise ValueError(f"Unsupported browser: {browser_name}. Use 'chromium', 'firefox', or 'webkit'")
+
+    launch_profile = launch_profile or resolve_launch_profile(browser_name, config_path)
+
+    if launch_profile not in LAUNCH_PROFILES:
+        raise ValueError(f"Unknown launch profile: {launch_profile}. Use one of: {', '.join(LAUNCH_PROFILES)}")
+
+    profile = LAUNCH_PROFILES[launch_profile].get(browser_name, {})
+    browser_config = get_browser_config(browser_name, config_path) or {}
+    capabilities = browser_config.get("capabilities", {})
+
+    launch_options = _merge_options({"headless": Settings.HEADLESS, "slow_mo": Settings.SLOW_MO},
+                                    profile.get("launch", {}))
+    launch_options = _merge_options(launch_options,
+                                    {key: value for key, value in capabilities.items() if key in LAUNCH_OPTION_KEYS})
+
+    # Headless is what a profile like "ci" is chosen for, so the file's default doesn't undo it
+    if "headless" in profile.get("launch", {}):
+        launch_options["headless"] = profile["launch"]["headless"]
+
+    # An env var (or .env entry) the user set beats the file
+    if "HEADLESS" in os.environ:
+        launch_options["headless"] = Settings.HEADLESS
+
+    if "SLOW_MO" in os.environ:
+        launch_options["slow_mo"] = Settings.SLOW_MO
+
+    context_options = {**profile.get("context", {}), **browser_config.get("context", {})}
+
+    return BrowserProfile(
+        browser_name=browser_name,
+        launch_profile=launch_profile,
+        launch_options=launch_options,
+        context_options=context_options,
+        blocking_profile=capabilities.get("blocking_profile", "none"),
+    )
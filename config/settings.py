@@ -10,10 +10,87 @@ class Settings:
     BROWSER = os.getenv("BROWSER", "chromium").lower()  # chromium, firefox, webkit
     HEADLESS = os.getenv("HEADLESS", "false").lower() == "true"
     SLOW_MO = int(os.getenv("SLOW_MO", "0"))  # Slow down operations by milliseconds
+    # Launch/context profile from config/browser_config.py: default, ci
+    # (empty = use the browser's "launch_profile" capability from browser_config.json)
+    LAUNCH_PROFILE = os.getenv("LAUNCH_PROFILE", "").lower()
     
     # Timeouts
     NAVIGATION_TIMEOUT = int(os.getenv("NAVIGATION_TIMEOUT", "30000"))  # milliseconds
     ACTION_TIMEOUT = int(os.getenv("ACTION_TIMEOUT", "10000"))  # milliseconds
+
+    # Wait for all fallback selectors at once instead of one after another
+    FALLBACK_RACE = os.getenv("FALLBACK_RACE", "true").lower() == "true"
+
+    # Modal handling
+    MODAL_DISMISS_BUDGET = int(os.getenv("MODAL_DISMISS_BUDGET", "3000"))  # milliseconds per dismissal
+    MODAL_APPEAR_TIMEOUT = int(os.getenv("MODAL_APPEAR_TIMEOUT", "0"))  # milliseconds to wait for a late modal
+    MODAL_HANDLER_MAX_TRIGGERS = int(os.getenv("MODAL_HANDLER_MAX_TRIGGERS", "3"))  # per pattern and page
     
+    # Network blocking profile: none, media, third-party, aggressive
+    # (empty = use the browser's "blocking_profile" capability from browser_config.json)
+    BLOCKING_PROFILE = os.getenv("BLOCKING_PROFILE", "").lower()
+
+    # HAR record/replay: off, record, replay (per session, also --har-mode)
+    HAR_MODE = os.getenv("HAR_MODE", "off").lower()
+    HAR_DIR = os.getenv("HAR_DIR", "har")
+
+    # Storage state snapshot (cookies/localStorage after consent) shared by all contexts
+    STORAGE_STATE_CACHE = os.getenv("STORAGE_STATE_CACHE", "true").lower() == "true"
+    STORAGE_STATE_DIR = os.getenv("STORAGE_STATE_DIR", ".storage_state")
+    STORAGE_STATE_MAX_AGE = int(os.getenv("STORAGE_STATE_MAX_AGE", "3600"))  # seconds
+
+    # Context pool (opt-in through the pooled_context / pooled_page fixtures)
+    CONTEXT_POOL_SIZE = int(os.getenv("CONTEXT_POOL_SIZE", "2"))  # contexts created up front
+    CONTEXT_POOL_MAX_USES = int(os.getenv("CONTEXT_POOL_MAX_USES", "20"))  # tests per context before it is replaced
+
+    # pytest -n: run tests longest-first (durations of earlier runs) with each browser pinned to its own workers
+    # (opt out with --no-duration-scheduling)
+    XDIST_DURATION_SCHEDULING = os.getenv("XDIST_DURATION_SCHEDULING", "true").lower() == "true"
+
+    # Warm browser servers shared by pytest invocations (opt in with --browser-server; see utils/browser_server.py)
+    BROWSER_SERVER = os.getenv("BROWSER_SERVER", "false").lower() == "true"
+    BROWSER_SERVER_DIR = os.getenv("BROWSER_SERVER_DIR", ".browser_server")
+    BROWSER_SERVER_BROWSERS = os.getenv("BROWSER_SERVER_BROWSERS", "chromium,firefox,webkit").lower().split(",")
+    BROWSER_SERVER_IDLE_TIMEOUT = int(os.getenv("BROWSER_SERVER_IDLE_TIMEOUT", "1800"))  # seconds without a session
+
+    # Selenium Grid sessions (used when SELENIUM_REMOTE_URL is set)
+    GRID_SESSION_POOL_SIZE = int(os.getenv("GRID_SESSION_POOL_SIZE", "1"))  # at least one per xdist worker
+    GRID_SESSION_MAX_USES = int(os.getenv("GRID_SESSION_MAX_USES", "0"))  # 0 = no limit
+    GRID_HTTP_TIMEOUT = int(os.getenv("GRID_HTTP_TIMEOUT", "30"))  # seconds
+
+    # Screenshots: never, on-failure, sampled, always
+    SCREENSHOT_POLICY = os.getenv("SCREENSHOT_POLICY", "on-failure").lower()
+    SCREENSHOT_FORMAT = os.getenv("SCREENSHOT_FORMAT", "jpeg").lower()  # jpeg, png
+    SCREENSHOT_QUALITY = int(os.getenv("SCREENSHOT_QUALITY", "70"))  # jpeg only
+    SCREENSHOT_SAMPLE_RATE = float(os.getenv("SCREENSHOT_SAMPLE_RATE", "0.2"))  # share of step captures kept by 'sampled'
+    SCREENSHOT_FULL_PAGE = os.getenv("SCREENSHOT_FULL_PAGE", "false").lower() == "true"
+
+    # Per-test timing of page-object methods and Playwright calls (Allure + reports/timings.json)
+    INSTRUMENTATION = os.getenv("INSTRUMENTATION", "true").lower() == "true"
+
+    # Micro-benchmarks (tests/benchmarks, run with --benchmark)
+    BENCHMARK_ITERATIONS = int(os.getenv("BENCHMARK_ITERATIONS", "50"))
+    BENCHMARK_WARMUP = int(os.getenv("BENCHMARK_WARMUP", "3"))
+    BENCHMARK_REGRESSION_THRESHOLD = float(os.getenv("BENCHMARK_REGRESSION_THRESHOLD", "0.25"))  # 0.25 = 25% slower fails
+    BENCHMARK_STRICT = os.getenv("BENCHMARK_STRICT", "false").lower() == "true"  # a benchmark without a baseline fails
+
+    # Search
+    SEARCH_BULK_EXTRACTION = os.getenv("SEARCH_BULK_EXTRACTION", "true").lower() == "true"
+    SEARCH_DIRECT_URL = os.getenv("SEARCH_DIRECT_URL", "true").lower() == "true"  # open results by URL, not the search box
+    SEARCH_ITEMS_PER_PAGE = int(os.getenv("SEARCH_ITEMS_PER_PAGE", "60"))  # _ipg: 60, 120 or 240
+    SEARCH_SORT = int(os.getenv("SEARCH_SORT", "15"))  # _sop: 15 = price + shipping lowest first, 12 = best match
+    SEARCH_PREFETCH_PAGES = int(os.getenv("SEARCH_PREFETCH_PAGES", "3"))  # further result pages loading in parallel tabs; 0 = one by one
+    SEARCH_ENGINE = os.getenv("SEARCH_ENGINE", "browser").lower()  # browser, or http (result HTML without rendering)
+
+    # Search result cache shared by all tests, browsers and xdist workers of a run (opt out with --no-search-cache
+    # or the no_search_cache marker)
+    SEARCH_CACHE = os.getenv("SEARCH_CACHE", "true").lower() == "true"
+    SEARCH_CACHE_DIR = os.getenv("SEARCH_CACHE_DIR", ".search_cache")
+    SEARCH_CACHE_TTL = int(os.getenv("SEARCH_CACHE_TTL", "0"))  # seconds later runs may reuse results; 0 = this run only
+    SEARCH_CACHE_MAX_ENTRIES = int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "50"))
+
+    # Cart
+    CART_CONCURRENCY = int(os.getenv("CART_CONCURRENCY", "3"))  # product pages loading in parallel tabs
+
     # Test URLs
     BASE_URL = os.getenv("BASE_URL", "https://example.com")
@@ -0,0 +1,105 @@
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Callable, Generator, List
+
+import allure
+import pytest
+from playwright.sync_api import Browser, Page
+
+from utils.benchmark import BenchmarkBaseline, BenchmarkResult, run_benchmark
+
+logger = logging.getLogger(__name__)
+
+BENCHMARKS_DIR = Path(__file__).parent
+FIXTURES_DIR = BENCHMARKS_DIR / "fixtures"
+BASELINE_PATH = BENCHMARKS_DIR / "baseline.json"
+
+
+@pytest.fixture(autouse=True)
+def step_timings():
+    """Per-test instrumentation is off here, so it doesn't add to the measured times"""
+
+    yield None
+
+
+@pytest.fixture(scope="session")
+def benchmark_baseline(pytestconfig) -> Generator[BenchmarkBaseline, None, None]:
+    """Stored baseline; rewritten at the end of the run with --benchmark-save-baseline"""
+
+    baseline = BenchmarkBaseline(str(BASELINE_PATH))
+
+    yield baseline
+
+    if pytestconfig.getoption("--benchmark-save-baseline"):
+        baseline.save()
+        logger.info(f"Benchmark baseline saved to {BASELINE_PATH}")
+
+
+@pytest.fixture(scope="session")
+def benchmark_results() -> Generator[List[BenchmarkResult], None, None]:
+    """Results of this run, written to reports/benchmarks[_gwN].json"""
+
+    results: List[BenchmarkResult] = []
+
+    yield results
+
+    if results:
+        worker_id = os.getenv("PYTEST_XDIST_WORKER")
+        path = f"reports/benchmarks{f'_{worker_id}' if worker_id else ''}.json"
+        os.makedirs("reports", exist_ok=True)
+
+        with open(path, "w") as f:
+            json.dump({result.name: result.to_dict() for result in results}, f, indent=2)
+
+
+@pytest.fixture(scope="module")
+def offline_page(browser: Browser) -> Generator[Page, None, None]:
+    """Page in a context that aborts every network request; content comes from set_content only"""
+
+    context = browser.new_context()
+    context.route("**/*", lambda route: route.abort("internetdisconnected"))
+    page = context.new_page()
+
+    yield page
+
+    context.close()
+
+
+@pytest.fixture
+def load_snapshot(offline_page: Page) -> Callable[[str], Page]:
+    """Load one of the saved HTML snapshots (home, search, item, cart) into the offline page"""
+
+    def load(name: str) -> Page:
+        offline_page.set_content((FIXTURES_DIR / f"{name}.html").read_text(encoding="utf-8"))
+        return offline_page
+
+    return load
+
+
+@pytest.fixture
+def bench(pytestconfig,
+          playwright_browser_name: str,
+          benchmark_baseline: BenchmarkBaseline,
+          benchmark_results: List[BenchmarkResult]) -> Callable[..., BenchmarkResult]:
+    """
+    Run a benchmark, record it and fail on a regression against the baseline (or, with
+    --benchmark-strict, on a missing baseline entry). Results are keyed by '<name>[<browser>]'.
+    """
+
+    def run(name: str, func: Callable[[], object], iterations: int = None) -> BenchmarkResult:
+        result = run_benchmark(f"{name}[{playwright_browser_name}]", func, iterations=iterations)
+        benchmark_results.append(result)
+        allure.attach(str(result), name="Benchmark", attachment_type=allure.attachment_type.TEXT)
+
+        if pytestconfig.getoption("--benchmark-save-baseline"):
+            benchmark_baseline.update(result)
+            return result
+
+        regression = benchmark_baseline.compare(result, strict=pytestconfig.getoption("--benchmark-strict"))
+        assert regression is None, regression
+
+        return result
+
+    return run
@@ -0,0 +1,94 @@
+import allure
+import pytest
+
+from tests.benchmarks.conftest import FIXTURES_DIR
+from tests.pages.ebay_page import EbayPage
+
+pytestmark = [pytest.mark.benchmark, allure.epic("Benchmarks")]
+
+
+@allure.feature("Fallback Selectors")
+@pytest.mark.parametrize("race", [True, False], ids=["race", "sequential"])
+def test_benchmark_find_element_with_fallback(load_snapshot, bench, race: bool):
+    """First selector matches: cost of the fallback machinery itself"""
+
+    ebay_page = EbayPage(load_snapshot("home"))
+
+    bench(f"find_element_with_fallback[{'race' if race else 'sequential'}]",
+          lambda: ebay_page.find_element_with_fallback(ebay_page.SEARCH_INPUT_XPATH, ebay_page.SEARCH_INPUT_CSS,
+                                                       race=race))
+
+
+@allure.feature("Fallback Selectors")
+@pytest.mark.parametrize("race", [True, False], ids=["race", "sequential"])
+def test_benchmark_find_element_with_stale_first_selector(load_snapshot, bench, race: bool):
+    """First selector is stale: the sequential path pays its full timeout before trying the next one"""
+
+    ebay_page = EbayPage(load_snapshot("home"))
+
+    bench(f"find_element_with_fallback_stale_first[{'race' if race else 'sequential'}]",
+          lambda: ebay_page.find_element_with_fallback("//input[@id='gh-ac-retired']", ebay_page.SEARCH_INPUT_CSS,
+                                                       timeout=200, race=race),
+          iterations=10)
+
+
+@allure.feature("Homepage Navigation")
+def test_benchmark_get_cart_count(load_snapshot, bench):
+    ebay_page = EbayPage(load_snapshot("home"))
+
+    bench("get_cart_count", ebay_page.get_cart_count)
+
+
+@allure.feature("Search with Price Filter")
+@pytest.mark.parametrize("bulk", [True, False], ids=["bulk", "per-item"])
+def test_benchmark_extract_search_results(load_snapshot, bench, bulk: bool):
+    """Reading the 60 result items of a search page"""
+
+    ebay_page = EbayPage(load_snapshot("search"))
+    extract = ebay_page.extract_search_results if bulk else ebay_page._extract_search_results_per_item
+
+    assert len(extract()) == 60
+
+    bench(f"extract_search_results[{'bulk' if bulk else 'per-item'}]", extract, iterations=None if bulk else 10)
+
+
+@allure.feature("Search with Price Filter")
+def test_benchmark_parse_search_results_html(bench):
+    """HTTP engine: parsing the same 60 result items from raw HTML, without a rendered page"""
+
+    html = (FIXTURES_DIR / "search.html").read_text(encoding="utf-8")
+
+    assert len(EbayPage.parse_search_results_html(html)[0]) == 60
+
+    bench("parse_search_results_html", lambda: EbayPage.parse_search_results_html(html))
+
+
+@allure.feature("Search with Price Filter")
+def test_benchmark_search_result_loop(load_snapshot, bench):
+    """Python side of the result loop: batch price parsing, URL normalization and dedupe of every record"""
+
+    records = EbayPage(load_snapshot("search")).extract_search_results()
+
+    bench("search_result_loop", lambda: list(EbayPage._qualifying_items(records, 500, set())), iterations=1000)
+
+
+@allure.feature("Add Items to Cart")
+def test_benchmark_find_add_to_cart_button(load_snapshot, bench):
+    ebay_page = EbayPage(load_snapshot("item"))
+
+    bench("find_add_to_cart_button",
+          lambda: ebay_page.find_element_with_fallback(ebay_page.ADD_TO_CART_XPATH, ebay_page.ADD_TO_CART_CSS))
+
+
+@allure.feature("Cart Total Assertion")
+def test_benchmark_read_cart_summary(load_snapshot, bench):
+    """Cart total only exposed through data-testid; all summary fields come back in one evaluation"""
+
+    ebay_page = EbayPage(load_snapshot("cart"))
+    summary = ebay_page.read_cart_summary()
+
+    assert (summary.total, summary.subtotal, summary.shipping) == (245.97, 245.97, 0.0)
+    assert summary.strategy == "data-testid"
+    assert summary.line_item_prices == [99.99, 65.99, 79.99]
+
+    bench("read_cart_summary", ebay_page.read_cart_summary, iterations=20)
@@ -0,0 +1,31 @@
+import allure
+import pytest
+
+from tests.benchmarks.conftest import FIXTURES_DIR
+from utils.price_parser import parse_price, parse_prices
+
+pytestmark = [pytest.mark.benchmark, allure.epic("Benchmarks")]
+
+# Result, item and cart page price strings, repeated to the size of a long multi-page search
+PRICE_STRINGS = (FIXTURES_DIR / "prices.txt").read_text(encoding="utf-8").splitlines()
+CORPUS = PRICE_STRINGS * (10_000 // len(PRICE_STRINGS))
+
+
+@allure.feature("Price Parsing")
+def test_benchmark_parse_prices_batch(bench):
+    """Batch entry point as the search loop uses it; repeated strings hit the parse cache"""
+
+    batch = parse_prices(CORPUS)
+
+    assert len(batch.lows) == len(CORPUS)
+
+    bench(f"parse_prices[{len(CORPUS)}]", lambda: parse_prices(CORPUS), iterations=20)
+
+
+@allure.feature("Price Parsing")
+def test_benchmark_parse_price_uncached(bench):
+    """Raw parsing cost of every string, with the cache bypassed"""
+
+    parse = parse_price.__wrapped__
+
+    bench(f"parse_price_uncached[{len(CORPUS)}]", lambda: [parse(text) for text in CORPUS], iterations=10)
@@ -0,0 +1,34 @@
+import allure
+import pytest
+
+from config.browser_config import LAUNCH_PROFILES, get_browser_profile
+
+pytestmark = [pytest.mark.benchmark, allure.epic("Benchmarks")]
+
+
+@allure.feature("Browser Startup")
+@pytest.mark.parametrize("launch_profile", list(LAUNCH_PROFILES))
+def test_benchmark_browser_startup(playwright, playwright_browser_name: str, bench, launch_profile: str):
+    """Cold start to a usable page with each launch profile: launch, context, page, first paint, close"""
+
+    profile = get_browser_profile(playwright_browser_name, launch_profile)
+    browser_type = getattr(playwright, playwright_browser_name)
+
+    def start():
+        browser = browser_type.launch(**profile.launch_options)
+
+        try:
+            page = browser.new_context(**profile.context_options).new_page()
+            page.set_content("<main><h1>Startup</h1></main>")
+            page.locator("h1").wait_for()
+        finally:
+            browser.close()
+
+    bench(f"browser_startup[{launch_profile}]", start, iterations=5)
+
+
+@allure.feature("Browser Startup")
+def test_benchmark_get_browser_profile(playwright_browser_name: str, bench):
+    """Resolving the profile on every launch/context; the JSON is only parsed when it changes"""
+
+    bench("get_browser_profile", lambda: get_browser_profile(playwright_browser_name), iterations=200)
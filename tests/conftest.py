@@ -1,27 +1,233 @@
+import inspect
+import json
 import logging
 import os
-from typing import Generator, Callable
+import uuid
+from typing import Generator, Callable, Optional, Tuple
 
 import allure
 import pytest
-import requests
-from playwright.sync_api import Browser
+from playwright.async_api import async_playwright, Browser as AsyncBrowser, BrowserContext as AsyncBrowserContext, \
+    Page as AsyncPage, Playwright as AsyncPlaywright
+from playwright.sync_api import Browser, Page
 
+from config.browser_config import get_browser_profile
 from config.settings import Settings
+from tests.pages.ebay_page import EbayPage
+from utils.async_runner import AsyncRunner
+from utils.browser_server import BrowserServerClient
+from utils.cart_tracker import CartTracker
+from utils.context_pool import ContextPool
+from utils.grid_sessions import GridSession, GridSessionManager
+from utils.har_archive import HarArchive
+from utils.instrumentation import install_playwright_instrumentation, start_recording, stop_recording, \
+    write_timings_report
+from utils.network_blocking import NetworkBlocker, resolve_blocking_profile
+from utils.screenshots import ScreenshotService
+from utils.search_cache import SearchCache
+from utils.storage_state import StorageStateCache
+from utils.xdist_scheduler import DurationSchedulerPlugin
 
 logger = logging.getLogger(__name__)
 
 
-# # Add command-line option for browser config
-# def pytest_addoption(parser):
-#     """Add custom pytest options"""
-#
-#     parser.addoption(
-#         "--browser-config",
-#         action="store",
-#         default=None,
-#         help="Path to browser configuration JSON file (default: config/browser_config.json)",
-#     )
+HAR_ARCHIVE_KEY = pytest.StashKey[HarArchive]()
+CONTEXT_POOL_KEY = pytest.StashKey[ContextPool]()
+GRID_SESSIONS_KEY = pytest.StashKey[GridSessionManager]()
+TIMINGS_KEY = pytest.StashKey[list]()
+SEARCH_CACHE_KEY = pytest.StashKey[SearchCache]()
+RUN_ID_KEY = pytest.StashKey[str]()
+
+
+def pytest_addoption(parser):
+    """Add custom pytest options"""
+
+    # parser.addoption(
+    #     "--browser-config",
+    #     action="store",
+    #     default=None,
+    #     help="Path to browser configuration JSON file (default: config/browser_config.json)",
+    # )
+
+    parser.addoption(
+        "--har-mode",
+        action="store",
+        default=Settings.HAR_MODE,
+        choices=HarArchive.MODES,
+        help="Record each test's traffic to a HAR archive, or replay archives with no network (default: HAR_MODE)",
+    )
+    parser.addoption(
+        "--har-dir",
+        action="store",
+        default=Settings.HAR_DIR,
+        help="Directory holding the per-test HAR archives (default: HAR_DIR)",
+    )
+    parser.addoption(
+        "--no-search-cache",
+        action="store_true",
+        default=not Settings.SEARCH_CACHE,
+        help="Run every search instead of reusing results cached by an earlier test, browser or worker",
+    )
+    parser.addoption(
+        "--no-duration-scheduling",
+        action="store_true",
+        default=not Settings.XDIST_DURATION_SCHEDULING,
+        help="Use xdist's own 'load' scheduling instead of longest-first, browser-pinned workers",
+    )
+    parser.addoption(
+        "--browser-server",
+        action="store_true",
+        default=Settings.BROWSER_SERVER,
+        help="Connect to warm browsers of the local browser server (started on first use) instead of launching one",
+    )
+    parser.addoption(
+        "--benchmark",
+        action="store_true",
+        default=False,
+        help="Run the page-object micro-benchmarks (tests marked 'benchmark' are skipped otherwise)",
+    )
+    parser.addoption(
+        "--benchmark-save-baseline",
+        action="store_true",
+        default=False,
+        help="Store this run's benchmark results as the new baseline instead of comparing against it",
+    )
+    parser.addoption(
+        "--benchmark-strict",
+        action="store_true",
+        default=Settings.BENCHMARK_STRICT,
+        help="Fail benchmarks that have no baseline entry instead of warning about them",
+    )
+
+
+def pytest_configure(config):
+    config.stash[HAR_ARCHIVE_KEY] = HarArchive(config.getoption("--har-mode"), config.getoption("--har-dir"))
+    config.stash[TIMINGS_KEY] = []
+
+    # One id per run, created on the controller and handed to the xdist workers, so the search cache
+    # only serves the searches of this run
+    worker_input = getattr(config, "workerinput", None)
+    config.stash[RUN_ID_KEY] = worker_input["run_id"] if worker_input else uuid.uuid4().hex
+
+    if Settings.INSTRUMENTATION:
+        install_playwright_instrumentation()
+
+    # Test durations are recorded on the controller (or the only process without xdist) and used to
+    # schedule the next 'pytest -n' run
+    if not hasattr(config, "workerinput"):
+        config.pluginmanager.register(
+            DurationSchedulerPlugin(config, enabled=not config.getoption("--no-duration-scheduling")),
+            "duration_scheduler"
+        )
+
+    # xdist controller: create one Grid session per worker up front, in parallel, and hand them out
+    # in pytest_configure_node, so no worker pays the session creation latency itself
+    selenium_remote_url = os.getenv("SELENIUM_REMOTE_URL")
+    numprocesses = getattr(config.option, "numprocesses", None)
+
+    if selenium_remote_url and isinstance(numprocesses, int) and numprocesses > 0 \
+            and not hasattr(config, "workerinput") and not config.option.collectonly:
+        manager = GridSessionManager(selenium_remote_url,
+                                     pool_size=max(Settings.GRID_SESSION_POOL_SIZE, numprocesses))
+
+        try:
+            manager.prefill()
+        except RuntimeError as e:
+            # Workers fall back to creating their own session (and report the error on their tests)
+            logger.warning(f"Could not pre-create Selenium Grid sessions: {e}")
+            manager.close()
+            return
+
+        config.stash[GRID_SESSIONS_KEY] = manager
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    """Pass the run id, and a pre-created Grid session, to each xdist worker"""
+
+    node.workerinput["run_id"] = node.config.stash[RUN_ID_KEY]
+    manager = node.config.stash.get(GRID_SESSIONS_KEY, None)
+
+    if manager:
+        node.workerinput["grid_session"] = manager.acquire().to_dict()
+
+
+def pytest_unconfigure(config):
+    """Delete the Grid sessions the xdist controller created"""
+
+    manager = config.stash.get(GRID_SESSIONS_KEY, None)
+
+    if manager:
+        logger.info(f"Selenium Grid session stats: {manager.stats()}")
+        manager.close()
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip the micro-benchmarks unless --benchmark is given"""
+
+    if config.getoption("--benchmark"):
+        return
+
+    skip_benchmark = pytest.mark.skip(reason="micro-benchmark; run with --benchmark")
+
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip_benchmark)
+
+
+def pytest_sessionfinish(session):
+    """
+    Flush pending screenshots, write the per-test timings and the HAR replay miss report
+    (one file per xdist worker)
+    """
+
+    ScreenshotService.default().close()
+
+    worker_id = os.getenv("PYTEST_XDIST_WORKER")
+    worker_suffix = f"_{worker_id}" if worker_id else ""
+    timings = session.config.stash.get(TIMINGS_KEY, None)
+
+    if timings:
+        write_timings_report(timings, f"reports/timings{worker_suffix}.json")
+
+    har_archive = session.config.stash.get(HAR_ARCHIVE_KEY, None)
+
+    if har_archive and har_archive.mode == "replay":
+        har_archive.write_report(f"reports/har_replay{worker_suffix}.json")
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    har_archive = config.stash.get(HAR_ARCHIVE_KEY, None)
+
+    if har_archive and har_archive.mode == "replay" and har_archive.misses:
+        terminalreporter.write_sep("-", "HAR replay")
+        terminalreporter.write_line(har_archive.report())
+
+    screenshots = ScreenshotService.default()
+
+    if screenshots.captured or screenshots.skipped:
+        terminalreporter.write_sep("-", "Screenshots")
+        terminalreporter.write_line(screenshots.summary())
+
+    context_pool = config.stash.get(CONTEXT_POOL_KEY, None)
+
+    if context_pool:
+        terminalreporter.write_sep("-", "Context pool")
+        terminalreporter.write_line(", ".join(f"{key}={value}" for key, value in context_pool.stats().items()))
+
+    timings = config.stash.get(TIMINGS_KEY, None) or []
+    sleep_s = sum(result["sleep_s"] for result in timings)
+
+    if sleep_s:
+        terminalreporter.write_sep("-", "Fixed sleeps")
+        terminalreporter.write_line(f"{sum(result['sleeps'] for result in timings)} sleep(s) cost {sleep_s:.2f}s; "
+                                    f"run 'python -m utils.sleep_lint' for the call sites")
+
+    search_cache = config.stash.get(SEARCH_CACHE_KEY, None)
+
+    if search_cache and (search_cache.hits or search_cache.misses):
+        terminalreporter.write_sep("-", "Search cache")
+        terminalreporter.write_line(", ".join(f"{key}={value}" for key, value in search_cache.stats().items()))
 
 
 @pytest.hookimpl(hookwrapper=True)
@@ -65,123 +271,442 @@ def playwright_browser_name(request):
 
 
 @pytest.fixture(scope="session")
-def browser_type_launch_args(browser_type_launch_args):
+def browser_type_launch_args(browser_type_launch_args, playwright_browser_name: str):
+    """Launch options of the browser's profile: Settings, launch profile and browser_config.json merged"""
+
     return {
         **browser_type_launch_args,
-        "headless": Settings.HEADLESS,
-        "slow_mo": Settings.SLOW_MO
+        **get_browser_profile(playwright_browser_name).launch_options
     }
 
 
-def _get_cdp_url_from_selenium_grid(selenium_remote_url: str, max_retries: int = 3) -> str:
+def _warm_up_ebay_session(page: Page):
+    """Visit the eBay homepage once and dismiss its consent/interstitial modal"""
+
+    ebay_page = EbayPage(page)
+    ebay_page.navigate_to()
+    ebay_page._dismiss_modal_if_present(appear_timeout=Settings.MODAL_DISMISS_BUDGET)
+
+
+@pytest.fixture(scope="session")
+def storage_state_snapshot(browser: Browser, playwright_browser_name: str, har_archive: HarArchive) -> Optional[str]:
     """
-    Create a session in Selenium Grid and get the WebSocket URL for CDP connection.
-    
-    Args:
-        selenium_remote_url: The base URL of Selenium Grid (e.g., http://localhost:4444)
-        max_retries: Maximum number of retries for session creation
-    
-    Returns:
-        The WebSocket URL for connecting via CDP
+    Path of a storage state (cookies, localStorage) taken after one warm-up visit, reused by every
+    context of the session and across sessions until it expires or the browser version changes
     """
 
-    # Ensure the URL doesn't have trailing slash
-    base_url = selenium_remote_url.rstrip("/")
+    if not Settings.STORAGE_STATE_CACHE:
+        return None
 
-    # W3C WebDriver protocol capabilities for Chrome with CDP support
-    payload = {
-        "capabilities": {
-            "alwaysMatch": {
-                "browserName": "chrome"
-            }
-        }
-    }
+    cache = StorageStateCache()
 
-    last_error = None
+    # Replay runs have no network to warm up against; use a snapshot only if one already exists
+    if har_archive.mode == "replay":
+        return cache.load(browser.browser_type.name, browser.version)
 
-    for attempt in range(max_retries):
-        try:
-            logger.info(f"Attempting to create Selenium Grid session (attempt {attempt + 1}/{max_retries})...")
+    # Warm up with the test contexts' profile (locale, user agent, ...) so the consent state matches them
+    context_options = {"ignore_https_errors": True, **get_browser_profile(playwright_browser_name).context_options}
 
-            # Create session via Selenium Grid with increased timeout (30 seconds)
-            response = requests.post(
-                f"{base_url}/session",
-                json=payload,
-                timeout=30
-            )
+    try:
+        return cache.get_or_create(browser, _warm_up_ebay_session, context_options)
+    except Exception as e:
+        logger.warning(f"Storage state warm-up failed, contexts will start empty: {e}")
+        return None
+
+
+@pytest.fixture(scope="session")
+def browser_context_args(browser_context_args, playwright_browser_name: str, storage_state_snapshot: Optional[str]):
+    browser_context_args = {**browser_context_args, **get_browser_profile(playwright_browser_name).context_options}
+
+    if storage_state_snapshot:
+        return {**browser_context_args, "storage_state": storage_state_snapshot}
+
+    return browser_context_args
 
-            # Debug: log response if there's an error
-            if response.status_code != 200:
-                logger.warning(f"Selenium Grid response status: {response.status_code}")
-                logger.debug(f"Response body: {response.text}")
 
-            response.raise_for_status()
-            session_data = response.json()
+def _worker_grid_session(config) -> Optional[GridSession]:
+    """Grid session the xdist controller assigned to this worker, if any"""
 
-            # Extract session ID from W3C WebDriver response
-            session_id = session_data.get("sessionId") or session_data.get("value", {}).get("sessionId")
+    workerinput = getattr(config, "workerinput", None)
 
-            if not session_id:
-                raise ValueError("No sessionId found in Selenium Grid response")
+    if workerinput and workerinput.get("grid_session"):
+        return GridSession.from_dict(workerinput["grid_session"])
 
-            logger.info(f"Successfully created Selenium Grid session: {session_id}")
+    return None
 
-            # Get the WebSocket URL from the CDP endpoint
-            # Selenium Grid exposes CDP via ws://selenium-hub:4444/session/{sessionId}/se/cdp
-            cdp_url = f"{base_url.replace('http://', 'ws://').replace('https://', 'wss://')}/session/{session_id}/se/cdp"
 
-            return cdp_url
-        except requests.exceptions.Timeout as e:
-            last_error = e
-            logger.warning(f"Timeout creating session (attempt {attempt + 1}/{max_retries}): {e}")
+@pytest.fixture(scope="session")
+def grid_session_manager(pytestconfig) -> Generator[Optional[GridSessionManager], None, None]:
+    """Selenium Grid sessions of this process when SELENIUM_REMOTE_URL is set, deleted on teardown"""
 
-            if attempt < max_retries - 1:
-                import time
+    selenium_remote_url = os.getenv("SELENIUM_REMOTE_URL")
 
-                wait_time = 2 ** attempt  # Exponential backoff: 1s, 2s, 4s
-                logger.info(f"Waiting {wait_time} seconds before retry...")
-                time.sleep(wait_time)
+    if not selenium_remote_url:
+        yield None
+        return
 
-            continue
+    # Workers get their session from the controller, so only a fallback session is ever created here
+    pool_size = 0 if _worker_grid_session(pytestconfig) else Settings.GRID_SESSION_POOL_SIZE
 
-        except requests.exceptions.RequestException as e:
-            last_error = e
-            logger.error(f"Request error creating session: {e}")
-            raise RuntimeError(f"Failed to create Selenium Grid session: {e}")
+    with GridSessionManager(selenium_remote_url, pool_size=pool_size) as manager:
+        manager.prefill()
 
-        except (ValueError, KeyError) as e:
-            last_error = e
-            logger.error(f"Parse error in session response: {e}")
-            raise RuntimeError(f"Failed to parse Selenium Grid session response: {e}")
+        yield manager
 
-    # All retries exhausted
-    raise RuntimeError(f"Failed to create Selenium Grid session after {max_retries} attempts: {last_error}")
+        logger.info(f"Selenium Grid session stats: {manager.stats()}")
 
 
 @pytest.fixture(scope="session")
-def browser(playwright, launch_browser: Callable[[], Browser]) -> Generator[Browser, None, None]:
+def browser(playwright,
+            launch_browser: Callable[[], Browser],
+            playwright_browser_name: str,
+            pytestconfig,
+            grid_session_manager: Optional[GridSessionManager]) -> Generator[Browser, None, None]:
     """
     Custom browser fixture that handles both local and Selenium Grid remote connections.
-    If SELENIUM_REMOTE_URL is set, connects via CDP instead of launching locally.
+    If SELENIUM_REMOTE_URL is set, connects via CDP to a pooled Grid session instead of launching locally.
+    With --browser-server, connects to a warm browser of the local browser server when one is available.
     """
 
-    selenium_remote_url = os.getenv("SELENIUM_REMOTE_URL")
+    grid_session = None
 
-    if selenium_remote_url:
-        # Get the WebSocket URL from Selenium Grid
-        cdp_url = _get_cdp_url_from_selenium_grid(selenium_remote_url)
+    if grid_session_manager:
+        grid_session = grid_session_manager.acquire(_worker_grid_session(pytestconfig))
 
         # Connect to Selenium Grid via CDP (Chrome DevTools Protocol)
-        browser = playwright.chromium.connect_over_cdp(cdp_url)
+        browser = playwright.chromium.connect_over_cdp(grid_session.cdp_url)
     else:
+        browser = None
+
+        if pytestconfig.getoption("--browser-server"):
+            browser = BrowserServerClient().connect(playwright, playwright_browser_name, start=True)
+
         # Launch browser locally
-        browser = launch_browser()
+        if browser is None:
+            browser = launch_browser()
 
     yield browser
 
     # Close browser after tests
     browser.close()
 
+    if grid_session:
+        grid_session_manager.release(grid_session)
+
+
+def _report_network_blocking(blocker: NetworkBlocker):
+    """Log and attach the per-test blocked/allowed request counters"""
+
+    if blocker.profile.name == "none":
+        return
+
+    logger.info(blocker.summary())
+    allure.attach(
+        json.dumps(blocker.stats(), indent=2),
+        name="Network Blocking",
+        attachment_type=allure.attachment_type.JSON
+    )
+
+
+@pytest.fixture(scope="session")
+def har_archive(pytestconfig) -> HarArchive:
+    """HAR record/replay settings of this session (--har-mode / --har-dir)"""
+
+    return pytestconfig.stash[HAR_ARCHIVE_KEY]
+
+
+@pytest.fixture(scope="session")
+def search_cache(pytestconfig, har_archive: HarArchive) -> Optional[SearchCache]:
+    """
+    Search results shared by every test, browser and xdist worker of the run; None with --no-search-cache.
+    Earlier runs' results are only reused with SEARCH_CACHE_TTL set. HAR runs always search, so each
+    test's archive holds the search traffic it replays.
+    """
+
+    if pytestconfig.getoption("--no-search-cache") or har_archive.enabled:
+        return None
+
+    cache = SearchCache(run_id=pytestconfig.stash[RUN_ID_KEY])
+    pytestconfig.stash[SEARCH_CACHE_KEY] = cache
+
+    return cache
+
+
+@pytest.fixture
+def search_items(request, search_cache: Optional[SearchCache]) -> Callable[..., list]:
+    """
+    search_items(ebay_page, query, max_price, limit): EbayPage.search_items_by_name_under_price through
+    the search cache. Tests marked no_search_cache always run the search on their own page; their
+    result still refreshes the cache for the tests after them.
+    """
+
+    refresh = request.node.get_closest_marker("no_search_cache") is not None
+
+    def search(ebay_page: EbayPage, query: str, max_price: float, limit: int) -> list:
+        def run() -> list:
+            return ebay_page.search_items_by_name_under_price(query=query, max_price=max_price, limit=limit)
+
+        if search_cache is None:
+            return run()
+
+        return search_cache.get_or_search(query, max_price, limit, run, refresh=refresh)
+
+    return search
+
+
+@pytest.fixture(autouse=True)
+def har_routing(request, har_archive: HarArchive, playwright_browser_name: str):
+    """Record or replay the pytest-playwright context of each test when a HAR mode is set"""
+
+    if har_archive.enabled and "context" in request.fixturenames:
+        har_archive.attach(request.getfixturevalue("context"), request.node.nodeid, playwright_browser_name)
+
+    yield
+
+
+@pytest.fixture(autouse=True)
+def network_blocking(request, playwright_browser_name: str, har_routing) -> Generator[Optional[NetworkBlocker], None, None]:
+    """
+    Apply the configured network blocking profile to the pytest-playwright context of each test.
+    Runs after har_routing, so its route takes precedence and blocked requests never count as HAR misses.
+    """
+
+    if "context" not in request.fixturenames:
+        yield None
+        return
+
+    context = request.getfixturevalue("context")
+    blocker = NetworkBlocker(resolve_blocking_profile(playwright_browser_name)).attach(context)
+
+    yield blocker
+
+    _report_network_blocking(blocker)
+
+
+@pytest.fixture
+def cart_tracker(context) -> Generator[CartTracker, None, None]:
+    """Cart item count and totals of the test's context, kept up to date from its cart responses"""
+
+    tracker = CartTracker().attach(context)
+
+    yield tracker
+
+    logger.info(tracker.summary())
+
+
+@pytest.fixture(scope="session")
+def context_pool(pytestconfig,
+                 browser: Browser,
+                 browser_context_args,
+                 playwright_browser_name: str) -> Generator[ContextPool, None, None]:
+    """Session-wide pool of reusable contexts behind the pooled_context / pooled_page fixtures"""
+
+    blocking_profile = resolve_blocking_profile(playwright_browser_name)
+
+    # Routes survive resets, so the blocker is attached once per context; counters are reset per test
+    pool = ContextPool(browser, browser_context_args,
+                       on_create=lambda context: NetworkBlocker(blocking_profile).attach(context))
+    pool.prefill()
+    pytestconfig.stash[CONTEXT_POOL_KEY] = pool
+
+    yield pool
+
+    logger.info(f"Context pool stats: {pool.stats()}")
+    pool.close()
+
+
+@pytest.fixture
+def pooled_context(request,
+                   browser: Browser,
+                   browser_context_args,
+                   har_archive: HarArchive,
+                   playwright_browser_name: str) -> Generator:
+    """
+    Browser context taken from the pool and reset afterwards, instead of a new context per test.
+    HAR archives are written when their context closes, so with a HAR mode set every test gets its own
+    fresh context instead.
+    """
+
+    if har_archive.enabled:
+        context = browser.new_context(**browser_context_args)
+        context.set_default_navigation_timeout(Settings.NAVIGATION_TIMEOUT)
+        context.set_default_timeout(Settings.ACTION_TIMEOUT)
+        har_archive.attach(context, request.node.nodeid, playwright_browser_name)
+        blocker = NetworkBlocker(resolve_blocking_profile(playwright_browser_name)).attach(context)
+
+        yield context
+
+        _report_network_blocking(blocker)
+        context.close()
+
+        return
+
+    pool: ContextPool = request.getfixturevalue("context_pool")
+    context = pool.acquire()
+    blocker = NetworkBlocker.for_context(context)
+    blocker.reset_stats()
+
+    yield context
+
+    _report_network_blocking(blocker)
+    pool.release(context)
+
+
+@pytest.fixture
+def pooled_page(pooled_context) -> Page:
+    """Page of a pooled context (pooled contexts keep one blank page open between tests)"""
+
+    return pooled_context.pages[0] if pooled_context.pages else pooled_context.new_page()
+
+
+@pytest.fixture(autouse=True)
+def step_timings(request, pytestconfig):
+    """Record wall time, browser round trips, sleeps and fallback timeouts of each test"""
+
+    if not Settings.INSTRUMENTATION:
+        yield None
+        return
+
+    timings = start_recording(request.node.nodeid)
+
+    yield timings
+
+    stop_recording()
+    pytestconfig.stash[TIMINGS_KEY].append(timings.to_dict())
+
+    if timings.round_trips or timings.methods:
+        logger.info(f"Timings: {timings.report().splitlines()[0]}")
+        allure.attach(timings.report(), name="Step Timings", attachment_type=allure.attachment_type.TEXT)
+        allure.attach(
+            json.dumps(timings.to_dict(), indent=2),
+            name="Step Timings (JSON)",
+            attachment_type=allure.attachment_type.JSON
+        )
+
+
+@pytest.fixture(scope="session")
+def async_runner() -> Generator[AsyncRunner, None, None]:
+    """
+    Event loop thread for the async fixtures and tests. The sync playwright fixture keeps a loop
+    running on the main thread, so the async API can't share it in the same session.
+    """
+
+    runner = AsyncRunner()
+
+    yield runner
+
+    runner.close()
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_pyfunc_call(pyfuncitem):
+    """Run 'async def' tests that use the async fixtures on the async_runner loop"""
+
+    if not inspect.iscoroutinefunction(pyfuncitem.obj) or "async_runner" not in pyfuncitem.fixturenames:
+        return None
+
+    runner: AsyncRunner = pyfuncitem.funcargs["async_runner"]
+    test_args = {name: pyfuncitem.funcargs[name] for name in pyfuncitem._fixtureinfo.argnames}
+    runner.run(pyfuncitem.obj(**test_args))
+
+    return True
+
+
+@pytest.fixture(scope="session")
+def async_playwright_instance(async_runner: AsyncRunner) -> Generator[AsyncPlaywright, None, None]:
+    """Playwright async API driver, started once per session on the async_runner loop"""
+
+    async def start() -> AsyncPlaywright:
+        return await async_playwright().start()
+
+    playwright_instance = async_runner.run(start())
+
+    yield playwright_instance
+
+    async_runner.run(playwright_instance.stop())
+
+
+@pytest.fixture(scope="session")
+def async_browser(async_runner: AsyncRunner,
+                  async_playwright_instance: AsyncPlaywright,
+                  playwright_browser_name: str,
+                  browser_type_launch_args,
+                  pytestconfig,
+                  grid_session_manager: Optional[GridSessionManager]) -> Generator[AsyncBrowser, None, None]:
+    """
+    Async counterpart of the browser fixture.
+    If SELENIUM_REMOTE_URL is set, connects via CDP to a pooled Grid session instead of launching locally.
+    """
+
+    grid_session = None
+
+    async def open_browser() -> AsyncBrowser:
+        if grid_session:
+            return await async_playwright_instance.chromium.connect_over_cdp(grid_session.cdp_url)
+
+        browser = None
+
+        if pytestconfig.getoption("--browser-server"):
+            browser = await BrowserServerClient().connect_async(async_playwright_instance, playwright_browser_name,
+                                                                start=True)
+
+        if browser is None:
+            browser_type = getattr(async_playwright_instance, playwright_browser_name)
+            browser = await browser_type.launch(**browser_type_launch_args)
+
+        return browser
+
+    if grid_session_manager:
+        grid_session = grid_session_manager.acquire(_worker_grid_session(pytestconfig))
+
+    browser = async_runner.run(open_browser())
+
+    yield browser
+
+    async_runner.run(browser.close())
+
+    if grid_session:
+        grid_session_manager.release(grid_session)
+
+
+@pytest.fixture
+def async_context(request,
+                  async_runner: AsyncRunner,
+                  async_browser: AsyncBrowser,
+                  har_archive: HarArchive) -> Generator[AsyncBrowserContext, None, None]:
+    """Fresh async browser context per test"""
+
+    storage_state = None
+
+    if Settings.STORAGE_STATE_CACHE:
+        storage_state = StorageStateCache().load(async_browser.browser_type.name, async_browser.version)
+
+    context_options = get_browser_profile(async_browser.browser_type.name).context_options
+
+    async def open_context() -> Tuple[AsyncBrowserContext, NetworkBlocker]:
+        context = await async_browser.new_context(**{"ignore_https_errors": True, **context_options,
+                                                     "storage_state": storage_state})
+        context.set_default_navigation_timeout(Settings.NAVIGATION_TIMEOUT)
+        context.set_default_timeout(Settings.ACTION_TIMEOUT)
+        await har_archive.attach_async(context, request.node.nodeid, async_browser.browser_type.name)
+        blocker = await NetworkBlocker(resolve_blocking_profile(async_browser.browser_type.name)).attach_async(context)
+
+        return context, blocker
+
+    context, blocker = async_runner.run(open_context())
+
+    yield context
+
+    _report_network_blocking(blocker)
+    async_runner.run(context.close())
+
+
+@pytest.fixture
+def async_page(async_runner: AsyncRunner, async_context: AsyncBrowserContext) -> Generator[AsyncPage, None, None]:
+    """Async page in a fresh context; open more pages with async_context.new_page()"""
+
+    yield async_runner.run(async_context.new_page())
+
 
 # @pytest.fixture(scope="function", autouse=True)
 # def allure_test_metadata(request, playwright_browser_name):
@@ -214,34 +739,26 @@ def pytest_runtest_makereport(item, call):
     setattr(pytest, 'current_test_failed', rep.failed)
 
     # Take screenshot on test failure
-    if rep.failed and hasattr(item, 'funcargs') and 'page' in item.funcargs:
-        page = item.funcargs['page']
+    page = item.funcargs.get('page') or item.funcargs.get('pooled_page') if hasattr(item, 'funcargs') else None
 
+    if rep.failed and page is not None:
         try:
-            # Create screenshots directory if it doesn't exist
-            import os
-
-            screenshots_dir = "reports/failure_screenshots"
-            os.makedirs(screenshots_dir, exist_ok=True)
-
             # Generate unique filename with timestamp
             from datetime import datetime
 
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             test_name = item.name.replace('[', '_').replace(']', '_').replace('::', '_')
-            screenshot_path = f"{screenshots_dir}/{test_name}_{timestamp}_failure.png"
-
-            # Take screenshot
-            page.screenshot(path=screenshot_path, full_page=True)
-
-            # Attach screenshot to Allure report
-            with open(screenshot_path, 'rb') as f:
-                screenshot_data = f.read()
-                allure.attach(
-                    screenshot_data,
-                    name=f"Failure Screenshot - {item.name}",
-                    attachment_type=allure.attachment_type.PNG
-                )
+            screenshot_path = f"reports/failure_screenshots/{test_name}_{timestamp}_failure.png"
+
+            # Take screenshot and attach it to the Allure report; the file is written in the background
+            ScreenshotService.default().capture(
+                page,
+                screenshot_path,
+                kind="failure",
+                full_page=True,
+                attach_to_allure=True,
+                attachment_name=f"Failure Screenshot - {item.name}"
+            )
         except Exception as e:
             # Log screenshot failure but don't fail the test
             logger.warning(f"Failed to take screenshot on test failure: {e}")
@@ -0,0 +1,233 @@
+import asyncio
+import logging
+import time
+from typing import Callable, Optional, List, Tuple, Union
+from playwright.async_api import Page, Locator, Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
+from config.settings import Settings
+from tests.pages.modal_handler import AsyncModalHandler
+from utils.instrumentation import instrument_class, record_fallback_timeout
+from utils.screenshots import ScreenshotService
+from utils import waits
+from utils.waits import UrlPattern
+
+logger = logging.getLogger(__name__)
+
+
+@instrument_class
+class AsyncBasePage:
+    """
+    Base page class with common methods using the Playwright async API.
+    Mirrors BasePage, so one event loop can drive many pages concurrently.
+    """
+
+    # (URL regex, page type) pairs used to classify pages, e.g. for modal statistics
+    PAGE_TYPE_PATTERNS: List[Tuple[str, str]] = []
+
+    def __init__(self, page: Page):
+        self.page = page
+        self.base_url = Settings.BASE_URL
+        self.last_fallback_index: Optional[int] = None
+        self.modal_handler = AsyncModalHandler.for_page(page, self.PAGE_TYPE_PATTERNS)
+
+    async def navigate_to(self, url: str = ""):
+        """Navigate to a URL"""
+
+        full_url = f"{self.base_url}/{url}" if url else self.base_url
+
+        if self.page.url != self.base_url:
+            await self.modal_handler.install()
+            await self.page.goto(full_url, wait_until="load")
+
+            # Check for modal popup and dismiss it if present
+            await self._dismiss_modal_if_present()
+
+    # ==================== MODALS ====================
+
+    def get_page_type(self) -> str:
+        """Page type of the current URL (used to remember which modal shows up where)"""
+
+        return self.modal_handler.page_type()
+
+    async def _dismiss_modal_if_present(self, appear_timeout: Optional[int] = None) -> Optional[str]:
+        """
+        Dismiss a modal popup if one is showing. Returns right away when there is none;
+        modals that show up later are dismissed by the page's registered locator handlers.
+
+        Args:
+            appear_timeout: Milliseconds to wait for a modal to appear (default from settings)
+
+        Returns:
+            str: Name of the modal pattern that was dismissed, or None
+        """
+
+        try:
+            await self.modal_handler.install()
+
+            return await self.modal_handler.dismiss_if_present(appear_timeout_ms=appear_timeout)
+        except Exception as e:
+            logger.error(f"Error during modal dismissal: {e}")
+            return None
+
+    # ==================== ELEMENTS ====================
+
+    def find_element(self, selector: str) -> Locator:
+        """Find an element by selector"""
+
+        return self.page.locator(selector)
+
+    async def click_element(self, selector: str):
+        """Click an element"""
+
+        await self.page.locator(selector).click()
+
+    async def fill_input(self, selector: str, text: str):
+        """Fill an input field"""
+
+        await self.page.locator(selector).fill(text)
+
+    async def get_text(self, selector: str) -> str:
+        """Get text from an element"""
+
+        return await self.page.locator(selector).inner_text()
+
+    async def is_element_visible(self, selector: str) -> bool:
+        """Check if element is visible"""
+
+        return await self.page.locator(selector).is_visible()
+
+    async def wait_for_element(self, selector: str, timeout: Optional[int] = None):
+        """Wait for element to be visible"""
+
+        timeout_ms = timeout * 1000 if timeout else Settings.ACTION_TIMEOUT
+        await self.page.locator(selector).wait_for(state="visible", timeout=timeout_ms)
+
+    async def wait_for_response(self,
+                                url: UrlPattern,
+                                action: Optional[Callable[[], object]] = None,
+                                status: Optional[int] = None,
+                                timeout: int = 10000):
+        """Run action and wait for the response it triggers; None if none matched in time (see utils.waits)"""
+
+        return await waits.wait_for_response_async(self.page, url, action, status, timeout)
+
+    async def wait_for_dom_quiet(self, quiet_ms: int = 300, timeout: int = 5000, selector: Optional[str] = None) -> bool:
+        """Wait until the DOM had no mutations for quiet_ms; False if it was still changing at timeout"""
+
+        return await waits.wait_for_dom_quiet_async(self.page, quiet_ms, timeout, selector)
+
+    async def wait_for_text_change(self, locator: Union[str, Locator], previous: str, timeout: int = 5000) -> bool:
+        """Wait until an element's text is no longer previous; False on timeout"""
+
+        if isinstance(locator, str):
+            locator = self.page.locator(locator).first
+
+        return await waits.wait_for_text_change_async(locator, previous, timeout)
+
+    async def wait_for_count_change(self, locator: Union[str, Locator], previous: int, timeout: int = 5000) -> bool:
+        """Wait until the number of matching elements is no longer previous; False on timeout"""
+
+        if isinstance(locator, str):
+            locator = self.page.locator(locator)
+
+        return await waits.wait_for_count_change_async(locator, previous, timeout)
+
+    async def get_title(self) -> str:
+        """Get page title"""
+
+        return await self.page.title()
+
+    def get_url(self) -> str:
+        """Get current URL"""
+
+        return self.page.url
+
+    async def take_screenshot(self, path: Optional[str] = None):
+        """Take a screenshot (written in the background; the extension follows SCREENSHOT_FORMAT)"""
+
+        if path is None:
+            path = f"reports/screenshot_{self.page.url.split('/')[-1]}.png"
+
+        return await ScreenshotService.default().capture_async(self.page, path, kind="manual")
+
+    async def find_element_with_fallback(self,
+                                         *selectors: str,
+                                         timeout: Optional[int] = None,
+                                         optional: bool = False) -> Optional[Locator]:
+        """
+        Find element with fallback mechanism: waits for all selectors concurrently against one
+        timeout and returns the locator of the first one that becomes visible
+
+        Args:
+            *selectors: Variable number of selector strings or a single list of selectors
+            timeout: Timeout in milliseconds (default from settings)
+            optional: If true, return None instead of raising when nothing is found
+
+        Returns:
+            Locator: The found element locator. The index of the winning selector is stored
+                     in self.last_fallback_index.
+
+        Raises:
+            TimeoutError: If none of the selectors find the element
+            ValueError: If no selectors are provided
+        """
+
+        if len(selectors) == 1 and isinstance(selectors[0], list):
+            selector_list = list(selectors[0])
+        else:
+            selector_list = [str(sel) for sel in selectors]
+
+        if not selector_list:
+            raise ValueError("At least one selector must be provided")
+
+        timeout_ms = timeout if timeout else Settings.ACTION_TIMEOUT
+        self.last_fallback_index = None
+
+        async def wait_visible(index: int, selector: str) -> int:
+            await self.page.locator(selector).first.wait_for(state="visible", timeout=timeout_ms)
+
+            return index
+
+        started = time.monotonic()
+        tasks = [asyncio.ensure_future(wait_visible(i, sel)) for i, sel in enumerate(selector_list)]
+        errors = []
+
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    index = await next_done
+                except (PlaywrightTimeoutError, PlaywrightError) as e:
+                    errors.append(str(e))
+                    continue
+
+                self.last_fallback_index = index
+
+                if index > 0:
+                    logger.info(f"Fallback selector {index + 1}/{len(selector_list)} "
+                                f"('{selector_list[index]}') matched; earlier selectors may be stale")
+
+                return self.page.locator(selector_list[index])
+        finally:
+            for task in tasks:
+                task.cancel()
+
+            # Let cancelled waits settle so they don't log "exception never retrieved"
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        record_fallback_timeout(time.monotonic() - started)
+
+        if optional:
+            return None
+
+        error_message = f"Element not found with any of {len(selector_list)} selector(s). Errors:\n"
+        error_message += "\n".join(f"  - {error}" for error in errors)
+
+        raise TimeoutError(error_message)
+
+    async def is_element_present_with_fallback(self, *selectors: str, timeout: Optional[int] = None) -> bool:
+        """Check if element is present with fallback mechanism"""
+
+        try:
+            await self.find_element_with_fallback(*selectors, timeout=timeout)
+            return True
+        except (TimeoutError, PlaywrightTimeoutError, ValueError):
+            return False
@@ -0,0 +1,571 @@
+import asyncio
+import logging
+import random
+import re
+import time
+from contextlib import aclosing
+from datetime import datetime
+from typing import AsyncIterator, Optional
+
+from playwright.async_api import Page, Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
+
+from config.settings import Settings
+from tests.pages.async_base_page import AsyncBasePage
+from tests.pages.cart_models import AddToCartResult, CartItemOutcome, CartSummary
+from tests.pages.ebay_page import EbayPage
+from tests.pages.search_models import SearchItem
+from utils.cart_tracker import CartTracker
+from utils.instrumentation import instrument_class
+from utils.screenshots import ScreenshotService
+
+logger = logging.getLogger(__name__)
+
+
+@instrument_class
+class AsyncEbayPage(AsyncBasePage):
+    """
+    Async Page Object Model for eBay.com with the same method surface as EbayPage.
+    Selectors and parsing helpers are shared with EbayPage.
+    """
+
+    PAGE_TYPE_PATTERNS = EbayPage.PAGE_TYPE_PATTERNS
+
+    def __init__(self, page: Page):
+        super().__init__(page)
+        self.base_url = "https://www.ebay.com"
+
+    # ==================== HELPER METHODS ====================
+
+    async def search_for_item(self, search_term: str):
+        """Search for an item on eBay with fallback mechanism"""
+
+        search_input = await self.find_element_with_fallback(EbayPage.SEARCH_INPUT_XPATH, EbayPage.SEARCH_INPUT_CSS)
+        await search_input.fill(search_term)
+
+        search_button = await self.find_element_with_fallback(EbayPage.SEARCH_BUTTON_XPATH, EbayPage.SEARCH_BUTTON_CSS)
+        await search_button.click()
+
+    async def get_cart_count(self) -> str:
+        """Get the number of items in cart with fallback mechanism"""
+
+        cart_count_element = await self.find_element_with_fallback(
+            EbayPage.CART_COUNT_XPATH,
+            EbayPage.CART_COUNT_CSS,
+            timeout=2000  # Shorter timeout for optional element
+        )
+
+        cart_aria_label = await cart_count_element.get_attribute('aria-label')
+
+        if cart_aria_label:
+            if match := re.search(r'(\d+)', cart_aria_label):
+                return match.group(1)
+
+        raise Exception("No cart aria label found")
+
+    async def is_search_box_visible(self) -> bool:
+        """Check if search box is visible with fallback mechanism"""
+
+        return await self.is_element_present_with_fallback(
+            EbayPage.SEARCH_INPUT_XPATH,
+            EbayPage.SEARCH_INPUT_CSS,
+            timeout=2000
+        )
+
+    async def is_cart_visible(self) -> bool:
+        """Check if cart is visible with fallback mechanism"""
+
+        return await self.is_element_present_with_fallback(EbayPage.CART_XPATH, EbayPage.CART_CSS, timeout=2000)
+
+    async def wait_for_page_load(self):
+        """Wait for the search input and logo concurrently"""
+
+        await asyncio.gather(
+            self.find_element_with_fallback(EbayPage.SEARCH_INPUT_XPATH, EbayPage.SEARCH_INPUT_CSS, optional=True),
+            self.find_element_with_fallback(EbayPage.LOGO_XPATH, EbayPage.LOGO_CSS, optional=True),
+        )
+
+    async def search_items_by_name_under_price(self,
+                                               query: str,
+                                               max_price: float,
+                                               limit: int,
+                                               direct_url: Optional[bool] = None,
+                                               prefetch_pages: Optional[int] = None,
+                                               engine: Optional[str] = None) -> list:
+        """
+        Search eBay with price filtering and pagination.
+
+        Args:
+            query: Search query string
+            max_price: Maximum price filter (items must be <= this price)
+            limit: Minimum number of items to retrieve
+            direct_url, prefetch_pages, engine: See iter_search_results
+
+        Returns:
+            list: List of URLs for found items (at least 'limit' items, or fewer if not enough found)
+        """
+
+        items: list[str] = []
+
+        if limit <= 0:
+            return items
+
+        # Stop iterating (and fetching further pages) as soon as we have enough items
+        async with aclosing(self.iter_search_results(query, max_price, direct_url, prefetch_pages, engine)) as results:
+            async for item in results:
+                items.append(item.url)
+
+                if len(items) >= limit:
+                    break
+
+        return items
+
+    async def iter_search_results(self,
+                                  query: str,
+                                  max_price: float,
+                                  direct_url: Optional[bool] = None,
+                                  prefetch_pages: Optional[int] = None,
+                                  engine: Optional[str] = None) -> AsyncIterator[SearchItem]:
+        """
+        Search eBay and yield the items priced at or under max_price as each results page is parsed,
+        deduplicated by item id; further pages are only fetched while the consumer keeps iterating.
+
+        Args:
+            query: Search query string
+            max_price: Maximum price filter (items must be <= this price)
+            direct_url: Open result pages by URL instead of the search box and Next button
+                        (default from settings)
+            prefetch_pages: With direct URLs, load up to this many further result pages at once in
+                            tabs of the same context; 0 reads them one by one (default from settings)
+            engine: "browser" or "http" (result HTML through the context's request API, parsed
+                    without rendering; see EbayPage) (default from settings)
+        """
+
+        engine = engine or Settings.SEARCH_ENGINE
+
+        if engine not in EbayPage.SEARCH_ENGINES:
+            raise ValueError(f"Unknown search engine: {engine}. Use one of: {', '.join(EbayPage.SEARCH_ENGINES)}")
+
+        seen: set[str] = set()
+
+        if engine == "http":
+            async with aclosing(self._iter_result_pages_http(query, max_price)) as pages:
+                fetched_any = False
+
+                async for records in pages:
+                    fetched_any = True
+
+                    for item in EbayPage._qualifying_items(records, max_price, seen):
+                        yield item
+
+                if fetched_any:
+                    return
+
+            logger.warning("Search results could not be fetched over HTTP, falling back to the browser")
+
+        async with aclosing(self._iter_result_pages(query, max_price, direct_url, prefetch_pages)) as pages:
+            async for records in pages:
+                for item in EbayPage._qualifying_items(records, max_price, seen):
+                    yield item
+
+    async def _iter_result_pages(self,
+                                 query: str,
+                                 max_price: float,
+                                 direct_url: Optional[bool] = None,
+                                 prefetch_pages: Optional[int] = None) -> AsyncIterator[list[dict]]:
+        """Records of each results page rendered in the browser (see iter_search_results)"""
+
+        if direct_url is None:
+            direct_url = Settings.SEARCH_DIRECT_URL
+
+        if direct_url and not await self.open_search_results(query, max_price):
+            logger.warning("Direct search URL was rejected, falling back to the search box and price filter")
+            direct_url = False
+
+        if not direct_url:
+            await self._search_via_search_box(query, max_price)
+
+        if prefetch_pages is None:
+            prefetch_pages = Settings.SEARCH_PREFETCH_PAGES
+
+        page_count = 0
+
+        while page_count < EbayPage.MAX_RESULT_PAGES:
+            try:
+                await self.page.wait_for_selector(EbayPage.SEARCH_RESULT_ITEMS_XPATH, timeout=10000)
+                records = await self.extract_search_results()
+
+                if not records:
+                    logger.debug(f"No result items found on page {page_count + 1}")
+                    return
+
+                logger.info(f"Found {len(records)} result items on page {page_count + 1}")
+            except Exception as e:
+                logger.error(f"No search results found on page {page_count + 1}: {e}")
+                return
+
+            yield records
+
+            try:
+                next_button = self.page.locator(EbayPage.NEXT_PAGE_XPATH).first
+
+                if direct_url and prefetch_pages > 0:
+                    if await next_button.is_visible():
+                        last_page = EbayPage._last_result_page(await self.get_results_count(),
+                                                               EbayPage.MAX_RESULT_PAGES)
+
+                        async with aclosing(self._iter_prefetched_pages(
+                                query, max_price, range(page_count + 2, last_page + 1), prefetch_pages)) as pages:
+                            async for prefetched in pages:
+                                yield prefetched
+                    return
+                elif direct_url:
+                    if not await next_button.is_visible() or \
+                            not await self.open_search_results(query, max_price, page_count + 2):
+                        return
+
+                    page_count += 1
+                elif await next_button.is_visible() and await next_button.is_enabled():
+                    await next_button.click()
+                    await self.page.wait_for_load_state("load", timeout=15000)
+                    page_count += 1
+                else:
+                    return
+            except PlaywrightError:
+                return
+
+    async def _iter_prefetched_pages(self,
+                                     query: str,
+                                     max_price: float,
+                                     page_numbers: range,
+                                     prefetch_pages: int) -> AsyncIterator[list[dict]]:
+        """
+        Records of further result pages, up to prefetch_pages loading at a time in tabs of this page's
+        context, in page order. Outstanding loads are cancelled once the consumer stops iterating.
+        """
+
+        semaphore = asyncio.Semaphore(prefetch_pages)
+
+        async def fetch(page_number: int) -> list[dict]:
+            async with semaphore:
+                tab = await self.page.context.new_page()
+
+                try:
+                    await tab.goto(EbayPage.build_search_url(query, max_price, page_number),
+                                   wait_until="domcontentloaded", timeout=15000)
+                    await tab.wait_for_selector(EbayPage.SEARCH_RESULT_ITEMS_XPATH, timeout=10000)
+
+                    return await AsyncEbayPage(tab).extract_search_results()
+                finally:
+                    await tab.close()
+
+        tasks = [asyncio.ensure_future(fetch(page_number)) for page_number in page_numbers]
+
+        try:
+            for page_number, task in zip(page_numbers, tasks):
+                try:
+                    records = await task
+                except PlaywrightError as e:
+                    logger.error(f"No search results found on page {page_number}: {e}")
+                    return
+
+                if not records:
+                    logger.debug(f"No result items found on page {page_number}")
+                    return
+
+                logger.info(f"Found {len(records)} result items on prefetched page {page_number}")
+
+                yield records
+        finally:
+            for task in tasks:
+                task.cancel()
+
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _iter_result_pages_http(self, query: str, max_price: float) -> AsyncIterator[list[dict]]:
+        """Records of each results page fetched with the context's request API (see EbayPage)"""
+
+        for page_number in range(1, EbayPage.MAX_RESULT_PAGES + 1):
+            url = EbayPage.build_search_url(query, max_price, page_number)
+
+            try:
+                response = await self.page.context.request.get(url, timeout=15000)
+                html = await response.text() if response.ok and "/sch/" in response.url else None
+            except PlaywrightError as e:
+                logger.warning(f"Could not fetch search URL {url}: {e}")
+                html = None
+
+            records, has_next_page = EbayPage.parse_search_results_html(html) if html else ([], False)
+
+            if not records:
+                logger.debug(f"No result items fetched for page {page_number}: {url}")
+                return
+
+            logger.info(f"Fetched {len(records)} result items on page {page_number} over HTTP")
+
+            yield records
+
+            if not has_next_page:
+                return
+
+    async def get_results_count(self) -> Optional[int]:
+        """Total number of results from the results heading, or None if it is not shown"""
+
+        try:
+            heading = self.page.locator(EbayPage.RESULTS_COUNT_XPATH).first
+            text = await heading.inner_text(timeout=2000) if await heading.count() else ""
+        except PlaywrightError:
+            return None
+
+        return EbayPage._parse_results_count(text)
+
+    async def open_search_results(self, query: str, max_price: Optional[float] = None, page_number: int = 1) -> bool:
+        """Navigate straight to a search results page; False if eBay rejected the URL"""
+
+        url = EbayPage.build_search_url(query, max_price, page_number)
+
+        try:
+            response = await self.page.goto(url, wait_until="domcontentloaded")
+        except PlaywrightError as e:
+            logger.warning(f"Could not open search URL {url}: {e}")
+            return False
+
+        if response is not None and not response.ok:
+            logger.warning(f"Search URL {url} returned status {response.status}")
+            return False
+
+        if "/sch/" not in self.page.url:
+            logger.warning(f"Search URL {url} redirected to {self.page.url}")
+            return False
+
+        try:
+            await self.page.wait_for_selector(
+                f"{EbayPage.SEARCH_RESULT_ITEMS_XPATH} | {EbayPage.RESULTS_COUNT_XPATH}", timeout=10000)
+        except PlaywrightError as e:
+            logger.warning(f"No search results on {url}: {e}")
+            return False
+
+        await self._dismiss_modal_if_present()
+        logger.info(f"Opened search results page {page_number}: {url}")
+
+        return True
+
+    async def _search_via_search_box(self, query: str, max_price: float):
+        """Search through the header search box and the price filter widget (fallback for direct URLs)"""
+
+        # Navigate to eBay landing page
+        await self.navigate_to()
+        await self.wait_for_page_load()
+
+        # Perform the search
+        await self.search_for_item(query)
+        await self.page.wait_for_load_state("load", timeout=15000)
+
+        # Look for max price filter input (with timeout to avoid hanging if element missing)
+        try:
+            price_filter_input = self.page.locator(EbayPage.PRICE_FILTER_MAX_XPATH).first
+            await price_filter_input.wait_for(state="visible", timeout=8000)
+            await price_filter_input.scroll_into_view_if_needed(timeout=5000)
+            await self.wait_for_dom_quiet(quiet_ms=200, timeout=1500)
+            await price_filter_input.press_sequentially(str(max_price))
+            await self.page.locator(EbayPage.PRICE_FILTER_APPLY_XPATH).first.click(timeout=5000)
+            await self.page.wait_for_load_state("load", timeout=15000)
+        except Exception as e:
+            logger.warning(f"Price filter step skipped or failed: {e}. Continuing to collect items.")
+
+    async def extract_search_results(self) -> list[dict]:
+        """Extract every result item on the current search results page in a single round trip"""
+
+        return await self.page.locator(EbayPage.SEARCH_RESULT_ITEMS_XPATH).evaluate_all(
+            EbayPage.SEARCH_RESULTS_EXTRACT_JS,
+            [EbayPage.ITEM_PRICE_XPATH, EbayPage.ITEM_URL_XPATH,
+             EbayPage.ITEM_PRICE_CSS, EbayPage.ITEM_TITLE_CSS, EbayPage.ITEM_URL_CSS]
+        )
+
+    async def _select_random_product_options(self) -> None:
+        """Randomly select a valid option for each SKU listbox on the item page (see EbayPage)"""
+
+        try:
+            sku_section = self.page.locator("[data-testid='x-msku-evo']").first
+
+            if not await sku_section.is_visible():
+                return
+
+            await sku_section.scroll_into_view_if_needed()
+            listbox_buttons = sku_section.locator("button.listbox-button__control")
+
+            for idx in range(await listbox_buttons.count()):
+                try:
+                    btn = listbox_buttons.nth(idx)
+
+                    if not await btn.is_visible():
+                        continue
+
+                    previous_text = await btn.inner_text()
+                    await btn.click()
+                    listbox = btn.locator("xpath=following-sibling::div[@role='listbox']").first
+                    await listbox.wait_for(state="visible", timeout=1000)
+
+                    options = listbox.locator("div.listbox__option[role='option']:not([aria-disabled='true'])")
+                    selectable = []
+
+                    for opt in await options.all():
+                        value_span = opt.locator(".listbox__value").first
+
+                        if await value_span.is_visible():
+                            text = (await value_span.inner_text()).strip()
+
+                            if text and text != "Select":
+                                selectable.append(opt)
+
+                    if selectable:
+                        chosen = random.choice(selectable)
+                        await chosen.scroll_into_view_if_needed()
+                        await chosen.click()
+
+                        # The button shows the chosen value once the selection is applied
+                        await self.wait_for_text_change(btn, previous_text, timeout=1000)
+                except Exception:
+                    continue
+        except Exception:
+            pass
+
+    async def add_item_to_cart(self,
+                               product_urls: list[str],
+                               concurrency: Optional[int] = None,
+                               return_to_home: bool = True) -> AddToCartResult:
+        """
+        Add multiple items to cart, each in its own tab of this page's browser context.
+
+        Args:
+            product_urls: List of product URLs to add to cart
+            concurrency: Maximum number of tabs working at the same time (default from settings)
+            return_to_home: Open the homepage afterwards (not needed when a CartTracker is attached)
+
+        Returns:
+            AddToCartResult: Per-item outcome (added / no ATC button / failed), in URL order
+        """
+
+        concurrency = max(concurrency if concurrency is not None else Settings.CART_CONCURRENCY, 1)
+        semaphore = asyncio.Semaphore(concurrency)
+        started = time.monotonic()
+
+        async def add_one(index: int, url: str) -> CartItemOutcome:
+            async with semaphore:
+                item_started = time.monotonic()
+                tab = await self.page.context.new_page()
+
+                try:
+                    await tab.goto(url)
+                    await tab.wait_for_load_state("load", timeout=15000)
+                    outcome = await AsyncEbayPage(tab)._add_current_item_to_cart(index, url)
+                except Exception as e:
+                    logger.error(f"Error processing product {index} (URL: {url}): {e}")
+                    outcome = CartItemOutcome(index, url, CartItemOutcome.FAILED, error=str(e))
+                finally:
+                    await tab.close()
+
+                outcome.duration_s = time.monotonic() - item_started
+
+                return outcome
+
+        outcomes = await asyncio.gather(*(add_one(i, url) for i, url in enumerate(product_urls)))
+        result = AddToCartResult(list(outcomes), concurrency=concurrency, duration_s=time.monotonic() - started)
+        logger.info(result.summary())
+
+        if not return_to_home:
+            return result
+
+        # Return to main page so cart icon is available for subsequent actions
+        try:
+            await self.navigate_to()
+            await self.wait_for_page_load()
+        except Exception:
+            pass
+
+        return result
+
+    async def _add_current_item_to_cart(self, index: int, url: str) -> CartItemOutcome:
+        """Add the product open in this page to the cart (options are picked at random)"""
+
+        await self.modal_handler.install()
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        await ScreenshotService.default().capture_async(
+            self.page, f"{EbayPage.PRODUCT_SCREENSHOTS_DIR}/product_{index}_{timestamp}.png")
+
+        await self._select_random_product_options()
+
+        add_to_cart_button = self.page.locator(EbayPage.ADD_TO_CART_XPATH).first
+
+        try:
+            await add_to_cart_button.wait_for(state="visible", timeout=3000)
+        except Exception:
+            logger.warning(f"Add to Cart button not visible for item {index} (URL: {url}). Skipping add to cart.")
+
+            return CartItemOutcome(index, url, CartItemOutcome.NO_ATC_BUTTON)
+
+        # Wait for the cart request the click sends, or for the page to settle if none is seen
+        if await self.wait_for_response(EbayPage.ADD_TO_CART_RESPONSE_PATTERN, add_to_cart_button.click,
+                                        timeout=5000) is None:
+            await self.wait_for_dom_quiet(timeout=2000)
+
+        await self._dismiss_modal_if_present()
+
+        return CartItemOutcome(index, url, CartItemOutcome.ADDED)
+
+    async def assert_cart_total_not_exceeds(self, budget_per_item: float, item_count: int) -> None:
+        """
+        Assert that the cart total does not exceed item_count * budget_per_item, using the
+        CartTracker total of the context when it read a cart summary and opening the cart otherwise.
+
+        Raises:
+            AssertionError: If cart total exceeds the budget limit or cannot be found
+        """
+
+        tracker = CartTracker.for_context(self.page.context)
+        # Only a cart summary from the cart service is trusted; anything else means reading the cart page
+        cart_total = tracker.state.amount if tracker and tracker.state.confirmed else None
+
+        if cart_total is not None:
+            logger.info(f"Cart total taken from the network, no cart page load: {tracker.summary()}")
+        else:
+            await self.page.goto(EbayPage.CART_URL, wait_until="domcontentloaded")
+
+            # Cart content is rendered dynamically; this returns as soon as the summary shows an amount
+            cart_total = (await self.read_cart_summary()).amount
+
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            await ScreenshotService.default().capture_async(
+                self.page, f"{EbayPage.PRODUCT_SCREENSHOTS_DIR}/cart_{timestamp}.png")
+
+        max_total = item_count * budget_per_item
+
+        if cart_total is None:
+            raise AssertionError(
+                f"Could not find cart total on cart page. "
+                f"Expected maximum total: ${max_total:.2f} (${budget_per_item:.2f} × {item_count} items)"
+            )
+
+        assert cart_total <= max_total, (
+            f"Cart total ${cart_total:.2f} exceeds maximum allowed budget of ${max_total:.2f} "
+            f"(${budget_per_item:.2f} per item × {item_count} items)"
+        )
+
+    async def read_cart_summary(self, timeout: int = 10000) -> CartSummary:
+        """Read the cart summary of the open cart page in one in-page evaluation (see EbayPage)"""
+
+        args = [EbayPage.CART_TOTAL_XPATH, EbayPage.CART_SUBTOTAL_XPATH,
+                list(EbayPage.CART_TOTAL_TESTIDS), EbayPage.CART_LINE_ITEM_CSS]
+
+        try:
+            handle = await self.page.wait_for_function(EbayPage.CART_SUMMARY_READY_JS, arg=args, polling=100,
+                                                       timeout=timeout)
+            texts = await handle.json_value()
+        except PlaywrightTimeoutError:
+            logger.warning(f"Cart summary did not show an amount within {timeout} ms")
+            texts = await self.page.evaluate(EbayPage.CART_SUMMARY_EXTRACT_JS, args)
+
+        summary = CartSummary.from_texts(texts)
+        logger.info(summary.summary())
+
+        return summary
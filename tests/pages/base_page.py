@@ -1,17 +1,30 @@
 import logging
-from typing import Optional, List
-from playwright.sync_api import Page, Locator, TimeoutError as PlaywrightTimeoutError
+import time
+from collections import deque
+from typing import Callable, Iterable, Iterator, Optional, List, Tuple, Union
+from playwright.sync_api import Page, Locator, Response, Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
 from config.settings import Settings
+from tests.pages.modal_handler import ModalHandler
+from utils.instrumentation import instrument_class, record_fallback_timeout
+from utils.screenshots import ScreenshotService
+from utils import waits
+from utils.waits import UrlPattern
 
 logger = logging.getLogger(__name__)
 
 
+@instrument_class
 class BasePage:
     """Base page class with common methods using Playwright"""
+
+    # (URL regex, page type) pairs used to classify pages, e.g. for modal statistics
+    PAGE_TYPE_PATTERNS: List[Tuple[str, str]] = []
     
     def __init__(self, page: Page):
         self.page = page
         self.base_url = Settings.BASE_URL
+        self.last_fallback_index: Optional[int] = None
+        self.modal_handler = ModalHandler.for_page(page, self.PAGE_TYPE_PATTERNS)
     
     def navigate_to(self, url: str = ""):
         """Navigate to a URL"""
@@ -24,141 +37,30 @@ class BasePage:
             # Check for modal popup and dismiss it if present
             self._dismiss_modal_if_present()
     
-    def _dismiss_modal_if_present(self):
-        """Check for and dismiss modal popup on page load with robust retry logic"""
-        try:
-            # Wait a bit for any dynamic content to load
-            self.page.wait_for_timeout(3000)
-
-            # Take a screenshot to debug what's on the page
-            debug_screenshot = "reports/debug_modal_check.png"
-            self.page.screenshot(path=debug_screenshot, full_page=True)
-            logger.debug(f"Debug screenshot saved to: {debug_screenshot}")
-
-            # Try multiple strategies to dismiss modals
-            modal_dismissed = False
-
-            # Strategy 1: Try specific selectors for common modal patterns
-            modal_selectors = [
-                '//*[@id="mainContent"]/div/div/form/button',  # Original specific selector
-                '//button[contains(@class, "modal") or contains(@class, "popup") or contains(@class, "dialog")]',
-                '//button[contains(text(), "Continue") or contains(text(), "Accept") or contains(text(), "Close") or contains(text(), "OK") or contains(text(), "Yes")]',
-                '//div[@role="dialog"]//button',
-                '//div[contains(@class, "modal")]//button',
-                '//div[contains(@class, "popup")]//button',
-                '//button[contains(@aria-label, "Close") or contains(@aria-label, "Dismiss")]',
-                '//button[@type="button" and contains(@class, "btn")]',
-                '//a[contains(@class, "close") or contains(@class, "dismiss")]',
-                '//span[contains(@class, "close") or contains(@class, "dismiss")]',
-                '//div[contains(@class, "overlay")]//button',
-                '//div[contains(@id, "modal")]//button',
-                '//div[contains(@id, "popup")]//button',
-                '//button[contains(@class, "close") or contains(@class, "x-close")]',
-                '//button[@aria-label="Close"]',
-                '//button[@data-testid="close-button"]',
-                '//*[@id="mainContent"]/div/div[7]/div/div[2]/div[4]/div/button',
-            ]
-
-            # Try each selector with retry logic
-            for selector in modal_selectors:
-                for attempt in range(2):  # Try each selector up to 2 times
-                    try:
-                        modal_button = self.page.locator(selector).first  # Use .first to avoid strict mode violations
-                        if modal_button.is_visible(timeout=2000):
-                            logger.info(f"Modal popup detected with selector '{selector}' (attempt {attempt + 1}), dismissing...")
-
-                            # Get button text for debugging
-                            try:
-                                button_text = modal_button.inner_text(timeout=1000)
-                                logger.debug(f"Button text: '{button_text}'")
-                            except:
-                                logger.debug("Could not get button text")
-
-                            # Try to click the button
-                            modal_button.click(timeout=5000)
-
-                            # Wait for modal to close
-                            self.page.wait_for_timeout(2000)
-
-                            # Check if modal is gone by verifying the button is no longer visible
-                            if not modal_button.is_visible(timeout=1000):
-                                logger.info("Modal popup successfully dismissed")
-                                modal_dismissed = True
-                                break
-                            else:
-                                logger.warning(f"Warning: Modal popup may not have closed properly with selector '{selector}'")
-                    except Exception as e:
-                        logger.error(f"Failed to dismiss modal with selector '{selector}' (attempt {attempt + 1}): {e}")
-                        continue
-
-                if modal_dismissed:
-                    break
+    def _dismiss_modal_if_present(self, appear_timeout: Optional[int] = None) -> Optional[str]:
+        """
+        Dismiss a modal popup if one is showing. Returns right away when there is none;
+        modals that show up later are dismissed by the page's registered locator handlers.
 
-            # Strategy 2: If specific selectors didn't work, try keyboard shortcuts
-            if not modal_dismissed:
-                logger.info("Trying keyboard shortcuts to dismiss modal...")
-                try:
-                    # Try Escape key
-                    self.page.keyboard.press('Escape')
-                    self.page.wait_for_timeout(1000)
-
-                    # Check if any modal is still visible
-                    modal_check_selectors = [
-                        '//div[@role="dialog"]',
-                        '//div[contains(@class, "modal")]',
-                        '//div[contains(@class, "popup")]',
-                        '//div[contains(@class, "overlay")]'
-                    ]
-
-                    modal_still_present = False
-                    for check_selector in modal_check_selectors:
-                        if self.page.locator(check_selector).is_visible(timeout=1000):
-                            modal_still_present = True
-                            break
-
-                    if not modal_still_present:
-                        logger.info("Modal dismissed successfully with Escape key")
-                        modal_dismissed = True
-
-                except Exception as e:
-                    logger.error(f"Failed to dismiss modal with keyboard: {e}")
-
-            # Strategy 3: As last resort, try clicking outside the modal area
-            if not modal_dismissed:
-                logger.info("Trying to click outside modal area...")
-                try:
-                    # Click on the top-left corner of the page (usually outside modal)
-                    self.page.mouse.click(10, 10)
-                    self.page.wait_for_timeout(1000)
-
-                    # Check again if modal is gone
-                    modal_still_present = False
-                    for check_selector in modal_check_selectors:
-                        if self.page.locator(check_selector).is_visible(timeout=1000):
-                            modal_still_present = True
-                            break
-
-                    if not modal_still_present:
-                        logger.info("Modal dismissed successfully by clicking outside")
-                        modal_dismissed = True
-
-                except Exception as e:
-                    logger.error(f"Failed to dismiss modal by clicking outside: {e}")
-
-            if not modal_dismissed:
-                logger.info("No modal popup was found or could be dismissed")
-                # Take another screenshot to show what remains
-                final_screenshot = "reports/debug_modal_final.png"
-                self.page.screenshot(path=final_screenshot, full_page=True)
-                logger.debug(f"Final state screenshot saved to: {final_screenshot}")
-            else:
-                logger.info("Modal dismissal process completed successfully")
+        Args:
+            appear_timeout: Milliseconds to wait for a modal to appear (default from settings)
 
+        Returns:
+            str: Name of the modal pattern that was dismissed, or None
+        """
+
+        try:
+            return self.modal_handler.dismiss_if_present(appear_timeout_ms=appear_timeout)
         except Exception as e:
             logger.error(f"Error during modal dismissal: {e}")
             # Modal not present or couldn't be dismissed, continue normally
-            pass
-    
+            return None
+
+    def get_page_type(self) -> str:
+        """Page type of the current URL (used to remember which modal shows up where)"""
+
+        return self.modal_handler.page_type()
+
     def find_element(self, selector: str) -> Locator:
         """Find an element by selector"""
 
@@ -205,6 +107,36 @@ class BasePage:
 
         timeout_ms = timeout * 1000 if timeout else Settings.ACTION_TIMEOUT
         self.page.locator(selector).wait_for(state="visible", timeout=timeout_ms)
+
+    def wait_for_response(self,
+                          url: UrlPattern,
+                          action: Optional[Callable[[], object]] = None,
+                          status: Optional[int] = None,
+                          timeout: int = 10000) -> Optional[Response]:
+        """Run action and wait for the response it triggers; None if none matched in time (see utils.waits)"""
+
+        return waits.wait_for_response(self.page, url, action, status, timeout)
+
+    def wait_for_dom_quiet(self, quiet_ms: int = 300, timeout: int = 5000, selector: Optional[str] = None) -> bool:
+        """Wait until the DOM had no mutations for quiet_ms; False if it was still changing at timeout"""
+
+        return waits.wait_for_dom_quiet(self.page, quiet_ms, timeout, selector)
+
+    def wait_for_text_change(self, locator: Union[str, Locator], previous: str, timeout: int = 5000) -> bool:
+        """Wait until an element's text is no longer previous; False on timeout"""
+
+        if isinstance(locator, str):
+            locator = self.page.locator(locator).first
+
+        return waits.wait_for_text_change(locator, previous, timeout)
+
+    def wait_for_count_change(self, locator: Union[str, Locator], previous: int, timeout: int = 5000) -> bool:
+        """Wait until the number of matching elements is no longer previous; False on timeout"""
+
+        if isinstance(locator, str):
+            locator = self.page.locator(locator)
+
+        return waits.wait_for_count_change(locator, previous, timeout)
     
     def get_title(self) -> str:
         """Get page title"""
@@ -217,19 +149,96 @@ class BasePage:
         return self.page.url
     
     def take_screenshot(self, path: Optional[str] = None):
-        """Take a screenshot"""
+        """Take a screenshot (written in the background; the extension follows SCREENSHOT_FORMAT)"""
 
         if path is None:
             path = f"reports/screenshot_{self.page.url.split('/')[-1]}.png"
 
-        self.page.screenshot(path=path)
+        return ScreenshotService.default().capture(self.page, path, kind="manual")
+    
+    def open_in_tabs(self,
+                     urls: Iterable[str],
+                     concurrency: int,
+                     wait_until: str = "load",
+                     timeout: Optional[int] = None) -> Iterator[Tuple[int, str, Page, Optional[Exception]]]:
+        """
+        Open URLs in new tabs of the current browser context, keeping up to `concurrency`
+        navigations in flight while the caller works on the tab in front of the queue.
+        Tabs share the context's cookies (e.g. the eBay cart).
+
+        Args:
+            urls: URLs to open
+            concurrency: Maximum number of navigations loading in parallel
+            wait_until: Load state each tab reaches before it is yielded
+            timeout: Navigation timeout in milliseconds (default from settings)
+
+        Yields:
+            tuple: (index, url, tab, error) in input order; error is the navigation exception, or None.
+                   Each tab is closed once the caller moves on to the next one, and stopping the
+                   iteration early closes every tab that is still loading.
+        """
+
+        context = self.page.context
+        timeout_ms = timeout if timeout else Settings.NAVIGATION_TIMEOUT
+        pending = deque()
+        remaining_urls = iter(enumerate(urls))
+
+        def start_next() -> bool:
+            try:
+                index, url = next(remaining_urls)
+            except StopIteration:
+                return False
+
+            tab = context.new_page()
+            error = None
+
+            try:
+                # "commit" returns once the response starts; the rest of the page loads in the background
+                tab.goto(url, wait_until="commit", timeout=timeout_ms)
+            except PlaywrightError as e:
+                error = e
+
+            pending.append((index, url, tab, error))
 
-        return path
+            return True
+
+        try:
+            for _ in range(max(concurrency, 1)):
+                if not start_next():
+                    break
+
+            while pending:
+                index, url, tab, error = pending.popleft()
+
+                # Keep the window full while this tab finishes loading and is being worked on
+                start_next()
+
+                if error is None:
+                    try:
+                        tab.wait_for_load_state(wait_until, timeout=timeout_ms)
+                    except PlaywrightError as e:
+                        error = e
+
+                try:
+                    yield index, url, tab, error
+                finally:
+                    self._close_tab(tab)
+        finally:
+            for _, _, tab, _ in pending:
+                self._close_tab(tab)
+
+    @staticmethod
+    def _close_tab(tab: Page):
+        try:
+            tab.close()
+        except PlaywrightError as e:
+            logger.debug(f"Error closing tab: {e}")
     
     def find_element_with_fallback(self,
                                    *selectors: str,
                                    timeout: Optional[int] = None,
-                                   optional: bool = False) -> Optional[Locator]:
+                                   optional: bool = False,
+                                   race: Optional[bool] = None) -> Optional[Locator]:
         """
         Find element with fallback mechanism: tries all provided selectors until one succeeds
         
@@ -238,9 +247,13 @@ class BasePage:
                        (XPath, CSS, text, etc.). Can also pass a single list which will be unpacked.
             timeout: Timeout in milliseconds (default from settings)
             optional: If true, return only the first selector found.
+            race: If true, wait for all selectors at once against a single timeout and take the
+                  first one that becomes visible; if false, try them in order, each with the full
+                  timeout (default from settings)
             
         Returns:
-            Locator: The found element locator (first successful selector)
+            Locator: The found element locator (first successful selector). The index of the
+                     selector that matched is stored in self.last_fallback_index.
             
         Raises:
             TimeoutError: If none of the selectors find the element
@@ -282,17 +295,28 @@ class BasePage:
             raise ValueError("At least one selector must be provided")
         
         timeout_ms = timeout if timeout else Settings.ACTION_TIMEOUT
+        race = Settings.FALLBACK_RACE if race is None else race
+        self.last_fallback_index = None
+
+        if race and len(selector_list) > 1:
+            return self._race_fallback_selectors(selector_list, timeout_ms, optional)
+
         errors = []
         
         # Try each selector in order until one succeeds
         for i, selector in enumerate(selector_list):
+            attempt_started = time.monotonic()
+
             try:
                 locator = self.page.locator(selector)
                 locator.first.scroll_into_view_if_needed(timeout=timeout_ms)
                 locator.first.wait_for(state="visible", timeout=timeout_ms)
+                self.last_fallback_index = i
                 
                 return locator
             except (Exception, PlaywrightTimeoutError) as e:
+                record_fallback_timeout(time.monotonic() - attempt_started)
+
                 if optional:
                     return
                     
@@ -305,6 +329,65 @@ class BasePage:
 
         raise TimeoutError(error_message)
     
+    def _race_fallback_selectors(self,
+                                 selector_list: List[str],
+                                 timeout_ms: int,
+                                 optional: bool) -> Optional[Locator]:
+        """
+        Wait for any of the selectors to become visible within one shared timeout.
+        The earliest selector in the list that is visible at that moment wins.
+        """
+
+        visible_locators = [self.page.locator(f"{selector} >> visible=true").first for selector in selector_list]
+
+        any_visible = visible_locators[0]
+
+        for locator in visible_locators[1:]:
+            any_visible = any_visible.or_(locator)
+
+        started = time.monotonic()
+        deadline = started + timeout_ms / 1000
+
+        try:
+            any_visible.first.wait_for(state="visible", timeout=timeout_ms)
+        except PlaywrightTimeoutError as e:
+            record_fallback_timeout(time.monotonic() - started)
+
+            if optional:
+                return None
+
+            selectors_text = "\n".join(f"  - Selector {i+1} ('{sel}')" for i, sel in enumerate(selector_list))
+
+            raise TimeoutError(
+                f"Element not found with any of {len(selector_list)} selector(s) within {timeout_ms} ms: {e}\n"
+                f"{selectors_text}"
+            )
+
+        for i, (selector, locator) in enumerate(zip(selector_list, visible_locators)):
+            if not locator.is_visible():
+                continue
+
+            self.last_fallback_index = i
+
+            if i > 0:
+                logger.info(f"Fallback selector {i+1}/{len(selector_list)} ('{selector}') matched; "
+                            f"earlier selectors may be stale")
+
+            remaining_ms = max(int((deadline - time.monotonic()) * 1000), 1)
+
+            try:
+                locator.scroll_into_view_if_needed(timeout=remaining_ms)
+            except PlaywrightTimeoutError:
+                logger.debug(f"Could not scroll '{selector}' into view")
+
+            return self.page.locator(selector)
+
+        # The visible element went away between the wait and the check
+        if optional:
+            return None
+
+        raise TimeoutError(f"Element matched by one of {len(selector_list)} selector(s) is no longer visible")
+    
     def is_element_present_with_fallback(self, *selectors: str, timeout: Optional[int] = None) -> bool:
         """
         Check if element is present with fallback mechanism
@@ -0,0 +1,134 @@
+"""
+Cart Models
+Plain result objects returned by the cart-related page object methods
+"""
+
+import math
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from utils.price_parser import parse_price, parse_prices
+
+
+@dataclass
+class CartItemOutcome:
+    """What happened to a single product URL during add-to-cart"""
+
+    ADDED = "added"
+    NO_ATC_BUTTON = "no_atc_button"
+    FAILED = "failed"
+
+    index: int
+    url: str
+    status: str
+    error: Optional[str] = None
+    duration_s: float = 0.0
+
+
+@dataclass
+class AddToCartResult:
+    """Per-item outcomes of an add-to-cart run, in the order the URLs were given"""
+
+    outcomes: List[CartItemOutcome] = field(default_factory=list)
+    concurrency: int = 1
+    duration_s: float = 0.0
+
+    def _urls_with_status(self, status: str) -> List[str]:
+        return [outcome.url for outcome in self.outcomes if outcome.status == status]
+
+    @property
+    def added(self) -> List[str]:
+        return self._urls_with_status(CartItemOutcome.ADDED)
+
+    @property
+    def no_atc_button(self) -> List[str]:
+        return self._urls_with_status(CartItemOutcome.NO_ATC_BUTTON)
+
+    @property
+    def failed(self) -> List[str]:
+        return self._urls_with_status(CartItemOutcome.FAILED)
+
+    @property
+    def all_added(self) -> bool:
+        return len(self.added) == len(self.outcomes)
+
+    def summary(self) -> str:
+        """Human readable summary, e.g. for an Allure attachment"""
+
+        lines = [
+            f"Added {len(self.added)}/{len(self.outcomes)} items "
+            f"in {self.duration_s:.1f}s (concurrency {self.concurrency})"
+        ]
+
+        for outcome in self.outcomes:
+            line = f"{outcome.index + 1}. [{outcome.status}] {outcome.url} ({outcome.duration_s:.1f}s)"
+
+            if outcome.error:
+                line += f" - {outcome.error}"
+
+            lines.append(line)
+
+        return "\n".join(lines)
+
+
+@dataclass
+class CartSummary:
+    """Amounts read from the cart page in one evaluation, and the strategy that found the total"""
+
+    total: Optional[float] = None
+    subtotal: Optional[float] = None
+    shipping: Optional[float] = None
+    tax: Optional[float] = None
+    line_item_prices: List[float] = field(default_factory=list)
+    strategy: Optional[str] = None
+    currency: Optional[str] = None
+
+    @property
+    def amount(self) -> Optional[float]:
+        """The total, or the subtotal when the page shows no total line"""
+
+        return self.total if self.total is not None else self.subtotal
+
+    @classmethod
+    def from_texts(cls, texts: Dict) -> "CartSummary":
+        """Build a summary from the raw texts returned by the cart summary evaluation"""
+
+        def amount(text: Optional[str]) -> Optional[float]:
+            if text and text.strip().lower().startswith("free"):
+                return 0.0
+
+            # The amount is the largest one on its line (e.g. 'Subtotal (3 items) $245.97')
+            parsed = parse_price(text)
+
+            return parsed.high if parsed else None
+
+        total_text = texts.get("total_text")
+
+        # Last resort: the largest currency amount visible on the page
+        if not total_text and texts.get("currency_texts"):
+            batch = parse_prices(texts["currency_texts"])
+            candidates = [(high, text) for high, text in zip(batch.highs, texts["currency_texts"])
+                          if 0 < high < 1_000_000]
+            total_text = max(candidates)[1] if candidates else None
+
+        total_price = parse_price(total_text)
+
+        return cls(
+            total=amount(total_text),
+            subtotal=amount(texts.get("subtotal_text")),
+            shipping=amount(texts.get("shipping_text")),
+            tax=amount(texts.get("tax_text")),
+            line_item_prices=[price for price in parse_prices(texts.get("line_item_texts") or []).highs
+                              if not math.isnan(price)],
+            strategy=texts.get("strategy") if total_text or texts.get("subtotal_text") else None,
+            currency=total_price.currency if total_price else None,
+        )
+
+    def summary(self) -> str:
+        """Human readable summary, e.g. for a log line or an Allure attachment"""
+
+        fields = ("total", "subtotal", "shipping", "tax")
+        amounts = ", ".join(f"{name} {getattr(self, name):.2f}" for name in fields if getattr(self, name) is not None)
+
+        return (f"Cart summary ({self.strategy or 'not found'}): {amounts or 'no amounts'}; "
+                f"{len(self.line_item_prices)} line items {self.line_item_prices}")
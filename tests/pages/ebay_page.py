@@ -1,19 +1,39 @@
 import logging
-import os
 import random
 import re
+import time
+from contextlib import closing
 from datetime import datetime
+from itertools import islice
+from typing import Iterator, Optional
+from urllib.parse import urlencode
 
-from playwright.sync_api import Page
+from lxml import html as lxml_html
+from playwright.sync_api import Page, Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
 
+from config.settings import Settings
 from tests.pages.base_page import BasePage
+from tests.pages.cart_models import AddToCartResult, CartItemOutcome, CartSummary
+from tests.pages.search_models import SearchItem
+from utils.cart_tracker import CartTracker
+from utils.instrumentation import instrument_class
+from utils.price_parser import parse_prices
+from utils.screenshots import ScreenshotService
 
 logger = logging.getLogger(__name__)
 
 
+@instrument_class
 class EbayPage(BasePage):
     """Page Object Model for eBay.com homepage"""
 
+    PAGE_TYPE_PATTERNS = [
+        (r"://cart\.ebay\.", "cart"),
+        (r"/itm/", "item"),
+        (r"/sch/", "search"),
+        (r"://www\.ebay\.com/?(\?|#|$)", "home"),
+    ]
+
     def __init__(self, page: Page):
         super().__init__(page)
         self.base_url = "https://www.ebay.com"
@@ -124,6 +144,9 @@ class EbayPage(BasePage):
 
     # ==================== SEARCH RESULTS ELEMENTS ====================
 
+    # Search results page, opened directly with build_search_url()
+    SEARCH_URL = "https://www.ebay.com/sch/i.html"
+
     # Search results count
     RESULTS_COUNT_XPATH = "//h1[contains(@class, 'srp-controls__count-heading')]"
     RESULTS_COUNT_CSS = "h1.srp-controls__count-heading"
@@ -144,10 +167,51 @@ class EbayPage(BasePage):
     SEARCH_RESULT_ITEMS_XPATH = "//*[@id='srp-river-results']/ul/li"
     SEARCH_RESULT_ITEMS_CSS = "#srp-river-results > ul > li"
 
-    # Individual item price XPath (various formats)
+    # Individual item price/URL XPaths, relative to a result item
     ITEM_PRICE_XPATH = "div/div[2]/div[2]/div/div/span"
     ITEM_URL_XPATH = "div/div[2]/div/a"
 
+    # Fallback CSS for the same fields (eBay ships both s-item and s-card result layouts)
+    ITEM_PRICE_CSS = ".s-item__price, .s-card__price"
+    ITEM_TITLE_CSS = ".s-item__title, .s-card__title"
+    ITEM_URL_CSS = "a[href*='/itm/']"
+
+    # XPath versions of the fallbacks, for result HTML parsed outside the browser (HTTP engine)
+    ITEM_PRICE_FALLBACK_XPATH = ".//*[contains(@class, 's-item__price') or contains(@class, 's-card__price')]"
+    ITEM_TITLE_FALLBACK_XPATH = ".//*[contains(@class, 's-item__title') or contains(@class, 's-card__title')]"
+    ITEM_URL_FALLBACK_XPATH = ".//a[contains(@href, '/itm/')]"
+
+    # Pagination limit, to prevent endless page loops
+    MAX_RESULT_PAGES = 10
+
+    # Result collection engines: rendered results pages, or result HTML fetched with the context's request API
+    SEARCH_ENGINES = ("browser", "http")
+
+    # Extracts title, price text, URL and item id of every result item in one in-page evaluation.
+    # Field lookups are scoped to each item (XPath context node / element.querySelector).
+    SEARCH_RESULTS_EXTRACT_JS = """
+    (items, [priceXpath, urlXpath, priceCss, titleCss, urlCss]) => {
+        const byXpath = (context, xpath) => document.evaluate(
+            xpath, context, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        const isVisible = (node) => !!node && node.getClientRects().length > 0;
+
+        return items.map((item) => {
+            const priceNode = byXpath(item, priceXpath) || item.querySelector(priceCss);
+            const link = byXpath(item, urlXpath) || item.querySelector(urlCss);
+            const titleNode = item.querySelector(titleCss) || link;
+            const url = link ? link.getAttribute('href') : null;
+            const idMatch = url ? url.match(/\\/itm\\/(?:[^/?#]+\\/)?(\\d+)/) : null;
+
+            return {
+                title: titleNode ? titleNode.innerText.trim() : '',
+                price_text: isVisible(priceNode) ? priceNode.innerText : null,
+                url: url,
+                item_id: item.getAttribute('data-listingid') || (idMatch ? idMatch[1] : null),
+            };
+        });
+    }
+    """
+
     # Next page button
     NEXT_PAGE_XPATH = "//a[@aria-label='Go to next search page'] | //a[contains(@class, 'pagination__next')] | //a[contains(text(), 'Next')] | //button[contains(@aria-label, 'next')]"
     NEXT_PAGE_CSS = "a[aria-label*='next'], a.pagination__next, a:has-text('Next')"
@@ -158,6 +222,9 @@ class EbayPage(BasePage):
     ADD_TO_CART_XPATH = "//*[@id='atcBtn_btn_1']"
     ADD_TO_CART_CSS = "#atcBtn_btn_1"
 
+    # Responses that confirm an add-to-cart click
+    ADD_TO_CART_RESPONSE_PATTERN = re.compile(r"cart\.(payments\.)?ebay\.com|/atc\b|addtocart", re.IGNORECASE)
+
     ITEM_OPTIONS_BUTTON_XPATH = "//*[@id='mainContent']/div/div/div/span/button"
     ITEM_OPTIONS_BUTTON_CSS = "#mainContent > div > div.vim.x-msku-evo.mar-t-16 > div > span > button"
 
@@ -166,6 +233,9 @@ class EbayPage(BasePage):
 
     # ==================== CART PAGE ELEMENTS ====================
 
+    # Where product and cart screenshots are written
+    PRODUCT_SCREENSHOTS_DIR = "reports/product_screenshots"
+
     # Cart page URL (open cart directly when header cart icon is unavailable)
     CART_URL = "https://cart.ebay.com/"
 
@@ -177,6 +247,108 @@ class EbayPage(BasePage):
     CART_SUBTOTAL_XPATH = "//span[contains(@class, 'subtotal')] | //div[contains(@class, 'subtotal')]//span[contains(text(), '$')] | //span[contains(@id, 'subtotal')]"
     CART_SUBTOTAL_CSS = ".subtotal, #subtotal"
 
+    # Cart summary test ids and line items
+    CART_TOTAL_TESTIDS = ("cart-summary-total", "cart-total", "subtotal", "summary-total")
+    CART_LINE_ITEM_CSS = ".cart-bucket-lineitem, [data-test-id='cart-bucket-lineitem']"
+
+    # Reads the whole cart summary in one in-page evaluation. The total comes from the first strategy
+    # that matches: the total/subtotal XPaths, data-testid, a 'Total'/'Subtotal' label row, and finally
+    # every visible currency text (the largest one is picked in Python).
+    CART_SUMMARY_EXTRACT_JS = """
+    ([totalXpath, subtotalXpath, testids, lineItemCss]) => {
+        const isVisible = (node) => !!node && node.getClientRects().length > 0;
+        const text = (node) => node.innerText.trim();
+        const priceRe = /\\d[\\d.,]*/;
+        const currencyRe = /[$£€]|\\b(USD|GBP|EUR)\\b/;
+        const firstVisible = (xpath) => {
+            const nodes = document.evaluate(xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            for (let i = 0; i < nodes.snapshotLength; i++) {
+                const node = nodes.snapshotItem(i);
+                if (isVisible(node) && priceRe.test(text(node))) return text(node);
+            }
+            return null;
+        };
+
+        // Summary rows: a short label text node and the amount next to it in the same row
+        const labels = {
+            subtotal: /^(subtotal|items?\\s*\\(\\d+\\))/i,
+            shipping: /^shipping/i,
+            tax: /^(estimated\\s+)?tax/i,
+            total: /^(order\\s+total|cart\\s+total|total)/i,
+        };
+        const rows = {};
+        const currencyTexts = [];
+        const walker = document.createTreeWalker(document.body, NodeFilter.SHOW_TEXT);
+
+        for (let node = walker.nextNode(); node; node = walker.nextNode()) {
+            const value = node.nodeValue.trim();
+            const element = node.parentElement;
+
+            if (!value || value.length > 40 || !isVisible(element)) continue;
+
+            if (currencyRe.test(value) && priceRe.test(value) && currencyTexts.length < 50) {
+                currencyTexts.push(value);
+            }
+
+            for (const [field, labelRe] of Object.entries(labels)) {
+                if (!(field in rows) && labelRe.test(value)) {
+                    const row = element.parentElement || element;
+                    rows[field] = text(row).replace(value, '').trim() || null;
+                    break;
+                }
+            }
+        }
+
+        const summary = {
+            total_text: null,
+            strategy: null,
+            subtotal_text: rows.subtotal || null,
+            shipping_text: rows.shipping || null,
+            tax_text: rows.tax || null,
+            line_item_texts: Array.from(document.querySelectorAll(lineItemCss))
+                .filter(isVisible)
+                .map((item) => (text(item).match(/[$£€][^$£€]*\\d[\\d.,]*/g) || []).pop())
+                .filter(Boolean),
+            currency_texts: [],
+        };
+        const strategies = [
+            ['selector', () => firstVisible(totalXpath) || firstVisible(subtotalXpath)],
+            ['data-testid', () => {
+                for (const testid of testids) {
+                    const node = document.querySelector(`[data-testid*='${testid}']`);
+                    if (isVisible(node) && priceRe.test(text(node))) return text(node);
+                }
+                return null;
+            }],
+            ['label', () => rows.total || null],
+        ];
+
+        for (const [name, strategy] of strategies) {
+            const totalText = strategy();
+            if (totalText) {
+                summary.total_text = totalText;
+                summary.strategy = name;
+                return summary;
+            }
+        }
+
+        if (currencyTexts.length) {
+            summary.strategy = 'currency-scan';
+            summary.currency_texts = currencyTexts;
+        }
+
+        return summary;
+    }
+    """
+
+    # Polled by wait_for_function until the summary shows an amount, then handed back as the result
+    CART_SUMMARY_READY_JS = f"""
+    (args) => {{
+        const summary = ({CART_SUMMARY_EXTRACT_JS})(args);
+        return summary.total_text || summary.subtotal_text ? summary : null;
+    }}
+    """
+
     # ==================== HELPER METHODS ====================
 
     def search_for_item(self, search_term: str):
@@ -335,7 +507,14 @@ class EbayPage(BasePage):
         except (TimeoutError, ValueError):
             pass  # Continue even if logo not immediately found
 
-    def search_items_by_name_under_price(self, query: str, max_price: float, limit: int) -> list:
+    def search_items_by_name_under_price(self,
+                                         query: str,
+                                         max_price: float,
+                                         limit: int,
+                                         bulk_extract: Optional[bool] = None,
+                                         direct_url: Optional[bool] = None,
+                                         prefetch_pages: Optional[int] = None,
+                                         engine: Optional[str] = None) -> list:
         """
         Search eBay with price filtering and pagination.
 
@@ -343,31 +522,381 @@ class EbayPage(BasePage):
             query: Search query string
             max_price: Maximum price filter (items must be <= this price)
             limit: Minimum number of items to retrieve
+            bulk_extract, direct_url, prefetch_pages, engine: See iter_search_results
 
         Returns:
             list: List of URLs for found items (at least 'limit' items, or fewer if not enough found)
         """
 
-        # Helper function to extract price from text
-        def extract_price(price_text: str) -> float:
-            """Extract numeric price from text like '$19.99' or '$19.99 to $29.99'"""
-            if not price_text:
-                return float('inf')
+        # Stop iterating (and fetching further pages) as soon as we have enough items
+        results = self.iter_search_results(query, max_price, bulk_extract, direct_url, prefetch_pages, engine)
+
+        with closing(results):
+            return [item.url for item in islice(results, limit)]
+
+    def iter_search_results(self,
+                            query: str,
+                            max_price: float,
+                            bulk_extract: Optional[bool] = None,
+                            direct_url: Optional[bool] = None,
+                            prefetch_pages: Optional[int] = None,
+                            engine: Optional[str] = None) -> Iterator[SearchItem]:
+        """
+        Search eBay and yield the items priced at or under max_price, page by page as each results
+        page is parsed. Items are deduplicated by item id; the next page is only fetched when the
+        consumer asks for more, and pages prefetched in other tabs are dropped once it stops.
+
+        Args:
+            query: Search query string
+            max_price: Maximum price filter (items must be <= this price)
+            bulk_extract: Read all result items in one in-page evaluation instead of
+                          per-item locator calls (default from settings)
+            direct_url: Open the results (and every further page) by URL with the price filter and
+                        sort order as query parameters, instead of typing into the search box and
+                        clicking Next (default from settings)
+            prefetch_pages: With direct URLs, load up to this many further result pages at once in
+                            tabs of the same context once the first page is read; 0 reads them
+                            one by one (default from settings)
+            engine: "browser" renders the result pages; "http" fetches their HTML through the
+                    context's request API (same cookies, no rendering) and parses it in Python,
+                    falling back to the browser when eBay doesn't serve results that way
+                    (default from settings)
+
+        Yields:
+            SearchItem: Item id, URL, price and title of each qualifying result, in result order
+        """
+
+        engine = engine or Settings.SEARCH_ENGINE
+
+        if engine not in self.SEARCH_ENGINES:
+            raise ValueError(f"Unknown search engine: {engine}. Use one of: {', '.join(self.SEARCH_ENGINES)}")
+
+        seen: set[str] = set()
+
+        if engine == "http":
+            with closing(self._iter_result_pages_http(query, max_price)) as pages:
+                first_page = next(pages, None)
+
+                if first_page is not None:
+                    yield from self._qualifying_items(first_page, max_price, seen)
+
+                    for records in pages:
+                        yield from self._qualifying_items(records, max_price, seen)
+
+                    return
+
+            logger.warning("Search results could not be fetched over HTTP, falling back to the browser")
+
+        with closing(self._iter_result_pages(query, max_price, bulk_extract, direct_url, prefetch_pages)) as pages:
+            for records in pages:
+                yield from self._qualifying_items(records, max_price, seen)
+
+    def _iter_result_pages(self,
+                           query: str,
+                           max_price: float,
+                           bulk_extract: Optional[bool] = None,
+                           direct_url: Optional[bool] = None,
+                           prefetch_pages: Optional[int] = None) -> Iterator[list[dict]]:
+        """Records of each results page rendered in the browser (see iter_search_results)"""
+
+        if direct_url is None:
+            direct_url = Settings.SEARCH_DIRECT_URL
+
+        # Open the filtered results by URL; the search box and price widget are only the fallback
+        if direct_url and not self.open_search_results(query, max_price):
+            logger.warning("Direct search URL was rejected, falling back to the search box and price filter")
+            direct_url = False
+
+        if not direct_url:
+            self._search_via_search_box(query, max_price)
+
+        if bulk_extract is None:
+            bulk_extract = Settings.SEARCH_BULK_EXTRACTION
+
+        if prefetch_pages is None:
+            prefetch_pages = Settings.SEARCH_PREFETCH_PAGES
+
+        page_count = 0
+
+        # Read pages for as long as the consumer wants more items
+        while page_count < self.MAX_RESULT_PAGES:
+            # Wait for results to be visible
+            try:
+                self.page.wait_for_selector(self.SEARCH_RESULT_ITEMS_XPATH, timeout=10000)
+
+                if bulk_extract:
+                    records = self.extract_search_results()
+                else:
+                    records = self._extract_search_results_per_item()
+
+                if not records:
+                    logger.debug(f"No result items found on page {page_count + 1}")
+                    return
+
+                logger.info(f"Found {len(records)} result items on page {page_count + 1}")
+            except Exception as e:
+                logger.error(f"No search results found on page {page_count + 1}: {e}")
+                return
+
+            yield records
+
+            # Still iterating, so more items are needed: check if there's a next page
+            try:
+                next_button = self.page.locator(self.NEXT_PAGE_XPATH).first
+
+                if direct_url and prefetch_pages > 0:
+                    # The remaining pages are known by URL: load several at once instead of one by one
+                    if next_button.is_visible():
+                        last_page = self._last_result_page(self.get_results_count(), self.MAX_RESULT_PAGES)
+                        yield from self._iter_prefetched_pages(query, max_price, bulk_extract,
+                                                               range(page_count + 2, last_page + 1), prefetch_pages)
+                    return
+                elif direct_url:
+                    # Results are already loaded, so the Next link is either there or not
+                    if not next_button.is_visible() or not self.open_search_results(query, max_price,
+                                                                                     page_count + 2):
+                        return
+
+                    page_count += 1
+                elif next_button.is_visible(timeout=2000) and next_button.is_enabled():
+                    next_button.click()
+                    self.page.wait_for_load_state("load", timeout=15000)
+                    page_count += 1
+                else:
+                    # No more pages available
+                    return
+            except PlaywrightError:
+                # No next page button found
+                return
+
+    def _iter_prefetched_pages(self,
+                               query: str,
+                               max_price: float,
+                               bulk_extract: bool,
+                               page_numbers: range,
+                               prefetch_pages: int) -> Iterator[list[dict]]:
+        """
+        Records of further result pages opened in up to prefetch_pages tabs at a time, in page order.
+        Once the consumer stops iterating, tabs that are still loading are closed.
+        """
+
+        tabs = self.open_in_tabs([self.build_search_url(query, max_price, n) for n in page_numbers],
+                                 prefetch_pages, wait_until="domcontentloaded", timeout=15000)
+
+        # Closing the generator closes the tabs of pages that are not needed anymore
+        with closing(tabs):
+            for index, url, tab, error in tabs:
+                page_number = page_numbers[index]
+
+                if error is not None:
+                    logger.error(f"Could not open search results page {page_number}: {error}")
+                    return
+
+                results_page = EbayPage(tab)
+
+                try:
+                    tab.wait_for_selector(self.SEARCH_RESULT_ITEMS_XPATH, timeout=10000)
+
+                    if bulk_extract:
+                        records = results_page.extract_search_results()
+                    else:
+                        records = results_page._extract_search_results_per_item()
+                except PlaywrightError as e:
+                    logger.error(f"No search results found on page {page_number}: {e}")
+                    return
+
+                if not records:
+                    logger.debug(f"No result items found on page {page_number}")
+                    return
+
+                logger.info(f"Found {len(records)} result items on prefetched page {page_number}")
+
+                yield records
+
+    def _iter_result_pages_http(self, query: str, max_price: float) -> Iterator[list[dict]]:
+        """
+        Records of each results page fetched with the context's request API; the page itself doesn't
+        navigate. Yields nothing if the first page could not be fetched or parsed (e.g. a bot check).
+        """
+
+        for page_number in range(1, self.MAX_RESULT_PAGES + 1):
+            url = self.build_search_url(query, max_price, page_number)
+
+            try:
+                response = self.page.context.request.get(url, timeout=15000)
+                html = response.text() if response.ok and "/sch/" in response.url else None
+            except PlaywrightError as e:
+                logger.warning(f"Could not fetch search URL {url}: {e}")
+                html = None
+
+            records, has_next_page = self.parse_search_results_html(html) if html else ([], False)
+
+            if not records:
+                logger.debug(f"No result items fetched for page {page_number}: {url}")
+                return
+
+            logger.info(f"Fetched {len(records)} result items on page {page_number} over HTTP")
+
+            yield records
+
+            if not has_next_page:
+                return
+
+    @classmethod
+    def _qualifying_items(cls, records: list[dict], max_price: float, seen: set[str]) -> Iterator[SearchItem]:
+        """Records priced at or under max_price as SearchItems, skipping items already in seen"""
+
+        # Ranges count with their lower price; items without a visible price are NaN and skipped
+        lows = parse_prices(record["price_text"] for record in records).lows
+
+        for record, price in zip(records, lows):
+            # Only include items with price <= max_price
+            if not price <= max_price:
+                continue
+
+            url = cls._normalize_item_url(record["url"])
+
+            if not url:
+                continue
+
+            # Avoid duplicates (eBay repeats promoted listings across pages)
+            key = record["item_id"] or url
+
+            if key in seen:
+                continue
+
+            seen.add(key)
+            logger.debug(f"Collected item {len(seen)}: {url[:80]}...")
+
+            yield SearchItem(record["item_id"], url, price, record["title"])
+
+    @classmethod
+    def parse_search_results_html(cls, html: str) -> tuple[list[dict], bool]:
+        """
+        Parse a search results page's HTML with the same item XPaths the browser path uses.
+
+        Returns:
+            tuple: (records, has_next_page); records have the keys of extract_search_results
+        """
+
+        document = lxml_html.fromstring(html)
+        records = []
+
+        for item in document.xpath(cls.SEARCH_RESULT_ITEMS_XPATH):
+            price_nodes = item.xpath(cls.ITEM_PRICE_XPATH) or item.xpath(cls.ITEM_PRICE_FALLBACK_XPATH)
+            links = item.xpath(cls.ITEM_URL_XPATH) or item.xpath(cls.ITEM_URL_FALLBACK_XPATH)
+            title_nodes = item.xpath(cls.ITEM_TITLE_FALLBACK_XPATH) or links
+            url = links[0].get("href") if links else None
+            id_match = re.search(r'/itm/(?:[^/?#]+/)?(\d+)', url) if url else None
+
+            records.append({
+                "title": " ".join(title_nodes[0].text_content().split()) if title_nodes else "",
+                "price_text": " ".join(price_nodes[0].text_content().split()) if price_nodes else None,
+                "url": url,
+                "item_id": item.get("data-listingid") or (id_match.group(1) if id_match else None),
+            })
+
+        return records, bool(document.xpath(cls.NEXT_PAGE_XPATH))
+
+    def get_results_count(self) -> Optional[int]:
+        """Total number of results from the results heading, or None if it is not shown"""
+
+        try:
+            heading = self.page.locator(self.RESULTS_COUNT_XPATH).first
+            text = heading.inner_text(timeout=2000) if heading.count() else ""
+        except PlaywrightError:
+            return None
+
+        return self._parse_results_count(text)
+
+    @staticmethod
+    def _parse_results_count(text: str) -> Optional[int]:
+        """Parse '1,234 results for laptop' (or '10,000+ results') into 1234 (10000)"""
+
+        match = re.search(r'(\d[\d,.]*)\+?\s+results?', text or "")
+
+        return int(re.sub(r'[,.]', '', match.group(1))) if match else None
+
+    @staticmethod
+    def _last_result_page(results_count: Optional[int], max_pages: int, items_per_page: Optional[int] = None) -> int:
+        """Last results page worth opening; max_pages when the result count is unknown"""
+
+        if not results_count:
+            return max_pages
+
+        items_per_page = items_per_page or Settings.SEARCH_ITEMS_PER_PAGE
+
+        return max(min(-(-results_count // items_per_page), max_pages), 1)
+
+    @classmethod
+    def build_search_url(cls,
+                         query: str,
+                         max_price: Optional[float] = None,
+                         page_number: int = 1,
+                         items_per_page: Optional[int] = None,
+                         sort: Optional[int] = None) -> str:
+        """
+        URL of a search results page
+
+        Args:
+            query: Search query (_nkw)
+            max_price: Upper price bound (_udhi)
+            page_number: 1-based results page (_pgn)
+            items_per_page: Results per page (_ipg, default from settings)
+            sort: Sort order (_sop, default from settings; 15 = price + shipping, lowest first)
+        """
+
+        params = {"_nkw": query}
+
+        if max_price is not None:
+            params["_udhi"] = f"{max_price:g}"
 
-            # Remove currency symbols and extract first number
-            price_text = price_text.replace('$', '').replace(',', '').strip()
+        params["_sop"] = Settings.SEARCH_SORT if sort is None else sort
+        params["_ipg"] = items_per_page or Settings.SEARCH_ITEMS_PER_PAGE
 
-            # Handle price ranges (take the first/lower price)
-            if 'to' in price_text.lower():
-                price_text = price_text.split('to')[0].strip()
+        if page_number > 1:
+            params["_pgn"] = page_number
+
+        return f"{cls.SEARCH_URL}?{urlencode(params)}"
+
+    def open_search_results(self, query: str, max_price: Optional[float] = None, page_number: int = 1) -> bool:
+        """
+        Navigate straight to a search results page
+
+        Returns:
+            bool: False if eBay rejected the URL (error status, redirect away from the results
+                  page, or neither results nor a result count showed up)
+        """
+
+        url = self.build_search_url(query, max_price, page_number)
+
+        try:
+            response = self.page.goto(url, wait_until="domcontentloaded")
+        except PlaywrightError as e:
+            logger.warning(f"Could not open search URL {url}: {e}")
+            return False
+
+        if response is not None and not response.ok:
+            logger.warning(f"Search URL {url} returned status {response.status}")
+            return False
+
+        if "/sch/" not in self.page.url:
+            logger.warning(f"Search URL {url} redirected to {self.page.url}")
+            return False
+
+        try:
+            self.page.wait_for_selector(f"{self.SEARCH_RESULT_ITEMS_XPATH} | {self.RESULTS_COUNT_XPATH}", timeout=10000)
+        except PlaywrightError as e:
+            logger.warning(f"No search results on {url}: {e}")
+            return False
 
-            # Extract first number
-            match = re.search(r'(\d+\.?\d*)', price_text)
+        self._dismiss_modal_if_present()
+        logger.info(f"Opened search results page {page_number}: {url}")
 
-            if match:
-                return float(match.group(1))
+        return True
 
-            return float('inf')
+    def _search_via_search_box(self, query: str, max_price: float):
+        """Search through the header search box and the price filter widget (fallback for direct URLs)"""
 
         # Navigate to eBay landing page
         self.navigate_to()
@@ -386,7 +915,9 @@ class EbayPage(BasePage):
             # Short timeout so we don't hang if selector is wrong or element not present
             price_filter_input.wait_for(state="visible", timeout=8000)
             price_filter_input.scroll_into_view_if_needed(timeout=5000)
-            self.page.wait_for_timeout(1500)
+
+            # Let the filter panel settle after scrolling before typing into it
+            self.wait_for_dom_quiet(quiet_ms=200, timeout=1500)
 
             filled_price = str(max_price)
             price_filter_input.press_sequentially(filled_price)
@@ -399,100 +930,72 @@ class EbayPage(BasePage):
         except Exception as e:
             logger.warning(f"Price filter step skipped or failed: {e}. Continuing to collect items.")
 
-        items: list[str] = []
-        page_count = 0
-        max_pages = 10  # Limit pagination to prevent infinite loops
+    def extract_search_results(self) -> list[dict]:
+        """
+        Extract every result item on the current search results page in a single round trip.
 
-        # Collect items across pages until we have enough
-        while len(items) < limit and page_count < max_pages:
-            # Wait for results to be visible
-            try:
-                self.page.wait_for_selector(self.SEARCH_RESULT_ITEMS_XPATH, timeout=10000)
-                result_items = self.page.locator(self.SEARCH_RESULT_ITEMS_XPATH).all()
+        Returns:
+            list: One dict per result item with 'title', 'price_text' (None when no visible price),
+                  'url' and 'item_id'
+        """
 
-                if not result_items or len(result_items) == 0:
-                    logger.debug(f"No result items found on page {page_count + 1}")
-                    break
+        return self.page.locator(self.SEARCH_RESULT_ITEMS_XPATH).evaluate_all(
+            self.SEARCH_RESULTS_EXTRACT_JS,
+            [self.ITEM_PRICE_XPATH, self.ITEM_URL_XPATH, self.ITEM_PRICE_CSS, self.ITEM_TITLE_CSS, self.ITEM_URL_CSS]
+        )
 
-                logger.info(f"Found {len(result_items)} result items on page {page_count + 1}")
+    def _extract_search_results_per_item(self) -> list[dict]:
+        """Same records as extract_search_results, read with one locator call per field and item"""
+
+        records = []
+
+        for item in self.page.locator(self.SEARCH_RESULT_ITEMS_XPATH).all():
+            try:
+                price_element = item.locator(f"xpath={self.ITEM_PRICE_XPATH}").first
+                url = item.locator(f"xpath={self.ITEM_URL_XPATH}").first.get_attribute('href', timeout=1000)
+                price_text = price_element.inner_text() if price_element.is_visible() else None
+                item_id = re.search(r'/itm/(?:[^/?#]+/)?(\d+)', url) if url else None
+
+                records.append({
+                    "title": "",
+                    "price_text": price_text,
+                    "url": url,
+                    "item_id": item_id.group(1) if item_id else None,
+                })
             except Exception as e:
-                logger.error(f"No search results found on page {page_count + 1}: {e}")
-                break
+                # Skip items that can't be processed
+                logger.error(f"Error processing item: {e}")
+                continue
 
-            for i, item in enumerate(result_items, start=1):
-                if len(items) >= limit:
-                    break
+        return records
 
-                try:
-                    # Extract price
-                    price = float('inf')  # Default to infinity if price not found
-                    price_element = item.locator(f"//{self.ITEM_PRICE_XPATH}").first
+    @staticmethod
+    def _normalize_item_url(url: Optional[str]) -> Optional[str]:
+        """Clean a result item URL; returns None if it is not a usable eBay item URL"""
 
-                    try:
-                        if price_element.is_visible(timeout=1000):
-                            price_text = price_element.inner_text()
-                            price = extract_price(price_text)
-                    except:
-                        # Price element not found or not visible, try alternative methods
-                        price = 0
-
-                    # Only include items with price <= max_price
-                    if price <= max_price:
-                        # Try multiple methods to get URL
-                        url = item.locator(f"//{self.ITEM_URL_XPATH}").first.get_attribute('href')
-
-                        # Clean and validate URL
-                        if url:
-                            # Convert to string and strip whitespace
-                            url = str(url).strip()
-
-                            # Skip empty URLs
-                            if not url or url == 'None' or url == 'null':
-                                continue
-
-                            # Remove query parameters that might cause duplicates (but keep important ones)
-                            if '?' in url:
-                                # Keep the URL up to the query string for now, or split if needed
-                                base_url = url.split('?')[0]
-
-                                # Only use base URL if it contains /itm/
-                                if '/itm/' in base_url:
-                                    url = base_url
-
-                            # Validate URL contains ebay.com or /itm/
-                            if 'ebay.com' not in url and '/itm/' not in url:
-                                continue
-
-                            # Avoid duplicates
-                            if url and url not in items:
-                                items.append(url)
-                                logger.debug(f"Collected URL {len(items)}/{limit}: {url[:80]}...")
-                except Exception as e:
-                    # Skip items that can't be processed
-                    logger.error(f"Error processing item: {e}")
-                    continue
+        if not url:
+            return None
 
-            # Check if we need more items and if there's a next page
-            if len(items) < limit:
-                try:
-                    next_button = self.page.locator(self.NEXT_PAGE_XPATH).first
+        # Convert to string and strip whitespace
+        url = str(url).strip()
 
-                    if next_button.is_visible(timeout=2000) and next_button.is_enabled():
-                        next_button.click()
-                        self.page.wait_for_load_state("load", timeout=15000)
-                        page_count += 1
-                    else:
-                        # No more pages available
-                        break
-                except:
-                    # No next page button found
-                    break
-            else:
-                # We have enough items
-                break
-
-        # Return exactly 'limit' items (or fewer if not enough found)
-        return items[:limit]
+        # Skip empty URLs
+        if not url or url == 'None' or url == 'null':
+            return None
+
+        # Remove query parameters that might cause duplicates (but keep important ones)
+        if '?' in url:
+            base_url = url.split('?')[0]
+
+            # Only use base URL if it contains /itm/
+            if '/itm/' in base_url:
+                url = base_url
+
+        # Validate URL contains ebay.com or /itm/
+        if 'ebay.com' not in url and '/itm/' not in url:
+            return None
+
+        return url
 
     def _select_random_product_options(self) -> None:
         """
@@ -517,12 +1020,14 @@ class EbayPage(BasePage):
                     btn = listbox_buttons.nth(idx)
                     if not btn.is_visible(timeout=1000):
                         continue
+                    previous_text = btn.inner_text()
                     btn.click()
-                    self.page.wait_for_timeout(400)
 
                     # Listbox is the sibling div with role="listbox"
                     listbox = btn.locator("xpath=following-sibling::div[@role='listbox']").first
-                    if not listbox.is_visible(timeout=1000):
+                    try:
+                        listbox.wait_for(state="visible", timeout=1000)
+                    except PlaywrightError:
                         continue
 
                     # Options: role="option", exclude disabled and the "Select" placeholder
@@ -545,18 +1050,31 @@ class EbayPage(BasePage):
                         chosen = random.choice(selectable)
                         chosen.scroll_into_view_if_needed()
                         chosen.click()
-                        self.page.wait_for_timeout(300)
+
+                        # The button shows the chosen value once the selection is applied
+                        self.wait_for_text_change(btn, previous_text, timeout=1000)
                 except Exception:
                     continue
         except Exception:
             pass
 
-    def add_item_to_cart(self, product_urls: list[str]) -> None:
+    def add_item_to_cart(self,
+                         product_urls: list[str],
+                         concurrency: Optional[int] = None,
+                         return_to_home: bool = True) -> AddToCartResult:
         """
         Add multiple items to cart from product URLs.
 
         Args:
             product_urls: List of product URLs to add to cart
+            concurrency: Number of product pages loading in parallel tabs of the same browser
+                         context (default from settings); 1 processes the URLs one by one in this page
+            return_to_home: Open the homepage afterwards, for checks that read the header cart badge.
+                            Not needed when a CartTracker is attached to the context.
+
+        Returns:
+            AddToCartResult: Per-item outcome (added / no ATC button / failed), in URL order.
+                             Failures are recorded instead of aborting the remaining items.
 
         For each URL:
         - Navigates to product page
@@ -564,56 +1082,50 @@ class EbayPage(BasePage):
         - If the product has customization options (RightSummaryPanel x-msku-evo listboxes),
           randomly selects one valid option per listbox (e.g. Processor, SSD Size, O/S)
         - Adds product to cart
-        - Returns to main page
+        - Returns to main page (if return_to_home)
         """
 
-        # Create screenshots directory if it doesn't exist
-        screenshots_dir = "reports/product_screenshots"
-        os.makedirs(screenshots_dir, exist_ok=True)
-
-        for i, url in enumerate(product_urls):
-            try:
-                # Navigate to product page
-                self.page.goto(url)
-                self.page.wait_for_load_state("load", timeout=15000)
-
-                # Take screenshot of product page
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                screenshot_path = f"{screenshots_dir}/product_{i}_{timestamp}.png"
-                self.page.screenshot(path=screenshot_path)
+        concurrency = concurrency if concurrency is not None else Settings.CART_CONCURRENCY
+        result = AddToCartResult(concurrency=max(concurrency, 1))
+        started = time.monotonic()
 
-                # Handle product customization options (SKU listboxes: Processor, SSD, O/S, etc.)
-                self._select_random_product_options()
+        if concurrency <= 1:
+            for i, url in enumerate(product_urls):
+                item_started = time.monotonic()
 
-                # Add item to cart
                 try:
-                    add_to_cart_button = self.page.locator(self.ADD_TO_CART_XPATH).first
+                    # Navigate to product page
+                    self.page.goto(url)
+                    self.page.wait_for_load_state("load", timeout=15000)
+                    outcome = self._add_current_item_to_cart(i, url)
+                except Exception as e:
+                    logger.error(f"Error processing product {i} (URL: {url}): {e}")
+                    outcome = CartItemOutcome(i, url, CartItemOutcome.FAILED, error=str(e))
 
-                    if add_to_cart_button.is_visible(timeout=3000):
-                        add_to_cart_button.click()
+                outcome.duration_s = time.monotonic() - item_started
+                result.outcomes.append(outcome)
+        else:
+            for i, url, tab, error in self.open_in_tabs(product_urls, concurrency, timeout=15000):
+                item_started = time.monotonic()
 
-                        # Wait for cart action to complete
-                        self.page.wait_for_timeout(2000)
+                if error is not None:
+                    logger.error(f"Error loading product {i} (URL: {url}): {error}")
+                    outcome = CartItemOutcome(i, url, CartItemOutcome.FAILED, error=str(error))
+                else:
+                    try:
+                        outcome = EbayPage(tab)._add_current_item_to_cart(i, url)
+                    except Exception as e:
+                        logger.error(f"Error processing product {i} (URL: {url}): {e}")
+                        outcome = CartItemOutcome(i, url, CartItemOutcome.FAILED, error=str(e))
 
-                        # Check for and dismiss any popup that might have opened after adding to cart
-                        self._dismiss_modal_if_present()
-                    else:
-                        logging.warning(
-                            f"Add to Cart button not visible for item {i} (URL: {url}). Skipping add to cart.")
+                outcome.duration_s = time.monotonic() - item_started
+                result.outcomes.append(outcome)
 
-                        # Take screenshot of cart page
-                        screenshots_dir = "reports/product_screenshots"
-                        os.makedirs(screenshots_dir, exist_ok=True)
+        result.duration_s = time.monotonic() - started
+        logger.info(result.summary())
 
-                        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                        screenshot_path = f"{screenshots_dir}/cart_{timestamp}.png"
-                        self.page.screenshot(path=screenshot_path)
-                except Exception as e:
-                    # If add to cart fails, log but continue
-                    raise f"Failed to add item {i} to cart: {e}"
-            except Exception as e:
-                # If processing a product fails, log and continue with next item
-                raise f"Error processing product {i} (URL: {url}): {e}"
+        if not return_to_home:
+            return result
 
         # Return to main page so cart icon is available for subsequent actions
         try:
@@ -622,9 +1134,44 @@ class EbayPage(BasePage):
         except Exception:
             pass
 
+        return result
+
+    def _add_current_item_to_cart(self, index: int, url: str) -> CartItemOutcome:
+        """Add the product open in this page to the cart (options are picked at random)"""
+
+        # Take screenshot of product page
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        ScreenshotService.default().capture(self.page, f"{self.PRODUCT_SCREENSHOTS_DIR}/product_{index}_{timestamp}.png")
+
+        # Handle product customization options (SKU listboxes: Processor, SSD, O/S, etc.)
+        self._select_random_product_options()
+
+        # Add item to cart
+        add_to_cart_button = self.page.locator(self.ADD_TO_CART_XPATH).first
+
+        if not add_to_cart_button.is_visible(timeout=3000):
+            logger.warning(f"Add to Cart button not visible for item {index} (URL: {url}). Skipping add to cart.")
+
+            # Take screenshot of the page without the button
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            ScreenshotService.default().capture(self.page, f"{self.PRODUCT_SCREENSHOTS_DIR}/cart_{timestamp}.png",
+                                                kind="debug")
+
+            return CartItemOutcome(index, url, CartItemOutcome.NO_ATC_BUTTON)
+
+        # Wait for the cart request the click sends, or for the page to settle if none is seen
+        if self.wait_for_response(self.ADD_TO_CART_RESPONSE_PATTERN, add_to_cart_button.click, timeout=5000) is None:
+            self.wait_for_dom_quiet(timeout=2000)
+
+        # Check for and dismiss any popup that might have opened after adding to cart
+        self._dismiss_modal_if_present()
+
+        return CartItemOutcome(index, url, CartItemOutcome.ADDED)
+
     def assert_cart_total_not_exceeds(self, budget_per_item: float, item_count: int) -> None:
         """
-        Open cart and assert that the total cost does not exceed item_count * budget_per_item.
+        Assert that the cart total does not exceed item_count * budget_per_item. The total comes from
+        the CartTracker of the context when the cart service sent it a cart summary; otherwise the cart is opened.
         
         Args:
             budget_per_item: Maximum budget allowed per item
@@ -634,27 +1181,26 @@ class EbayPage(BasePage):
             AssertionError: If cart total exceeds the budget limit
         """
 
-        # Open the cart (navigate by URL so we don't depend on header cart icon selector)
-        self.page.goto(self.CART_URL)
-        self.page.wait_for_load_state("load", timeout=15000)
+        tracker = CartTracker.for_context(self.page.context)
+        # Only a cart summary from the cart service is trusted; anything else means reading the cart page
+        cart_total = tracker.state.amount if tracker and tracker.state.confirmed else None
 
-        # Wait for cart content to load (may be dynamic)
-        self.page.wait_for_timeout(3000)
+        if cart_total is not None:
+            logger.info(f"Cart total taken from the network, no cart page load: {tracker.summary()}")
+        else:
+            # Open the cart (navigate by URL so we don't depend on header cart icon selector)
+            self.page.goto(self.CART_URL, wait_until="domcontentloaded")
 
-        # Take screenshot of cart page
-        screenshots_dir = "reports/product_screenshots"
-        os.makedirs(screenshots_dir, exist_ok=True)
+            # Cart content is rendered dynamically; this returns as soon as the summary shows an amount
+            cart_total = self.read_cart_summary().amount
 
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        screenshot_path = f"{screenshots_dir}/cart_{timestamp}.png"
-        self.page.screenshot(path=screenshot_path)
+            # Take screenshot of cart page
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            ScreenshotService.default().capture(self.page, f"{self.PRODUCT_SCREENSHOTS_DIR}/cart_{timestamp}.png")
 
         # Calculate maximum allowed total
         max_total = item_count * budget_per_item
 
-        # Try to find cart total using multiple selectors and strategies
-        cart_total = self._parse_cart_total_from_page()
-
         # Assert that cart total does not exceed budget
         if cart_total is None:
             raise AssertionError(
@@ -667,100 +1213,29 @@ class EbayPage(BasePage):
             f"(${budget_per_item:.2f} per item × {item_count} items)"
         )
 
-    def _parse_cart_total_from_page(self) -> float | None:
+    def read_cart_summary(self, timeout: int = 10000) -> CartSummary:
         """
-        Try multiple strategies to find and parse the cart total on the current page.
-        Returns the total as a float, or None if not found.
+        Read subtotal, shipping, tax, total and line-item prices of the open cart page in one
+        in-page evaluation, as soon as the summary shows an amount.
+
+        Args:
+            timeout: Milliseconds to wait for the summary to render; after that whatever the page
+                     shows is read once more (e.g. an empty cart)
+
+        Returns:
+            CartSummary: Parsed amounts and the strategy that found the total (None if none did)
         """
-        cart_total_text = None
 
-        # 1) Existing XPath/CSS selectors
-        try:
-            total_element = self.page.locator(self.CART_TOTAL_XPATH).first
-            if total_element.is_visible(timeout=2000):
-                cart_total_text = total_element.inner_text()
-        except Exception:
-            pass
+        args = [self.CART_TOTAL_XPATH, self.CART_SUBTOTAL_XPATH, list(self.CART_TOTAL_TESTIDS), self.CART_LINE_ITEM_CSS]
 
-        if not cart_total_text:
-            try:
-                subtotal_element = self.page.locator(self.CART_SUBTOTAL_XPATH).first
-                if subtotal_element.is_visible(timeout=2000):
-                    cart_total_text = subtotal_element.inner_text()
-            except Exception:
-                pass
-
-        # 2) data-testid (eBay often uses these)
-        if not cart_total_text:
-            for testid in ("cart-summary-total", "cart-total", "subtotal", "summary-total"):
-                try:
-                    el = self.page.locator(f"[data-testid*='{testid}']").first
-                    if el.is_visible(timeout=1000):
-                        cart_total_text = el.inner_text()
-                        break
-                except Exception:
-                    continue
+        try:
+            texts = self.page.wait_for_function(self.CART_SUMMARY_READY_JS, arg=args, polling=100,
+                                                timeout=timeout).json_value()
+        except PlaywrightTimeoutError:
+            logger.warning(f"Cart summary did not show an amount within {timeout} ms")
+            texts = self.page.evaluate(self.CART_SUMMARY_EXTRACT_JS, args)
 
-        # 3) Text-based: elements containing "Total" or "Subtotal" and a currency amount
-        if not cart_total_text:
-            for label in ("Subtotal", "Total", "Order total", "Cart total"):
-                try:
-                    el = self.page.get_by_text(label, exact=False).first
-                    if el.is_visible(timeout=500):
-                        # Parent or following sibling often has the amount
-                        parent = el.locator("xpath=..")
-                        if parent.count():
-                            cart_total_text = parent.first.inner_text()
-                        if not cart_total_text or not re.search(r"[\d,]+\.?\d*", cart_total_text or ""):
-                            cart_total_text = el.inner_text()
-                        if cart_total_text and re.search(r"[\d,]+\.?\d*", cart_total_text):
-                            break
-                except Exception:
-                    continue
+        summary = CartSummary.from_texts(texts)
+        logger.info(summary.summary())
 
-        # 4) Any visible element that looks like a currency total (last resort)
-        if not cart_total_text:
-            try:
-                # Match elements whose text is mainly a price: optional $ £ etc and digits
-                price_locator = self.page.locator(
-                    "xpath=//*[contains(text(), '$') or contains(text(), '£') or contains(text(), 'USD') or contains(text(), 'GBP')]"
-                )
-                candidates = []
-                for i in range(min(price_locator.count(), 20)):
-                    try:
-                        node = price_locator.nth(i)
-                        if node.is_visible(timeout=0):
-                            text = node.inner_text()
-                            if text and re.search(r"[\d,]+\.?\d*", text):
-                                num = self._extract_price_number(text)
-                                if num is not None and 0 < num < 1_000_000:
-                                    candidates.append((num, text))
-                    except Exception:
-                        continue
-                if candidates:
-                    # Prefer the largest value that looks like a total (e.g. summary section)
-                    candidates.sort(key=lambda x: -x[0])
-                    cart_total_text = candidates[0][1]
-            except Exception:
-                pass
-
-        return self._extract_price_number(cart_total_text) if cart_total_text else None
-
-    def _extract_price_number(self, text: str | None) -> float | None:
-        """Extract a single price value from text (handles $1,234.56 and similar)."""
-        if not text:
-            return None
-        # Remove common currency symbols and spaces; keep digits, comma, dot
-        cleaned = re.sub(r"[^\d,.]", "", text)
-        # Find the last number that looks like a price (has decimal or is large)
-        matches = re.findall(r"[\d,]+\.?\d*", cleaned)
-        if not matches:
-            return None
-        # Take the largest number (total is usually the biggest amount on the line)
-        values = []
-        for m in matches:
-            try:
-                values.append(float(m.replace(",", "")))
-            except ValueError:
-                continue
-        return max(values) if values else None
+        return summary
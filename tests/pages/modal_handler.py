@@ -0,0 +1,452 @@
+"""
+Modal Handler
+Detects and dismisses overlays (consent forms, dialogs, add-to-cart layers) as they appear.
+ModalHandler serves sync pages and AsyncModalHandler async ones, with the same patterns, budgets
+and per-page-type statistics.
+"""
+
+import asyncio
+import logging
+import re
+import time
+import weakref
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from playwright.async_api import Page as AsyncPage
+from playwright.sync_api import Page, Locator, Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
+
+from config.settings import Settings
+from utils.screenshots import ScreenshotService
+
+logger = logging.getLogger(__name__)
+
+
+class ModalPattern:
+    """A known overlay: the element showing it is open and the control that closes it"""
+
+    def __init__(self, name: str, overlay_selector: str, dismiss_selector: str):
+        self.name = name
+        self.overlay_selector = overlay_selector
+        self.dismiss_selector = dismiss_selector
+
+    def __repr__(self) -> str:
+        return f"ModalPattern({self.name!r})"
+
+
+# eBay Skin dialog families: <div class="lightbox-dialog"> with a <button class="lightbox-dialog__close">, etc.
+_EBAY_DIALOG_KINDS = ("lightbox", "drawer", "fullscreen", "panel")
+
+# Elements that are dialog roots by ARIA role or aria-modal, and not hidden from assistive tech
+_DIALOG_ROOT = ", ".join(f'{root}:not([aria-hidden="true"])'
+                         for root in ('[role="dialog"]', '[role="alertdialog"]', '[aria-modal="true"]'))
+
+# Known overlay patterns, in the order they are tried when nothing has been recorded yet
+DEFAULT_MODAL_PATTERNS = [
+    # Cookie consent banner shown on a first visit
+    ModalPattern(
+        "consent-form",
+        '#gdpr-banner:not([hidden])',
+        '#gdpr-banner #gdpr-banner-accept',
+    ),
+    # Confirmation layer after add to cart; closing it keeps the item page open
+    ModalPattern(
+        "add-to-cart-layer",
+        f':is({_DIALOG_ROOT}):has-text("Added to cart")',
+        f':is({_DIALOG_ROOT}):has-text("Added to cart") :is(button, [role="button"])'
+        ':is([aria-label*="close" i], [class*="close"])',
+    ),
+    # eBay Skin dialogs, by the classes of their root and of their close button
+    ModalPattern(
+        "ebay-dialog",
+        ", ".join(f".{kind}-dialog:not([hidden])" for kind in _EBAY_DIALOG_KINDS),
+        ", ".join(f".{kind}-dialog__close" for kind in _EBAY_DIALOG_KINDS),
+    ),
+    # Any other dialog that declares itself one; only its explicit close controls are clicked
+    ModalPattern(
+        "dialog",
+        _DIALOG_ROOT,
+        f':is({_DIALOG_ROOT}) :is(button, [role="button"])'
+        ':is([aria-label*="close" i], [aria-label*="dismiss" i], [class*="close"])',
+    ),
+]
+
+
+def _visible(page: Union[Page, AsyncPage], selector: str) -> Locator:
+    """Locator restricted to visible matches, so hidden containers never count as an open modal"""
+
+    return page.locator(f"{selector} >> visible=true").first
+
+
+class _Budget:
+    """Milliseconds left of a dismissal budget"""
+
+    def __init__(self, budget_ms: int):
+        self.deadline = time.monotonic() + budget_ms / 1000
+
+    def remaining_ms(self) -> int:
+        return int((self.deadline - time.monotonic()) * 1000)
+
+
+class _ModalHandlerBase:
+    """Patterns, page classification, per-page-type statistics and budgets of the sync and async handlers"""
+
+    # page type -> Counter of pattern names that were seen and dismissed there (shared across pages)
+    _pattern_hits: Dict[str, Counter] = defaultdict(Counter)
+
+    def __init__(self,
+                 page: Union[Page, AsyncPage],
+                 page_types: Sequence[Tuple[str, str]] = (),
+                 patterns: Optional[List[ModalPattern]] = None):
+        self._page_ref = weakref.ref(page)
+        self.page_types = [(re.compile(pattern), name) for pattern, name in page_types]
+        self.patterns = list(patterns) if patterns is not None else list(DEFAULT_MODAL_PATTERNS)
+
+    @classmethod
+    def pattern_stats(cls) -> Dict[str, Dict[str, int]]:
+        """Which patterns were seen on which page types, e.g. {'home': {'consent-form': 3}}"""
+
+        return {page_type: dict(hits) for page_type, hits in cls._pattern_hits.items()}
+
+    @property
+    def page(self):
+        page = self._page_ref()
+
+        if page is None:
+            raise RuntimeError("Page attached to this modal handler no longer exists")
+
+        return page
+
+    @staticmethod
+    def classify_url(url: str, page_types: Sequence[Tuple["re.Pattern", str]]) -> str:
+        """Page type of a URL from compiled (regex, page type) pairs, 'other' if none matches"""
+
+        for pattern, name in page_types:
+            if pattern.search(url):
+                return name
+
+        return "other"
+
+    @classmethod
+    def order_patterns(cls, patterns: List[ModalPattern], page_type: str) -> List[ModalPattern]:
+        """Patterns sorted by how often they were seen on this page type (stable for ties)"""
+
+        hits = cls._pattern_hits.get(page_type)
+
+        if not hits:
+            return list(patterns)
+
+        return sorted(patterns, key=lambda p: -hits[p.name])
+
+    @classmethod
+    def record_pattern_hit(cls, page_type: str, pattern_name: str):
+        """Record that a pattern was seen and dismissed on a page type"""
+
+        cls._pattern_hits[page_type][pattern_name] += 1
+        logger.debug(f"Modal pattern '{pattern_name}' seen on '{page_type}' page")
+
+    def page_type(self) -> str:
+        """Classify the current page URL using the configured (regex, page type) pairs"""
+
+        return self.classify_url(self.page.url, self.page_types)
+
+    def ordered_patterns(self, page_type: Optional[str] = None) -> List[ModalPattern]:
+        """Patterns sorted by how often they were seen on this page type (stable for ties)"""
+
+        return self.order_patterns(self.patterns, page_type or self.page_type())
+
+    def record_hit(self, pattern_name: str, page_type: Optional[str] = None):
+        """Record that a pattern was seen and dismissed on a page type"""
+
+        self.record_pattern_hit(page_type or self.page_type(), pattern_name)
+
+    def _handler_options(self) -> Dict:
+        """page.add_locator_handler() options shared by every pattern"""
+
+        return {"no_wait_after": True, "times": Settings.MODAL_HANDLER_MAX_TRIGGERS}
+
+    @staticmethod
+    def _budgets(budget_ms: Optional[int], appear_timeout_ms: Optional[int]) -> Tuple[int, int]:
+        """Dismissal budget and appear timeout, defaulting to the settings"""
+
+        return (Settings.MODAL_DISMISS_BUDGET if budget_ms is None else budget_ms,
+                Settings.MODAL_APPEAR_TIMEOUT if appear_timeout_ms is None else appear_timeout_ms)
+
+    def _any_overlay(self) -> Locator:
+        """Single locator matching any visible overlay of any known pattern"""
+
+        locator = _visible(self.page, self.patterns[0].overlay_selector)
+
+        for pattern in self.patterns[1:]:
+            locator = locator.or_(_visible(self.page, pattern.overlay_selector))
+
+        return locator.first
+
+
+class ModalHandler(_ModalHandlerBase):
+    """
+    Event-driven modal dismissal for a single page.
+
+    Each known pattern is registered with page.add_locator_handler, so Playwright dismisses the overlay
+    itself whenever it shows up in front of an action. dismiss_if_present() covers the moment right after
+    a navigation with a single visibility probe, which costs one round trip when no modal is showing.
+    Patterns seen per page type are recorded so the most common one is tried first.
+    """
+
+    # One handler per Playwright page, so several page objects on the same page share it
+    _handlers: "weakref.WeakKeyDictionary[Page, ModalHandler]" = weakref.WeakKeyDictionary()
+
+    def __init__(self,
+                 page: Page,
+                 page_types: Sequence[Tuple[str, str]] = (),
+                 patterns: Optional[List[ModalPattern]] = None):
+        super().__init__(page, page_types, patterns)
+        self._installed = False
+
+    @classmethod
+    def for_page(cls, page: Page, page_types: Sequence[Tuple[str, str]] = ()) -> "ModalHandler":
+        """Return the handler attached to a page, creating and installing it on first use"""
+
+        handler = cls._handlers.get(page)
+
+        if handler is None:
+            handler = cls(page, page_types)
+            handler.install()
+            cls._handlers[page] = handler
+
+        return handler
+
+    def install(self):
+        """Register a locator handler per pattern so overlays are dismissed when they block an action"""
+
+        if self._installed:
+            return
+
+        for pattern in self.patterns:
+            self.page.add_locator_handler(_visible(self.page, pattern.overlay_selector),
+                                          self._make_locator_handler(pattern),
+                                          **self._handler_options())
+
+        self._installed = True
+
+    def _make_locator_handler(self, pattern: ModalPattern):
+        def handle():
+            logger.info(f"Modal '{pattern.name}' appeared in front of an action, dismissing...")
+
+            if self._dismiss(pattern, Settings.MODAL_DISMISS_BUDGET):
+                self.record_hit(pattern.name)
+
+        return handle
+
+    def _dismiss(self, pattern: ModalPattern, timeout_ms: int) -> bool:
+        """Click the pattern's dismiss control and wait for its overlay to go away"""
+
+        try:
+            _visible(self.page, pattern.dismiss_selector).click(timeout=timeout_ms)
+            _visible(self.page, pattern.overlay_selector).wait_for(state="hidden", timeout=timeout_ms)
+
+            return True
+        except (PlaywrightTimeoutError, PlaywrightError) as e:
+            logger.debug(f"Could not dismiss modal with pattern '{pattern.name}': {e}")
+
+            return False
+
+    def dismiss_if_present(self,
+                           budget_ms: Optional[int] = None,
+                           appear_timeout_ms: Optional[int] = None) -> Optional[str]:
+        """
+        Dismiss a visible modal within a time budget
+
+        Args:
+            budget_ms: Total time allowed for dismissing (default from settings)
+            appear_timeout_ms: How long to wait for a modal to appear; 0 only checks the current state
+                               (default from settings)
+
+        Returns:
+            str: Name of the pattern (or 'escape') that dismissed the modal, None if there was none
+                 or it could not be dismissed within the budget
+        """
+
+        budget_ms, appear_timeout_ms = self._budgets(budget_ms, appear_timeout_ms)
+        any_overlay = self._any_overlay()
+
+        try:
+            if appear_timeout_ms > 0:
+                any_overlay.wait_for(state="visible", timeout=appear_timeout_ms)
+            elif not any_overlay.is_visible():
+                return None
+        except PlaywrightTimeoutError:
+            return None
+
+        budget = _Budget(budget_ms)
+        page_type = self.page_type()
+
+        for pattern in self.ordered_patterns(page_type):
+            if budget.remaining_ms() <= 0:
+                break
+
+            if not _visible(self.page, pattern.overlay_selector).is_visible():
+                continue
+
+            logger.info(f"Modal popup detected with pattern '{pattern.name}', dismissing...")
+
+            if self._dismiss(pattern, budget.remaining_ms()):
+                self.record_hit(pattern.name, page_type)
+                logger.info("Modal popup successfully dismissed")
+
+                return pattern.name
+
+        # Last resort: most dialogs close on Escape
+        try:
+            self.page.keyboard.press("Escape")
+            any_overlay.wait_for(state="hidden", timeout=max(budget.remaining_ms(), 1))
+            self.record_hit("escape", page_type)
+            logger.info("Modal dismissed successfully with Escape key")
+
+            return "escape"
+        except (PlaywrightTimeoutError, PlaywrightError) as e:
+            logger.warning(f"Modal popup could not be dismissed within {budget_ms} ms: {e}")
+            self._save_debug_screenshot()
+
+        return None
+
+    def _save_debug_screenshot(self):
+        """Keep a screenshot of a modal that could not be dismissed"""
+
+        try:
+            final_screenshot = ScreenshotService.default().capture(self.page, "reports/debug_modal_final.png",
+                                                                   kind="debug")
+            logger.debug(f"Final state screenshot saved to: {final_screenshot}")
+        except PlaywrightError as e:
+            logger.debug(f"Could not save modal debug screenshot: {e}")
+
+
+class AsyncModalHandler(_ModalHandlerBase):
+    """
+    ModalHandler for pages of the Playwright async API. Locator handlers are registered as soon as
+    the handler is created inside a running event loop; install() waits for that registration.
+    """
+
+    _handlers: "weakref.WeakKeyDictionary[AsyncPage, AsyncModalHandler]" = weakref.WeakKeyDictionary()
+
+    def __init__(self,
+                 page: AsyncPage,
+                 page_types: Sequence[Tuple[str, str]] = (),
+                 patterns: Optional[List[ModalPattern]] = None):
+        super().__init__(page, page_types, patterns)
+        self._install_task: Optional[asyncio.Future] = None
+
+    @classmethod
+    def for_page(cls, page: AsyncPage, page_types: Sequence[Tuple[str, str]] = ()) -> "AsyncModalHandler":
+        """Return the handler attached to a page, creating it (and starting its installation) on first use"""
+
+        handler = cls._handlers.get(page)
+
+        if handler is None:
+            handler = cls(page, page_types)
+            cls._handlers[page] = handler
+
+            try:
+                handler._start_install()
+            except RuntimeError:
+                # No running loop (page object built outside a coroutine): install() registers them later
+                pass
+
+        return handler
+
+    def _start_install(self) -> asyncio.Future:
+        if self._install_task is None:
+            self._install_task = asyncio.get_running_loop().create_task(self._register_handlers())
+
+        return self._install_task
+
+    async def _register_handlers(self):
+        for pattern in self.patterns:
+            await self.page.add_locator_handler(_visible(self.page, pattern.overlay_selector),
+                                                self._make_locator_handler(pattern),
+                                                **self._handler_options())
+
+    async def install(self):
+        """Register a locator handler per pattern (once) and wait until they are in place"""
+
+        await self._start_install()
+
+    def _make_locator_handler(self, pattern: ModalPattern):
+        async def handle():
+            logger.info(f"Modal '{pattern.name}' appeared in front of an action, dismissing...")
+
+            if await self._dismiss(pattern, Settings.MODAL_DISMISS_BUDGET):
+                self.record_hit(pattern.name)
+
+        return handle
+
+    async def _dismiss(self, pattern: ModalPattern, timeout_ms: int) -> bool:
+        """Click the pattern's dismiss control and wait for its overlay to go away"""
+
+        try:
+            await _visible(self.page, pattern.dismiss_selector).click(timeout=timeout_ms)
+            await _visible(self.page, pattern.overlay_selector).wait_for(state="hidden", timeout=timeout_ms)
+
+            return True
+        except (PlaywrightTimeoutError, PlaywrightError) as e:
+            logger.debug(f"Could not dismiss modal with pattern '{pattern.name}': {e}")
+
+            return False
+
+    async def dismiss_if_present(self,
+                                 budget_ms: Optional[int] = None,
+                                 appear_timeout_ms: Optional[int] = None) -> Optional[str]:
+        """Async ModalHandler.dismiss_if_present"""
+
+        budget_ms, appear_timeout_ms = self._budgets(budget_ms, appear_timeout_ms)
+        any_overlay = self._any_overlay()
+
+        try:
+            if appear_timeout_ms > 0:
+                await any_overlay.wait_for(state="visible", timeout=appear_timeout_ms)
+            elif not await any_overlay.is_visible():
+                return None
+        except PlaywrightTimeoutError:
+            return None
+
+        budget = _Budget(budget_ms)
+        page_type = self.page_type()
+
+        for pattern in self.ordered_patterns(page_type):
+            if budget.remaining_ms() <= 0:
+                break
+
+            if not await _visible(self.page, pattern.overlay_selector).is_visible():
+                continue
+
+            logger.info(f"Modal popup detected with pattern '{pattern.name}', dismissing...")
+
+            if await self._dismiss(pattern, budget.remaining_ms()):
+                self.record_hit(pattern.name, page_type)
+                logger.info("Modal popup successfully dismissed")
+
+                return pattern.name
+
+        # Last resort: most dialogs close on Escape
+        try:
+            await self.page.keyboard.press("Escape")
+            await any_overlay.wait_for(state="hidden", timeout=max(budget.remaining_ms(), 1))
+            self.record_hit("escape", page_type)
+            logger.info("Modal dismissed successfully with Escape key")
+
+            return "escape"
+        except (PlaywrightTimeoutError, PlaywrightError) as e:
+            logger.warning(f"Modal popup could not be dismissed within {budget_ms} ms: {e}")
+            await self._save_debug_screenshot()
+
+        return None
+
+    async def _save_debug_screenshot(self):
+        """Keep a screenshot of a modal that could not be dismissed"""
+
+        try:
+            final_screenshot = await ScreenshotService.default().capture_async(
+                self.page, "reports/debug_modal_final.png", kind="debug")
+            logger.debug(f"Final state screenshot saved to: {final_screenshot}")
+        except PlaywrightError as e:
+            logger.debug(f"Could not save modal debug screenshot: {e}")
@@ -0,0 +1,17 @@
+"""
+Search Models
+Plain records yielded by the search page object methods
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(slots=True)
+class SearchItem:
+    """One search result that passed the price filter"""
+
+    item_id: Optional[str]
+    url: str
+    price: float
+    title: str = ""
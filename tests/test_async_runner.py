@@ -0,0 +1,46 @@
+import asyncio
+
+import pytest
+
+from utils.async_runner import AsyncRunner
+
+
+def test_runner_returns_results_and_raises_errors():
+    """Coroutines run on the runner's own thread; results and exceptions come back to the caller"""
+
+    runner = AsyncRunner()
+
+    async def fail():
+        raise ValueError("boom")
+
+    try:
+        assert runner.run(asyncio.sleep(0, result=42)) == 42
+
+        with pytest.raises(ValueError, match="boom"):
+            runner.run(fail())
+    finally:
+        runner.close()
+
+    assert runner.closed
+
+    with pytest.raises(RuntimeError):
+        runner.run(asyncio.sleep(0))
+
+
+def test_sync_driver_then_async_driver(playwright, async_runner, async_playwright_instance):
+    """The async fixtures still work once the sync playwright driver runs its loop on the main thread"""
+
+    assert playwright.chromium.name == "chromium"
+
+    async def browser_names():
+        return [async_playwright_instance.chromium.name, async_playwright_instance.firefox.name]
+
+    assert async_runner.run(browser_names()) == ["chromium", "firefox"]
+
+
+async def test_async_test_after_sync_driver(playwright, async_playwright_instance):
+    """'async def' tests run on the async_runner loop next to the sync driver"""
+
+    await asyncio.sleep(0)
+
+    assert playwright.webkit.name == async_playwright_instance.webkit.name == "webkit"
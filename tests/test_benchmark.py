@@ -0,0 +1,28 @@
+import pytest
+
+from utils.benchmark import BenchmarkBaseline, BenchmarkResult, MissingBaselineWarning, percentile
+
+
+def test_percentile_is_nearest_rank():
+    assert percentile(list(range(1, 101)), 95) == 95
+    assert percentile([3.0], 95) == 3.0
+
+
+def test_baseline_flags_regressions_beyond_threshold(tmp_path):
+    """A mean more than threshold slower than the baseline is a regression; no baseline is a warning"""
+
+    baseline = BenchmarkBaseline(str(tmp_path / "baseline.json"))
+    baseline.update(BenchmarkResult("extract_search_results[chromium]", [0.010] * 10))
+    baseline.save()
+
+    baseline = BenchmarkBaseline(str(tmp_path / "baseline.json"))
+
+    assert baseline.compare(BenchmarkResult("extract_search_results[chromium]", [0.012] * 10), threshold=0.25) is None
+    assert "regressed" in baseline.compare(BenchmarkResult("extract_search_results[chromium]", [0.013] * 10),
+                                           threshold=0.25)
+
+    with pytest.warns(MissingBaselineWarning, match="get_cart_count"):
+        assert baseline.compare(BenchmarkResult("get_cart_count[chromium]", [1.0]), threshold=0.25) is None
+
+    assert baseline.missing == ["get_cart_count[chromium]"]
+    assert "No baseline" in baseline.compare(BenchmarkResult("get_cart_count[chromium]", [1.0]), strict=True)
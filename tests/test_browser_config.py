@@ -0,0 +1,98 @@
+import json
+import os
+
+import pytest
+
+from config import browser_config
+from config.browser_config import get_browser_profile, load_browser_config
+from config.settings import Settings
+
+
+def _write_config(path, entries, mtime_ns=None):
+    path.write_text(json.dumps(entries))
+
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+@pytest.fixture
+def config_path(tmp_path, monkeypatch):
+    """A browser config file, with the env vars that would override it cleared"""
+
+    for name in ("HEADLESS", "SLOW_MO"):
+        monkeypatch.delenv(name, raising=False)
+
+    monkeypatch.setattr(Settings, "LAUNCH_PROFILE", "")
+    path = tmp_path / "browser_config.json"
+    _write_config(path, [{
+        "name": "chromium-ci",
+        "browser_name": "chromium",
+        "capabilities": {"headless": False, "slow_mo": 50, "args": ["--lang=en-US"], "launch_profile": "ci"},
+        "context": {"viewport": {"width": 1600, "height": 900}},
+    }], mtime_ns=1_000_000_000)
+
+    return path
+
+
+def test_config_is_parsed_once_per_file_version(config_path):
+    """Unchanged files come from the cache; a new modification time reloads them"""
+
+    first = load_browser_config(str(config_path))
+
+    assert load_browser_config(str(config_path)) is first
+
+    _write_config(config_path, [{"name": "firefox"}], mtime_ns=2_000_000_000)
+
+    assert load_browser_config(str(config_path)) == [{"name": "firefox"}]
+
+
+def test_profile_merges_launch_profile_file_and_env(config_path, monkeypatch):
+    """The file beats the launch profile (args are combined) except for headless, and a set env var beats both"""
+
+    profile = get_browser_profile("chromium", config_path=str(config_path))
+
+    assert profile.launch_profile == "ci"
+    assert profile.launch_options["headless"] is True
+    assert profile.launch_options["slow_mo"] == 50
+    assert profile.launch_options["args"] == ["--disable-gpu", "--disable-dev-shm-usage",
+                                              "--disable-smooth-scrolling", "--lang=en-US"]
+    assert profile.context_options["viewport"] == {"width": 1600, "height": 900}
+    assert profile.context_options["reduced_motion"] == "reduce"
+
+    monkeypatch.setenv("HEADLESS", "false")
+    monkeypatch.setattr(Settings, "HEADLESS", False)
+
+    assert get_browser_profile("chromium", config_path=str(config_path)).launch_options["headless"] is False
+
+
+def test_default_profile_keeps_playwright_defaults(config_path):
+    """Browsers a profile has no entry for, and entries absent from the file, add nothing"""
+
+    profile = get_browser_profile("webkit", launch_profile="default", config_path=str(config_path))
+
+    assert profile.launch_options == {"headless": Settings.HEADLESS, "slow_mo": Settings.SLOW_MO}
+    assert profile.context_options == {}
+
+
+def test_invalid_config_lists_every_problem(tmp_path):
+    """A malformed file fails with all of its problems at once and is not cached"""
+
+    path = tmp_path / "browser_config.json"
+    _write_config(path, [{"name": "edge", "capabilities": {"slow_mo": -1, "launch_profile": "turbo"}}])
+
+    with pytest.raises(ValueError) as error:
+        load_browser_config(str(path))
+
+    message = str(error.value)
+
+    assert "browser_name 'edge'" in message
+    assert "'slow_mo' must be a non-negative integer" in message
+    assert "unknown launch_profile 'turbo'" in message
+    assert path not in browser_config._config_cache
+
+
+def test_unknown_launch_profile_is_rejected(config_path):
+    """A typo in LAUNCH_PROFILE fails loudly instead of launching with the defaults"""
+
+    with pytest.raises(ValueError):
+        get_browser_profile("chromium", launch_profile="turbo", config_path=str(config_path))
@@ -0,0 +1,94 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from filelock import FileLock
+
+from config.browser_config import get_browser_profile
+from utils import browser_server
+from utils.browser_server import BrowserServerClient, BrowserServerDaemon, driver_command, server_launch_options
+
+WS_ENDPOINT = "ws://127.0.0.1:45123/3f0a"
+
+
+def _dead_pid() -> int:
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return process.pid
+
+
+def _write_state(server_dir, pid, launch_options):
+    server_dir.mkdir(parents=True, exist_ok=True)
+    state = {"pid": pid, "idle_timeout": 60,
+             "browsers": {"chromium": {"ws_endpoint": WS_ENDPOINT, "launch_options": launch_options}}}
+    (server_dir / "state.json").write_text(json.dumps(state))
+
+
+def test_launch_options_are_converted_for_launch_server():
+    """Python option names become launchServer's; slow_mo stays with each connection"""
+
+    assert server_launch_options({"headless": True, "slow_mo": 50, "firefox_user_prefs": {"a": 1}}) == {
+        "headless": True, "firefoxUserPrefs": {"a": 1}}
+
+
+def test_endpoint_is_used_only_with_the_current_launch_options(tmp_path):
+    """A daemon started with other options (e.g. headed) is not reused"""
+
+    current = server_launch_options(get_browser_profile("chromium").launch_options)
+    client = BrowserServerClient(str(tmp_path))
+
+    _write_state(tmp_path, os.getpid(), current)
+    assert client.endpoint("chromium") == WS_ENDPOINT
+    assert client.endpoint("firefox") is None
+
+    _write_state(tmp_path, os.getpid(), {**current, "args": ["--start-maximized"]})
+    assert client.endpoint("chromium") is None
+
+
+def test_state_of_a_dead_daemon_is_ignored(tmp_path):
+    """A state file left by a killed daemon means no daemon, so the fixture starts a new one"""
+
+    _write_state(tmp_path, _dead_pid(), {})
+
+    assert BrowserServerClient(str(tmp_path)).read_state() is None
+
+
+def test_leases_of_dead_sessions_do_not_keep_the_daemon_awake(tmp_path):
+    """Idle shutdown still happens when a pytest process died without disconnecting"""
+
+    leases = tmp_path / "leases"
+    leases.mkdir()
+    (leases / f"{_dead_pid()}-a1b2c3d4").touch()
+    daemon = BrowserServerDaemon(["chromium"], server_dir=str(tmp_path))
+
+    assert not daemon._has_sessions()
+    assert not any(leases.iterdir())
+
+    (leases / f"{os.getpid()}-e5f6a7b8").touch()
+
+    assert daemon._has_sessions()
+
+
+def test_start_falls_back_when_another_session_holds_the_lock(tmp_path, monkeypatch):
+    """A worker that times out waiting for the start lock launches locally instead of erroring"""
+
+    monkeypatch.setattr(browser_server, "LOCK_TIMEOUT", 0.1)
+
+    with FileLock(str(tmp_path / "daemon.lock")):
+        assert BrowserServerClient(str(tmp_path)).start(["chromium"]) is None
+
+    assert not (tmp_path / "daemon.log").exists()
+
+
+def test_missing_private_driver_module_fails_clearly(tmp_path, monkeypatch):
+    """A Playwright release without playwright._impl._driver is reported, and no daemon is started"""
+
+    monkeypatch.setitem(sys.modules, "playwright._impl._driver", None)
+
+    with pytest.raises(RuntimeError, match="playwright>=1.44"):
+        driver_command()
+
+    assert BrowserServerClient(str(tmp_path)).start(["chromium"]) is None
+    assert not (tmp_path / "daemon.log").exists()
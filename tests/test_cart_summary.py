@@ -0,0 +1,29 @@
+from tests.pages.cart_models import CartSummary
+
+
+def test_cart_summary_from_texts():
+    summary = CartSummary.from_texts({
+        "total_text": "US $255.97",
+        "strategy": "selector",
+        "subtotal_text": "$245.97",
+        "shipping_text": "Free",
+        "tax_text": "$10.00",
+        "line_item_texts": ["$99.99", "$65.99", "$79.99"],
+        "currency_texts": [],
+    })
+
+    assert (summary.total, summary.subtotal, summary.shipping, summary.tax) == (255.97, 245.97, 0.0, 10.0)
+    assert summary.line_item_prices == [99.99, 65.99, 79.99]
+    assert summary.strategy == "selector" and summary.currency == "USD"
+
+
+def test_cart_summary_currency_scan_and_subtotal_fallback():
+    """Without a total line, the largest visible currency amount is used; amount falls back to the subtotal"""
+
+    scanned = CartSummary.from_texts({"strategy": "currency-scan", "currency_texts": ["$12.00", "$245.97", "$0.00"]})
+    subtotal_only = CartSummary.from_texts({"strategy": None, "subtotal_text": "$49.99"})
+    empty = CartSummary.from_texts({"strategy": None, "currency_texts": []})
+
+    assert scanned.total == 245.97 and scanned.strategy == "currency-scan"
+    assert subtotal_only.amount == 49.99
+    assert empty.amount is None and empty.strategy is None
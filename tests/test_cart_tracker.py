@@ -0,0 +1,64 @@
+from utils.cart_tracker import CartTracker
+
+ATC_URL = "https://cart.payments.ebay.com/api/atc"
+CART_URL = "https://cart.payments.ebay.com/api/cart"
+
+
+def test_add_to_cart_response_sets_count_and_total():
+    """Count and amounts are read wherever the response nests them, including display-only text spans"""
+
+    tracker = CartTracker()
+    data = {
+        "modules": {
+            "cartSummary": {
+                "cartCount": 3,
+                "subtotal": {"value": 240.97, "currency": "USD"},
+                "grandTotal": {"textSpans": [{"text": "US "}, {"text": "$245.97"}]},
+            },
+        },
+    }
+
+    assert tracker.update(ATC_URL, 200, data, "POST")
+
+    state = tracker.state
+    assert (state.item_count, state.items_added) == (3, 1)
+    assert (state.total, state.subtotal, state.currency) == (245.97, 240.97, "USD")
+    assert state.amount == 245.97
+    assert state.confirmed
+
+
+def test_add_to_cart_without_count_grows_a_known_count():
+    """An add-to-cart response that carries no count adds one item to a count seen before"""
+
+    tracker = CartTracker()
+    tracker.update(CART_URL, 200, {"cartSummary": {"cartItemCount": "2 items"}}, "GET")
+    tracker.update(ATC_URL, 200, None, "POST")
+
+    assert tracker.state.item_count == 3
+    assert tracker.state.items_added == 1
+
+
+def test_failed_and_unrelated_responses_leave_state_alone():
+    """Error responses and bodies without cart fields change nothing"""
+
+    tracker = CartTracker()
+
+    assert not tracker.update(ATC_URL, 500, {"cartCount": 9}, "POST")
+    assert not tracker.update(CART_URL, 200, {"title": "Shopping cart"}, "GET")
+    assert tracker.state.item_count is None
+    assert tracker.state.amount is None
+
+
+def test_only_cart_summaries_are_trusted():
+    """Generic totals and counts, and summaries from other endpoints, never confirm the state"""
+
+    tracker = CartTracker()
+
+    assert not tracker.update(CART_URL, 200, {"total": 12.5, "itemCount": 4}, "GET")
+    assert not tracker.update(CART_URL, 200, {"cartSummary": {"total": 12.5, "itemCount": 4}}, "GET")
+    assert not tracker.update("https://www.ebay.com/cart/recs", 200, {"cartSummary": {"cartCount": 4}}, "GET")
+    assert tracker.update("https://www.ebay.com/itm/123/atc", 200, {"cartSummary": {"cartCount": 4}}, "POST")
+
+    state = tracker.state
+    assert not state.confirmed
+    assert (state.item_count, state.amount, state.items_added) == (None, None, 1)
@@ -0,0 +1,156 @@
+from utils.context_pool import ContextPool, _origin
+
+
+class _Frame:
+    def __init__(self, url):
+        self.url = url
+        self.parent_frame = None
+
+
+class _Page:
+    def __init__(self, context):
+        self.context = context
+        self.url = "about:blank"
+        self.listeners = []
+        self.routes = []
+
+    def on(self, event, callback):
+        self.listeners.append(callback)
+
+    def route(self, url, handler):
+        self.routes.append(url)
+
+    def unroute(self, url):
+        self.routes.remove(url)
+
+    def evaluate(self, expression, local_storage_items):
+        # The clear script: empties the current origin, then restores the given localStorage items
+        self.context.storage_cleared += 1
+        self.context.storage[_origin(self.url)] = {item["name"]: item["value"] for item in local_storage_items}
+
+    def goto(self, url, **kwargs):
+        self.url = url
+
+        for callback in self.listeners:
+            callback(_Frame(url))
+
+    def close(self):
+        self.context.pages.remove(self)
+
+
+class _Context:
+    def __init__(self):
+        self.pages = []
+        self.cookies = [{"name": "session", "value": "test"}]
+        self.storage = {}  # origin -> localStorage
+        self.storage_cleared = 0
+        self.listeners = []
+        self.closed = False
+
+    def set_default_navigation_timeout(self, timeout):
+        pass
+
+    def set_default_timeout(self, timeout):
+        pass
+
+    def on(self, event, callback):
+        self.listeners.append(callback)
+
+    def new_page(self):
+        page = _Page(self)
+        self.pages.append(page)
+
+        for callback in self.listeners:
+            callback(page)
+
+        return page
+
+    def storage_state(self, indexed_db=False):
+        return {
+            "cookies": self.cookies,
+            "origins": [{"origin": origin, "localStorage": [{"name": k, "value": v} for k, v in items.items()]}
+                        for origin, items in self.storage.items() if items],
+        }
+
+    def clear_cookies(self):
+        self.cookies = []
+
+    def clear_permissions(self):
+        pass
+
+    def add_cookies(self, cookies):
+        self.cookies.extend(cookies)
+
+    def close(self):
+        self.closed = True
+
+
+class _Browser:
+    def __init__(self):
+        self.contexts = []
+
+    def new_context(self, **kwargs):
+        context = _Context()
+        self.contexts.append(context)
+        return context
+
+
+def test_context_pool_reuses_and_resets_contexts():
+    """A released context is reset (extra pages closed, cookies back to the snapshot) and handed out again"""
+
+    consent_cookie = {"name": "consent", "value": "1", "domain": ".ebay.com", "path": "/"}
+    pool = ContextPool(_Browser(), {"storage_state": {"cookies": [consent_cookie]}}, size=1, max_uses=5)
+    pool.prefill()
+
+    context = pool.acquire()
+    context.new_page().goto("https://www.ebay.com/")
+    pool.release(context)
+
+    assert pool.acquire() is context
+    assert len(context.pages) == 1
+    assert context.pages[0].url == "about:blank"
+    assert context.pages[0].routes == []
+    assert context.cookies == [consent_cookie]
+    assert context.storage_cleared == 1
+    assert pool.stats()["hits"] == 2
+    assert pool.stats()["resets"] == 1
+
+
+def test_context_pool_recycles_after_max_uses():
+    """A context is closed after max_uses tests and the next acquire creates a new one (a miss)"""
+
+    pool = ContextPool(_Browser(), size=1, max_uses=2)
+    pool.prefill()
+
+    first = pool.acquire()
+    pool.release(first)
+    pool.release(pool.acquire())
+
+    second = pool.acquire()
+
+    assert first.closed
+    assert second is not first
+    assert pool.stats()["recycled"] == 1
+    assert pool.stats()["misses"] == 1
+
+
+def test_context_pool_reset_clears_every_origin():
+    """Storage left on any origin is cleared, and the snapshot's localStorage is put back"""
+
+    snapshot = {"cookies": [], "origins": [{"origin": "https://www.ebay.com",
+                                            "localStorage": [{"name": "consent", "value": "1"}]}]}
+    pool = ContextPool(_Browser(), {"storage_state": snapshot}, size=1, max_uses=5)
+    pool.prefill()
+
+    context = pool.acquire()
+    context.storage["https://www.ebay.com"] = {"consent": "1", "recent_searches": "laptop"}
+    context.pages[0].goto("https://signin.ebay.com/")
+    context.storage["https://signin.ebay.com"] = {"token": "abc"}
+    context.pages[0].goto("https://www.ebay.com/")
+    context.storage["https://pages.ebay.com"] = {"tracking": "1"}  # e.g. written by an iframe
+    pool.release(context)
+
+    assert context.storage == {"https://www.ebay.com": {"consent": "1"},
+                               "https://signin.ebay.com": {},
+                               "https://pages.ebay.com": {}}
+    assert context.storage_cleared == 3
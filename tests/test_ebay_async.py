@@ -0,0 +1,56 @@
+import asyncio
+
+import allure
+import pytest
+from playwright.async_api import BrowserContext, Page
+
+from tests.pages.async_ebay_page import AsyncEbayPage
+
+
+@allure.epic("eBay Tests")
+@allure.feature("Homepage Navigation (async)")
+@pytest.mark.smoke
+async def test_ebay_homepage_loads_async(async_page: Page, playwright_browser_name: str):
+    """Test that eBay homepage loads correctly using the async page objects"""
+
+    with allure.step(f"Navigate to eBay homepage on {playwright_browser_name}"):
+        ebay_page = AsyncEbayPage(async_page)
+        await ebay_page.navigate_to()
+        await ebay_page.wait_for_page_load()
+
+    with allure.step(f"Verify search box is visible on {playwright_browser_name}"):
+        assert await ebay_page.is_search_box_visible(), \
+            f"Search box should be visible on {playwright_browser_name}"
+
+
+@allure.epic("eBay Tests")
+@allure.feature("Search with Price Filter (async)")
+@pytest.mark.regression
+async def test_ebay_concurrent_searches_async(async_context: BrowserContext, playwright_browser_name: str):
+    """Test that one worker can run several price-filtered searches concurrently, one page each"""
+
+    queries = ["laptop", "headphones"]
+    max_price = 500.0
+    limit = 3
+
+    with allure.step(f"Search for {queries} concurrently with max price ${max_price} on {playwright_browser_name}"):
+        pages = [AsyncEbayPage(await async_context.new_page()) for _ in queries]
+        results = await asyncio.gather(*(
+            ebay_page.search_items_by_name_under_price(query=query, max_price=max_price, limit=limit)
+            for ebay_page, query in zip(pages, queries)
+        ))
+
+    for query, items in zip(queries, results):
+        with allure.step(f"Verify items were returned for '{query}' on {playwright_browser_name}"):
+            assert len(items) > 0, \
+                f"Should find at least one item for '{query}' with max price ${max_price} on {playwright_browser_name}"
+
+            for i, url in enumerate(items):
+                assert url.startswith('http'), \
+                    f"Item {i + 1} for '{query}' should be a valid URL starting with 'http' on {playwright_browser_name}"
+
+            allure.attach(
+                "\n".join(f"{i}. {url}" for i, url in enumerate(items, 1)),
+                name=f"Search Results URLs ({query})",
+                attachment_type=allure.attachment_type.TEXT
+            )
@@ -0,0 +1,111 @@
+import json
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from utils.grid_sessions import GridSessionManager
+
+
+class _GridHandler(BaseHTTPRequestHandler):
+    """Stand-in for the Selenium Grid /session endpoints"""
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status: int, body: dict):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        session_id = uuid.uuid4().hex
+        self.server.sessions.add(session_id)
+        self._reply(200, {"value": {"sessionId": session_id, "capabilities": {"browserName": "chrome"}}})
+
+    def do_GET(self):
+        session_id = self.path.split("/")[2]
+
+        if session_id in self.server.sessions:
+            self._reply(200, {"value": "about:blank"})
+        else:
+            self._reply(404, {"value": {"error": "invalid session id"}})
+
+    def do_DELETE(self):
+        session_id = self.path.split("/")[2]
+        self.server.sessions.discard(session_id)
+        self._reply(200, {"value": None})
+
+
+@pytest.fixture
+def grid_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _GridHandler)
+    server.sessions = set()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
+
+
+def _grid_url(server) -> str:
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def test_grid_sessions_are_prefilled_and_deleted(grid_server):
+    """prefill() creates the pool in parallel and close() deletes every session it created"""
+
+    manager = GridSessionManager(_grid_url(grid_server), pool_size=3)
+
+    assert manager.prefill() == 3
+    assert len(grid_server.sessions) == 3
+
+    session = manager.acquire()
+
+    assert session.cdp_url == f"ws://127.0.0.1:{grid_server.server_address[1]}/session/{session.session_id}/se/cdp"
+
+    manager.close()
+
+    assert grid_server.sessions == set()
+    assert manager.stats()["deleted"] == 3
+
+
+def test_unhealthy_grid_session_is_replaced(grid_server):
+    """A session the Grid no longer knows is dropped and a new one is created on acquire"""
+
+    with GridSessionManager(_grid_url(grid_server), pool_size=1) as manager:
+        manager.prefill()
+        stale = manager._idle[0]
+        grid_server.sessions.discard(stale.session_id)
+
+        session = manager.acquire()
+
+        assert session.session_id != stale.session_id
+        assert session.session_id in grid_server.sessions
+        assert manager.stats()["unhealthy"] == 1
+
+    assert grid_server.sessions == set()
+
+
+def test_grid_session_is_deleted_after_max_uses(grid_server):
+    """release() returns a session to the pool until it reaches max_uses"""
+
+    with GridSessionManager(_grid_url(grid_server), pool_size=1, max_uses=2) as manager:
+        manager.prefill()
+
+        session = manager.acquire()
+        manager.release(session)
+
+        assert manager.acquire() is session
+
+        manager.release(session)
+
+        assert session.session_id not in grid_server.sessions
+        assert manager.stats()["idle"] == 0
@@ -0,0 +1,53 @@
+from utils.instrumentation import _count_round_trip, instrument_class, record_fallback_timeout, start_recording, \
+    stop_recording
+
+
+class _FakePage:
+    def goto(self, url):
+        return url
+
+    def wait_for_timeout(self, timeout):
+        return None
+
+
+# Same wrapping install_playwright_instrumentation() applies to Playwright's Page
+_FakePage.goto = _count_round_trip("Page", "goto", _FakePage.goto)
+_FakePage.wait_for_timeout = _count_round_trip("Page", "wait_for_timeout", _FakePage.wait_for_timeout)
+
+
+@instrument_class
+class _SearchPage:
+    def __init__(self, page):
+        self.page = page
+
+    def search(self, query):
+        self.page.goto(f"https://www.ebay.com/sch/i.html?_nkw={query}")
+        self.page.wait_for_timeout(10)  # sleep-ok: exercises the sleep counter
+        record_fallback_timeout(0.5)
+
+
+def test_step_timings_breakdown():
+    """Page-object methods, round trips, sleeps and fallback timeouts all land in the test's recording"""
+
+    start_recording("tests/test_x.py::test_search")
+    _SearchPage(_FakePage()).search("laptop")
+    timings = stop_recording().to_dict()
+
+    assert timings["methods"]["_SearchPage.search"]["calls"] == 1
+    assert timings["playwright_calls"]["Page.goto"]["calls"] == 1
+    assert timings["round_trips"] == 2
+    assert timings["sleeps"] == 1
+    assert timings["fallback_timeouts"] == 1
+    assert timings["fallback_timeout_s"] == 0.5
+
+
+def test_nested_recordings_do_not_leak():
+    """A recording started inside another one pauses the outer recording until it stops"""
+
+    outer = start_recording("outer")
+    inner = start_recording("inner")
+    _SearchPage(_FakePage()).search("laptop")
+
+    assert stop_recording() is inner
+    assert stop_recording() is outer
+    assert inner.methods and not outer.methods
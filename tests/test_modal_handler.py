@@ -0,0 +1,53 @@
+import asyncio
+
+from tests.pages.async_ebay_page import AsyncEbayPage
+from tests.pages.modal_handler import DEFAULT_MODAL_PATTERNS, AsyncModalHandler, ModalHandler
+
+
+class _Locator:
+    def __init__(self, selector):
+        self.selector = selector
+
+    @property
+    def first(self):
+        return self
+
+
+class _AsyncPage:
+    def __init__(self, url):
+        self.url = url
+        self.handlers = []
+
+    def locator(self, selector):
+        return _Locator(selector)
+
+    async def add_locator_handler(self, locator, handler, **options):
+        self.handlers.append((locator.selector, options))
+
+
+async def test_async_page_objects_get_locator_handlers_when_built(async_runner):
+    """Building an async page object registers every pattern, with no navigation or explicit install"""
+
+    page = _AsyncPage("https://www.ebay.com/sch/i.html?_nkw=laptop")
+    ebay_page = AsyncEbayPage(page)
+
+    assert AsyncEbayPage(page).modal_handler is ebay_page.modal_handler
+
+    # One pass of the loop (as at the page object's first await) is enough for the registration
+    await asyncio.sleep(0)
+
+    assert [selector for selector, _ in page.handlers] == [f"{pattern.overlay_selector} >> visible=true"
+                                                           for pattern in DEFAULT_MODAL_PATTERNS]
+    assert all(options["no_wait_after"] for _, options in page.handlers)
+    assert ebay_page.get_page_type() == "search"
+
+
+def test_sync_and_async_handlers_share_pattern_stats():
+    """A pattern dismissed on an async page is tried first on sync pages of the same type, and vice versa"""
+
+    AsyncModalHandler.record_pattern_hit("item-stats-test", "add-to-cart-layer")
+
+    ordered = ModalHandler.order_patterns(DEFAULT_MODAL_PATTERNS, "item-stats-test")
+
+    assert ordered[0].name == "add-to-cart-layer"
+    assert ModalHandler.pattern_stats()["item-stats-test"] == {"add-to-cart-layer": 1}
@@ -0,0 +1,83 @@
+import pytest
+
+from collections import Counter
+
+from utils.network_blocking import (BLOCKING_PROFILES, ESTIMATED_BYTES_BY_RESOURCE_TYPE, FIRST_PARTY_DOMAINS,
+                                    NetworkBlocker)
+
+
+class _Request:
+    def __init__(self, url: str, resource_type: str, sizes=None):
+        self.url = url
+        self.resource_type = resource_type
+        self._sizes = sizes or {}
+
+    def sizes(self):
+        return self._sizes
+
+
+@pytest.fixture(autouse=True)
+def _fresh_size_samples(monkeypatch):
+    monkeypatch.setattr(NetworkBlocker, "_measured_bytes", Counter())
+    monkeypatch.setattr(NetworkBlocker, "_measured_responses", Counter())
+
+
+@pytest.mark.parametrize("profile, url, resource_type, expected", [
+    ("none", "https://i.ebayimg.com/images/g/abc/s-l500.jpg", "image", None),
+    ("media", "https://i.ebayimg.com/images/g/abc/s-l500.jpg", "image", "resource:image"),
+    ("media", "https://ir.ebaystatic.com/rs/v/app.js", "script", None),
+    ("third-party", "https://www.googletagmanager.com/gtm.js", "script", "tracker"),
+    ("third-party", "https://cdn.example-cdn.net/lib.js", "script", "third-party"),
+    ("third-party", "https://ir.ebaystatic.com/rs/v/app.js", "script", None),
+    ("aggressive", "https://www.ebay.com/sch/i.html?_nkw=laptop", "document", None),
+    ("aggressive", "https://www.ebay.com/fonts/market-sans.woff2", "font", "resource:font"),
+])
+def test_blocking_profile_rules(profile, url, resource_type, expected):
+    """Each profile blocks exactly the request classes it names and never the document itself"""
+
+    assert BLOCKING_PROFILES[profile].block_reason(url, resource_type, FIRST_PARTY_DOMAINS) == expected
+
+
+def test_network_blocker_counts_requests():
+    """Blocked and allowed requests are counted; without measurements bytes saved is the fixed guess"""
+
+    blocker = NetworkBlocker("media")
+
+    for request in (_Request("https://www.ebay.com/", "document"),
+                    _Request("https://i.ebayimg.com/a.jpg", "image"),
+                    _Request("https://i.ebayimg.com/b.jpg", "image")):
+        blocker._block_reason(request)
+
+    stats = blocker.stats()
+
+    assert stats["allowed"] == 1
+    assert stats["blocked"] == 2
+    assert stats["blocked_by_reason"] == {"resource:image": 2}
+    assert stats["estimated_bytes_saved"] == 2 * ESTIMATED_BYTES_BY_RESOURCE_TYPE["image"]
+    assert stats["estimated_bytes_saved_from_measured_sizes"] == 0
+    assert "estimated" in blocker.summary()
+
+
+def test_bytes_saved_uses_measured_sizes_of_allowed_responses():
+    """Blocked requests are priced at the average size of allowed responses of the same type"""
+
+    blocker = NetworkBlocker("third-party")
+
+    for body_size in (1_000, 3_000):
+        blocker._on_request_finished(_Request("https://ir.ebaystatic.com/rs/v/app.js", "script",
+                                              {"responseHeadersSize": 500, "responseBodySize": body_size}))
+
+    blocker._block_reason(_Request("https://cdn.example-cdn.net/lib.js", "script"))
+    blocker._block_reason(_Request("https://cdn.example-cdn.net/logo.png", "image"))
+
+    estimated, measured = blocker.estimated_bytes_saved()
+
+    assert measured == 2_500
+    assert estimated == 2_500 + ESTIMATED_BYTES_BY_RESOURCE_TYPE["image"]
+
+
+def test_unknown_blocking_profile_is_rejected():
+    """A typo in BLOCKING_PROFILE fails loudly instead of silently blocking nothing"""
+
+    with pytest.raises(ValueError):
+        NetworkBlocker("everything")
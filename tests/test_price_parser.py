@@ -0,0 +1,45 @@
+import math
+
+import pytest
+
+from utils.price_parser import ParsedPrice, parse_price, parse_prices
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("$19.99", ParsedPrice(19.99, 19.99, "USD")),
+    ("$19.99 to $29.99", ParsedPrice(19.99, 29.99, "USD")),
+    ("$1,234.56 to $2,000", ParsedPrice(1234.56, 2000.0, "USD")),
+    ("US $1,050.00", ParsedPrice(1050.0, 1050.0, "USD")),
+    ("C $62.15", ParsedPrice(62.15, 62.15, "CAD")),
+    ("£9.99", ParsedPrice(9.99, 9.99, "GBP")),
+    ("EUR 12,50", ParsedPrice(12.5, 12.5, "EUR")),
+    ("1.234,56 €", ParsedPrice(1234.56, 1234.56, "EUR")),
+    ("2 items $49.99", ParsedPrice(49.99, 49.99, "USD")),
+    ("Subtotal (3 items)\n$245.97", ParsedPrice(245.97, 245.97, "USD")),
+    ("19.99", ParsedPrice(19.99, 19.99, None)),
+    ("1 234,56 €", ParsedPrice(1234.56, 1234.56, "EUR")),
+    ("$19.99 - $29.99", ParsedPrice(19.99, 29.99, "USD")),
+    ("$399.99 + $15.00 shipping", ParsedPrice(399.99, 399.99, "USD")),
+    ("$599.99\n+$15.00 shipping", ParsedPrice(599.99, 599.99, "USD")),
+    ("Shipping $12.50", ParsedPrice(12.5, 12.5, "USD")),
+    ("Was: $599.99", ParsedPrice(599.99, 599.99, "USD")),
+    ("Now $449.00", ParsedPrice(449.0, 449.0, "USD")),
+    ("$449.00 Was: $599.99", ParsedPrice(449.0, 449.0, "USD")),
+    ("$1,999.00 (30% off)", ParsedPrice(1999.0, 1999.0, "USD")),
+])
+def test_parse_price(text, expected):
+    assert parse_price(text) == expected
+
+
+def test_parse_price_without_amount():
+    assert parse_price("Free shipping") is None
+    assert parse_price(None) is None
+
+
+def test_parse_prices_batch_is_index_aligned():
+    batch = parse_prices(["$5.00", None, "See price", "£1,045.00 to £1,100.00"], default_currency="USD")
+
+    assert list(batch.lows[:1]) == [5.0] and batch.lows[3] == 1045.0
+    assert batch.highs[3] == 1100.0
+    assert math.isnan(batch.lows[1]) and math.isnan(batch.highs[2])
+    assert batch.currencies == ["USD", None, None, "GBP"]
@@ -0,0 +1,50 @@
+import pytest
+
+from utils.screenshots import ScreenshotService
+
+
+class _Page:
+    def __init__(self):
+        self.calls = []
+
+    def goto(self, url):
+        pass
+
+    def screenshot(self, **kwargs):
+        self.calls.append(kwargs)
+        return b"\xff\xd8fake-jpeg"
+
+
+@pytest.mark.parametrize("policy, kind, expected", [
+    ("never", "failure", False),
+    ("on-failure", "step", False),
+    ("on-failure", "failure", True),
+    ("on-failure", "debug", True),
+    ("always", "step", True),
+])
+def test_screenshot_policy(policy, kind, expected):
+    """Routine step captures only happen under 'always' (or when sampled); failures under anything but 'never'"""
+
+    assert ScreenshotService(policy=policy).should_capture(kind) is expected
+
+
+def test_sampled_policy_keeps_every_nth_step_capture():
+    service = ScreenshotService(policy="sampled", sample_rate=0.25)
+
+    assert [service.should_capture("step") for _ in range(8)] == [True, False, False, False] * 2
+
+
+def test_screenshots_are_written_in_the_background(tmp_path):
+    """capture() returns right away with the final path; the writer thread puts the bytes on disk"""
+
+    service = ScreenshotService(policy="always", image_format="jpeg", quality=50, full_page=False)
+    page = _Page()
+
+    path = service.capture(page, str(tmp_path / "shots" / "product_0.png"))
+    service.close()
+
+    assert path.endswith("product_0.jpg")
+    assert page.calls == [{"type": "jpeg", "quality": 50, "full_page": False}]
+    assert open(path, "rb").read() == b"\xff\xd8fake-jpeg"
+    assert service.stats()["files_written"] == 1
+    assert service.stats()["bytes_written"] == len(b"\xff\xd8fake-jpeg")
@@ -0,0 +1,78 @@
+import json
+
+from utils.search_cache import SearchCache
+
+
+def test_search_runs_once_per_key(tmp_path):
+    """A second test (or browser, or worker) asking for the same search reads the cached URLs"""
+
+    cache = SearchCache(str(tmp_path), ttl=60, max_entries=10)
+    urls = ["https://www.ebay.com/itm/1", "https://www.ebay.com/itm/2", "https://www.ebay.com/itm/3"]
+    calls = []
+
+    def search():
+        calls.append(1)
+        return urls
+
+    assert cache.get_or_search("Laptop", 500.0, 3, search) == urls
+    assert cache.get_or_search(" laptop ", 500, 2, search) == urls[:2]
+    assert len(calls) == 1
+
+    # A larger limit than the cached search was run for needs a new search
+    cache.get_or_search("laptop", 500.0, 5, search)
+
+    assert len(calls) == 2
+    assert cache.stats() == {"hits": 1, "misses": 2}
+
+
+def test_expired_and_evicted_entries(tmp_path):
+    cache = SearchCache(str(tmp_path), ttl=60, max_entries=2, run_id="run-1")
+
+    for query in ("laptop", "phone", "tablet"):
+        cache.put(cache.key(query, 500.0), [f"https://www.ebay.com/itm/{query}"], 1)
+
+    assert cache.get(cache.key("laptop", 500.0), 1) is None  # oldest, evicted
+    assert cache.get(cache.key("tablet", 500.0), 1) == ["https://www.ebay.com/itm/tablet"]
+
+    # A later run reuses the entry only within the ttl
+    later_run = SearchCache(str(tmp_path), ttl=60, max_entries=2, run_id="run-2")
+
+    assert later_run.get(cache.key("tablet", 500.0), 1) == ["https://www.ebay.com/itm/tablet"]
+
+    entries = json.loads(cache.store_path.read_text())
+    entries[cache.key("tablet", 500.0)]["created_at"] -= 120
+    cache.store_path.write_text(json.dumps(entries))
+
+    assert later_run.get(cache.key("tablet", 500.0), 1) is None
+    assert cache.get(cache.key("tablet", 500.0), 1) == ["https://www.ebay.com/itm/tablet"]
+
+
+def test_entries_only_serve_their_run_by_default(tmp_path):
+    """Without a ttl, a new run searches again and drops the previous run's entries"""
+
+    first_run = SearchCache(str(tmp_path), ttl=0, run_id="run-1")
+    first_run.put(first_run.key("laptop", 500.0), ["https://www.ebay.com/itm/1"], 1)
+
+    assert first_run.get(first_run.key("laptop", 500.0), 1) == ["https://www.ebay.com/itm/1"]
+
+    second_run = SearchCache(str(tmp_path), ttl=0, run_id="run-2")
+
+    assert second_run.get(second_run.key("laptop", 500.0), 1) is None
+
+    second_run.put(second_run.key("phone", 500.0), ["https://www.ebay.com/itm/2"], 1)
+
+    assert list(json.loads(second_run.store_path.read_text())) == [second_run.key("phone", 500.0)]
+
+
+def test_refresh_and_empty_results(tmp_path):
+    """Opted-out tests still search (and refresh the entry); empty results are never shared"""
+
+    cache = SearchCache(str(tmp_path), ttl=60, max_entries=10)
+
+    assert cache.get_or_search("laptop", 500.0, 1, lambda: []) == []
+    assert cache.get(cache.key("laptop", 500.0), 1) is None
+
+    cache.get_or_search("laptop", 500.0, 1, lambda: ["https://www.ebay.com/itm/1"])
+    cache.get_or_search("laptop", 500.0, 1, lambda: ["https://www.ebay.com/itm/2"], refresh=True)
+
+    assert cache.get(cache.key("laptop", 500.0), 1) == ["https://www.ebay.com/itm/2"]
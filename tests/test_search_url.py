@@ -0,0 +1,99 @@
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+from tests.pages.ebay_page import EbayPage
+from tests.pages.search_models import SearchItem
+
+
+def test_build_search_url_carries_filters_as_parameters():
+    """Query, price cap, sort order, page size and page number all travel in the URL"""
+
+    url = EbayPage.build_search_url("gaming laptop", max_price=500.0, page_number=3, items_per_page=120, sort=15)
+    parsed = urlparse(url)
+
+    assert f"{parsed.scheme}://{parsed.netloc}{parsed.path}" == EbayPage.SEARCH_URL
+    assert parse_qs(parsed.query) == {
+        "_nkw": ["gaming laptop"],
+        "_udhi": ["500"],
+        "_sop": ["15"],
+        "_ipg": ["120"],
+        "_pgn": ["3"],
+    }
+
+
+def test_build_search_url_first_page_without_price_cap():
+    params = parse_qs(urlparse(EbayPage.build_search_url("laptop")).query)
+
+    assert "_udhi" not in params
+    assert "_pgn" not in params
+
+
+def test_parse_results_count():
+    assert EbayPage._parse_results_count("1,234 results for gaming laptop") == 1234
+    assert EbayPage._parse_results_count("10,000+ results for laptop") == 10000
+    assert EbayPage._parse_results_count("") is None
+
+
+def test_last_result_page_bounds_prefetch():
+    """Prefetch stops at the last page that has results, and never goes past max_pages"""
+
+    assert EbayPage._last_result_page(130, max_pages=10, items_per_page=60) == 3
+    assert EbayPage._last_result_page(100000, max_pages=10, items_per_page=60) == 10
+    assert EbayPage._last_result_page(None, max_pages=10) == 10
+
+
+def test_qualifying_items_dedupe_across_pages():
+    """Records from later pages are merged in order; repeated item ids and items over the price cap are dropped"""
+
+    seen = set()
+    page_1 = [{"item_id": "1", "title": "A", "price_text": "$99.00", "url": "https://www.ebay.com/itm/1?hash=a"},
+              {"item_id": "2", "title": "B", "price_text": "$600.00", "url": "https://www.ebay.com/itm/2"}]
+    page_2 = [{"item_id": "1", "title": "A", "price_text": "$99.00", "url": "https://www.ebay.com/itm/1?hash=b"},
+              {"item_id": "3", "title": "C", "price_text": None, "url": "https://www.ebay.com/itm/3"},
+              {"item_id": None, "title": "D", "price_text": "$45.50", "url": "https://www.ebay.com/itm/4"}]
+
+    items = list(EbayPage._qualifying_items(page_1, 500, seen)) + list(EbayPage._qualifying_items(page_2, 500, seen))
+
+    assert items == [SearchItem("1", "https://www.ebay.com/itm/1", 99.0, "A"),
+                     SearchItem(None, "https://www.ebay.com/itm/4", 45.5, "D")]
+
+
+def test_search_stops_fetching_pages_once_limit_is_reached(monkeypatch):
+    """The list method is a wrapper over iter_search_results; no page is read past the one that filled the limit"""
+
+    pages_read = []
+    closed = []
+
+    def result_pages(*args):
+        try:
+            for page_number in range(1, 4):
+                pages_read.append(page_number)
+                yield [{"item_id": f"{page_number}{i}", "title": "", "price_text": "$10.00",
+                        "url": f"https://www.ebay.com/itm/{page_number}{i}"} for i in range(3)]
+        finally:
+            closed.append(True)
+
+    ebay_page = EbayPage.__new__(EbayPage)
+    monkeypatch.setattr(ebay_page, "_iter_result_pages", result_pages)
+
+    urls = ebay_page.search_items_by_name_under_price("laptop", 500.0, limit=4, engine="browser")
+
+    assert urls == [f"https://www.ebay.com/itm/{n}" for n in (10, 11, 12, 20)]
+    assert pages_read == [1, 2]
+    assert closed == [True]
+
+
+def test_parse_search_results_html_matches_browser_records():
+    """The HTTP engine reads the same fields from raw HTML as the in-page extraction"""
+
+    html = (Path(__file__).parent / "benchmarks" / "fixtures" / "search.html").read_text(encoding="utf-8")
+    records, has_next_page = EbayPage.parse_search_results_html(html)
+
+    assert len(records) == 60
+    assert has_next_page
+    assert records[0] == {
+        "title": "Refurbished Laptop 1 16GB RAM 512GB SSD",
+        "price_text": "$683.19",
+        "url": "https://www.ebay.com/itm/2000000000?_skw=laptop&hash=item0000",
+        "item_id": "2000000000",
+    }
@@ -0,0 +1,56 @@
+import os
+from collections import Counter
+
+from utils.sleep_lint import DEFAULT_PATHS, find_sleeps, report, scan
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SOURCE = '''
+import asyncio
+import time
+
+
+def add_to_cart(page, delay):
+    page.wait_for_timeout(2000)
+    time.sleep(delay)
+    time.sleep(1)  # sleep-ok: retry backoff
+
+
+async def open_cart(page):
+    await asyncio.sleep(0.5)
+    await page.wait_for_selector("#cart")
+    await asyncio.sleep(0)
+    page.wait_for_timeout(0)
+'''
+
+
+def test_find_sleeps_reports_unsuppressed_sleeps():
+    sleeps = find_sleeps(SOURCE, "pages/cart.py")
+
+    assert [(sleep.line, sleep.call, sleep.duration_s) for sleep in sleeps] == [
+        (7, "wait_for_timeout", 2.0),
+        (8, "time.sleep", None),
+        (13, "asyncio.sleep", 0.5),
+    ]
+
+
+def test_find_sleeps_skips_zero_duration_yields():
+    sleeps = find_sleeps("import asyncio\n\n\nasync def tick():\n    await asyncio.sleep(0, result=1)\n", "tick.py")
+
+    assert sleeps == []
+
+
+def test_repo_has_no_unmarked_fixed_sleeps():
+    """The lint's own default run over this repo comes back clean"""
+
+    sleeps = scan(os.path.join(REPO_ROOT, path) for path in DEFAULT_PATHS)
+
+    assert sleeps == [], report(sleeps, Counter())
+
+
+def test_report_joins_runtime_cost():
+    sleeps = find_sleeps(SOURCE, "pages/cart.py")
+    lines = report(sleeps, Counter({"pages/cart.py:7": 6.0})).splitlines()
+
+    assert lines[0] == "pages/cart.py:7: fixed sleep wait_for_timeout (2.00s per call, 6.00s this run)"
+    assert lines[-1] == "3 fixed sleep(s) in the code; 6.00s spent sleeping in the last run"
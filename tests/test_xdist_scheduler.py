@@ -0,0 +1,78 @@
+from types import SimpleNamespace
+
+from utils.xdist_scheduler import DurationScheduling, assign_browsers, browser_of_test, predict_makespan
+
+
+class _Config:
+    def __init__(self, workers: int):
+        self.workers = workers
+
+    def getvalue(self, name):
+        return [f"{self.workers}*popen"] if name == "tx" else None
+
+    def getoption(self, name):
+        return None
+
+
+class _Node:
+    def __init__(self, worker_id: str):
+        self.gateway = SimpleNamespace(id=worker_id)
+        self.shutting_down = False
+        self.sent = []
+
+    def send_runtest_some(self, indices):
+        self.sent.extend(indices)
+
+    def shutdown(self):
+        self.shutting_down = True
+
+
+COLLECTION = [
+    "tests/test_ebay.py::test_search[chromium]",
+    "tests/test_ebay.py::test_search[firefox]",
+    "tests/test_ebay.py::test_cart[chromium]",
+    "tests/test_price_parser.py::test_parse",
+]
+DURATIONS = {COLLECTION[0]: 5.0, COLLECTION[1]: 3.0, COLLECTION[2]: 10.0, COLLECTION[3]: 1.0}
+
+
+def test_browser_of_test_reads_the_parametrization():
+    """The browser comes from the test id, e.g. as pytest-playwright's --browser parametrizes it"""
+
+    assert browser_of_test("tests/test_ebay.py::test_cart[webkit-3]") == "webkit"
+    assert browser_of_test("tests/test_ebay.py::test_homepage") is None
+
+
+def test_workers_are_split_by_predicted_browser_time():
+    """Every browser gets a worker; spare workers go where the most time per worker is predicted"""
+
+    pins = assign_browsers({"chromium": 30.0, "firefox": 10.0}, ["gw0", "gw1", "gw2", "gw3"])
+
+    assert sorted(pins.values(), key=sorted) == [{"chromium"}] * 3 + [{"firefox"}]
+    assert predict_makespan([(10.0, "chromium"), (10.0, "chromium"), (10.0, "firefox"), (2.0, None)],
+                            pins)[0] == 10.0
+
+
+def test_scheduler_sends_longest_tests_to_their_browser_workers():
+    """Chromium tests go to the chromium worker longest first; a worker stops once nothing it may run is left"""
+
+    scheduler = DurationScheduling(_Config(2), durations=DURATIONS)
+    nodes = [_Node("gw0"), _Node("gw1")]
+
+    for node in nodes:
+        scheduler.add_node(node)
+        scheduler.add_node_collection(node, COLLECTION)
+
+    scheduler.schedule()
+
+    assert nodes[0].sent == [2, 0]
+    assert nodes[1].sent == [1, 3]
+    assert scheduler.predicted_makespan == 15.0
+
+    for node in nodes:
+        for index in list(node.sent):
+            scheduler.mark_test_complete(node, index)
+
+    assert all(node.shutting_down for node in nodes)
+    assert scheduler.tests_finished
+    assert scheduler.actual_makespan is not None
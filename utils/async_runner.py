@@ -0,0 +1,67 @@
+"""
+Async Runner
+Event loop on a dedicated thread for the async Playwright API. pytest-playwright's sync driver keeps
+an event loop running on the main thread once a sync test started it, so async fixtures and tests
+run their coroutines here instead, and both kinds of tests can share one pytest session.
+"""
+
+import asyncio
+import logging
+import threading
+from typing import Any, Coroutine, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class AsyncRunner:
+    """Runs coroutines to completion on an event loop owned by a background thread"""
+
+    def __init__(self, name: str = "async-playwright"):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run_loop, name=name, daemon=True)
+        self._thread.start()
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self.loop)
+
+        try:
+            self.loop.run_forever()
+        finally:
+            # Async generators and the default executor belong to this thread's loop
+            self.loop.run_until_complete(self.loop.shutdown_asyncgens())
+            self.loop.run_until_complete(self.loop.shutdown_default_executor())
+            self.loop.close()
+
+    @property
+    def closed(self) -> bool:
+        return not self._thread.is_alive()
+
+    def run(self, coro: Coroutine[Any, Any, T], timeout: Optional[float] = None) -> T:
+        """
+        Run a coroutine on the loop thread and wait for its result
+
+        Args:
+            coro: Coroutine to run
+            timeout: Seconds to wait before raising TimeoutError (default: no limit)
+
+        Returns:
+            The coroutine's result; its exception is raised in the calling thread
+        """
+
+        if self.closed:
+            coro.close()
+            raise RuntimeError("AsyncRunner is closed")
+
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(timeout)
+
+    def close(self):
+        """Stop the loop and wait for its thread to finish"""
+
+        if self.closed:
+            return
+
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        logger.debug("Async runner loop closed")
@@ -0,0 +1,163 @@
+"""
+Benchmark
+Timing loop, mean/p95 statistics and baseline comparison for the page-object micro-benchmarks
+"""
+
+import json
+import logging
+import math
+import os
+import statistics
+import time
+import warnings
+from typing import Callable, Dict, List, Optional
+
+from config.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+
+class MissingBaselineWarning(UserWarning):
+    """A benchmark ran without a baseline entry, so it could not be checked for a regression"""
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile (pct in 0-100) of a non-empty list"""
+
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+
+    return ordered[rank - 1]
+
+
+class BenchmarkResult:
+    """Samples of one benchmark and their statistics, in milliseconds"""
+
+    def __init__(self, name: str, samples_s: List[float]):
+        if not samples_s:
+            raise ValueError(f"Benchmark {name} has no samples")
+
+        self.name = name
+        self.samples_ms = [sample * 1000 for sample in samples_s]
+
+    @property
+    def iterations(self) -> int:
+        return len(self.samples_ms)
+
+    @property
+    def mean_ms(self) -> float:
+        return statistics.fmean(self.samples_ms)
+
+    @property
+    def p95_ms(self) -> float:
+        return percentile(self.samples_ms, 95)
+
+    @property
+    def min_ms(self) -> float:
+        return min(self.samples_ms)
+
+    def to_dict(self) -> Dict:
+        return {
+            "iterations": self.iterations,
+            "mean_ms": round(self.mean_ms, 3),
+            "p95_ms": round(self.p95_ms, 3),
+            "min_ms": round(self.min_ms, 3),
+        }
+
+    def __str__(self) -> str:
+        return (f"{self.name}: mean {self.mean_ms:.2f} ms, p95 {self.p95_ms:.2f} ms, "
+                f"min {self.min_ms:.2f} ms over {self.iterations} iterations")
+
+
+def run_benchmark(name: str,
+                  func: Callable[[], object],
+                  iterations: Optional[int] = None,
+                  warmup: Optional[int] = None) -> BenchmarkResult:
+    """
+    Time a callable
+
+    Args:
+        name: Benchmark name (key in the baseline)
+        func: Operation to time; called warmup + iterations times
+        iterations: Timed calls (default from settings)
+        warmup: Untimed calls first, to settle caches and JIT (default from settings)
+    """
+
+    iterations = Settings.BENCHMARK_ITERATIONS if iterations is None else iterations
+    warmup = Settings.BENCHMARK_WARMUP if warmup is None else warmup
+
+    for _ in range(warmup):
+        func()
+
+    samples = []
+
+    for _ in range(iterations):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+
+    result = BenchmarkResult(name, samples)
+    logger.info(str(result))
+
+    return result
+
+
+class BenchmarkBaseline:
+    """Stored mean/p95 per benchmark, compared against new results with a relative threshold"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+        try:
+            with open(path, "r") as f:
+                self.entries: Dict[str, Dict] = json.load(f)
+        except FileNotFoundError:
+            self.entries = {}
+
+        # Benchmarks compared without an entry, i.e. not checked for regressions
+        self.missing: List[str] = []
+
+    def compare(self,
+                result: BenchmarkResult,
+                threshold: Optional[float] = None,
+                strict: Optional[bool] = None) -> Optional[str]:
+        """
+        Regression message if the result's mean is more than threshold (e.g. 0.25 = 25%) slower
+        than the baseline; None when it is within the threshold. A result without a baseline entry
+        is a failure message too when strict (default from settings); otherwise it returns None and
+        raises a MissingBaselineWarning so the gap shows up in the run's summary.
+        """
+
+        threshold = Settings.BENCHMARK_REGRESSION_THRESHOLD if threshold is None else threshold
+        strict = Settings.BENCHMARK_STRICT if strict is None else strict
+        baseline = self.entries.get(result.name)
+
+        if not baseline:
+            self.missing.append(result.name)
+            message = (f"No baseline for benchmark {result.name} in {self.path}, so it was not checked for "
+                       f"regressions; record one with --benchmark-save-baseline")
+
+            if strict:
+                return message
+
+            logger.warning(message)
+            warnings.warn(message, MissingBaselineWarning)
+            return None
+
+        limit_ms = baseline["mean_ms"] * (1 + threshold)
+
+        if result.mean_ms > limit_ms:
+            return (f"{result.name} regressed: mean {result.mean_ms:.2f} ms vs baseline {baseline['mean_ms']:.2f} ms "
+                    f"(limit {limit_ms:.2f} ms at +{threshold:.0%})")
+
+        return None
+
+    def update(self, result: BenchmarkResult):
+        self.entries[result.name] = result.to_dict()
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+
+        with open(self.path, "w") as f:
+            json.dump(dict(sorted(self.entries.items())), f, indent=2)
+            f.write("\n")
@@ -1,6 +1,9 @@
 import logging
+from typing import Optional
 from playwright.sync_api import Browser, BrowserContext, Page, sync_playwright
+from config.browser_config import get_browser_profile
 from config.settings import Settings
+from utils.network_blocking import NetworkBlocker, resolve_blocking_profile
 
 logger = logging.getLogger(__name__)
 
@@ -9,35 +12,41 @@ class BrowserFactory:
     """Factory class for creating Playwright browser instances"""
     
     @staticmethod
-    def create_browser(playwright) -> Browser:
-        """Create and return a Browser instance"""
+    def create_browser(playwright, launch_profile: Optional[str] = None) -> Browser:
+        """Create and return a Browser instance, launched with the browser's profile (see config.browser_config)"""
         browser_name = Settings.BROWSER
         
-        launch_options = {
-            "headless": Settings.HEADLESS,
-            "slow_mo": Settings.SLOW_MO,
-        }
+        # Raises ValueError for an unsupported browser or unknown launch profile
+        profile = get_browser_profile(browser_name, launch_profile)
         
         if browser_name == "chromium":
-            browser = playwright.chromium.launch(**launch_options)
+            browser = playwright.chromium.launch(**profile.launch_options)
         elif browser_name == "firefox":
-            browser = playwright.firefox.launch(**launch_options)
-        elif browser_name == "webkit":
-            browser = playwright.webkit.launch(**launch_options)
+            browser = playwright.firefox.launch(**profile.launch_options)
         else:
-            raise ValueError(f"Unsupported browser: {browser_name}. Use 'chromium', 'firefox', or 'webkit'")
+            browser = playwright.webkit.launch(**profile.launch_options)
         
         return browser
     
     @staticmethod
-    def create_context(browser: Browser) -> BrowserContext:
-        """Create and return a BrowserContext instance"""
-        context = browser.new_context(
-            viewport={"width": 1920, "height": 1080},
-            ignore_https_errors=True,
-        )
+    def create_context(browser: Browser,
+                       blocking_profile: Optional[str] = None,
+                       storage_state: Optional[str] = None) -> BrowserContext:
+        """
+        Create and return a BrowserContext instance with the context options of the browser's
+        profile and the network blocking profile applied, optionally seeded from a storage state
+        snapshot (see utils.storage_state)
+        """
+        profile = get_browser_profile(browser.browser_type.name)
+        context = browser.new_context(**{
+            "viewport": {"width": 1920, "height": 1080},
+            "ignore_https_errors": True,
+            **profile.context_options,
+            "storage_state": storage_state,
+        })
         context.set_default_navigation_timeout(Settings.NAVIGATION_TIMEOUT)
         context.set_default_timeout(Settings.ACTION_TIMEOUT)
+        NetworkBlocker(blocking_profile or resolve_blocking_profile(browser.browser_type.name)).attach(context)
         return context
     
     @staticmethod
@@ -0,0 +1,474 @@
+"""
+Browser Server
+Opt-in local daemon keeping warm Chromium/Firefox/WebKit servers (Playwright launchServer) running
+between pytest invocations, so the browser fixtures connect in milliseconds instead of launching
+
+Usage:
+    python -m utils.browser_server start [--browsers chromium firefox] [--idle-timeout 1800]
+    python -m utils.browser_server status
+    python -m utils.browser_server stop
+
+Every connection gets its own Browser: contexts one pytest session creates are invisible to the
+others and are closed by the server when that session disconnects.
+"""
+
+import argparse
+import importlib.metadata
+import json
+import logging
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from filelock import FileLock, Timeout
+
+from config.browser_config import BROWSERS, get_browser_profile
+from config.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+STATE_NAME = "state.json"
+LEASES_DIR_NAME = "leases"
+HEALTH_CHECK_INTERVAL = 5  # seconds between daemon health/idle checks
+START_TIMEOUT = 60  # seconds to wait for a new daemon's browsers
+LOCK_TIMEOUT = START_TIMEOUT + 10  # seconds a session waits for another one starting the daemon
+
+# Launches one browser server, prints its endpoint, and closes it on SIGTERM/SIGINT or when the
+# daemon that owns it goes away (stdin closes)
+SERVER_JS = r"""
+const playwright = require(process.env.PLAYWRIGHT_CORE_PATH);
+const [browserName, optionsJson] = process.argv.slice(1);
+
+(async () => {
+    const server = await playwright[browserName].launchServer(JSON.parse(optionsJson));
+    let closing = false;
+    const close = async () => {
+        if (closing) return;
+        closing = true;
+        await server.close().catch(() => {});
+        process.exit(0);
+    };
+
+    process.on("SIGTERM", close);
+    process.on("SIGINT", close);
+    process.stdin.on("end", close);
+    process.stdin.resume();
+    console.log(JSON.stringify({wsEndpoint: server.wsEndpoint(), pid: server.process().pid}));
+})().catch((error) => {
+    console.error((error && error.stack) || error);
+    process.exit(1);
+});
+"""
+
+
+def server_launch_options(launch_options: Dict) -> Dict:
+    """
+    launchServer options (camelCase) for a BrowserProfile's launch options. slow_mo is left out:
+    it is a per-connection option, applied by connect()
+    """
+
+    options = {}
+
+    for key, value in launch_options.items():
+        if key == "slow_mo":
+            continue
+
+        head, *rest = key.split("_")
+        options[head + "".join(part.capitalize() for part in rest)] = value
+
+    return options
+
+
+def driver_command() -> Tuple[str, str, Dict]:
+    """
+    Node executable, CLI path and environment of the driver bundled with the playwright package.
+    Playwright has no public API for them, so this reads its private _driver module and fails with a
+    clear message when an installed version moved or changed it
+
+    Raises:
+        RuntimeError: The installed playwright package has no usable driver module
+    """
+
+    try:
+        from playwright._impl._driver import compute_driver_executable, get_driver_env
+
+        node_path, cli_path = compute_driver_executable()
+    except (ImportError, TypeError, ValueError) as e:
+        raise RuntimeError(f"The browser server needs playwright>=1.44 (installed: {_playwright_version()}); "
+                           f"its private driver module changed: {e}") from e
+
+    return str(node_path), str(cli_path), get_driver_env()
+
+
+def _playwright_version() -> str:
+    try:
+        return importlib.metadata.version("playwright")
+    except importlib.metadata.PackageNotFoundError:
+        return "none"
+
+
+def _is_alive(pid: Optional[int]) -> bool:
+    if not pid:
+        return False
+
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+
+    return True
+
+
+def _port_open(ws_endpoint: str, timeout: float = 1.0) -> bool:
+    url = urlparse(ws_endpoint)
+
+    try:
+        with socket.create_connection((url.hostname, url.port), timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+
+class BrowserServerDaemon:
+    """
+    The background process: one node launchServer child per browser, restarted when it stops
+    answering, and everything shut down after idle_timeout seconds without a connected session
+    """
+
+    def __init__(self, browsers: List[str], server_dir: Optional[str] = None, idle_timeout: Optional[int] = None):
+        self.browsers = browsers
+        self.server_dir = Path(server_dir or Settings.BROWSER_SERVER_DIR)
+        self.idle_timeout = Settings.BROWSER_SERVER_IDLE_TIMEOUT if idle_timeout is None else idle_timeout
+        self.servers: Dict[str, Dict] = {}
+        self._stopping = False
+
+    def _start_server(self, browser_name: str) -> Optional[Dict]:
+        node_path, cli_path, driver_env = driver_command()
+        options = server_launch_options(get_browser_profile(browser_name).launch_options)
+        env = {**driver_env, "PLAYWRIGHT_CORE_PATH": str(Path(cli_path).parent)}
+
+        process = subprocess.Popen([node_path, "-e", SERVER_JS, browser_name, json.dumps(options)],
+                                   stdin=subprocess.PIPE, stdout=subprocess.PIPE, env=env, text=True)
+        line = process.stdout.readline()
+
+        try:
+            ready = json.loads(line)
+        except json.JSONDecodeError:
+            process.wait()
+            logger.error(f"Could not start the {browser_name} server (exit code {process.returncode})")
+            return None
+
+        logger.info(f"{browser_name} server listening on {ready['wsEndpoint']}")
+
+        return {"process": process, "ws_endpoint": ready["wsEndpoint"], "browser_pid": ready["pid"],
+                "launch_options": options, "started_at": time.time()}
+
+    def _stop_server(self, server: Dict):
+        process = server["process"]
+
+        if process.poll() is None:
+            process.terminate()
+
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+    def _is_healthy(self, server: Dict) -> bool:
+        return server["process"].poll() is None and _port_open(server["ws_endpoint"])
+
+    def _write_state(self):
+        state = {
+            "pid": os.getpid(),
+            "idle_timeout": self.idle_timeout,
+            "browsers": {name: {key: value for key, value in server.items() if key != "process"}
+                         for name, server in self.servers.items()},
+        }
+        tmp_path = self.server_dir / f"{STATE_NAME}.tmp"
+
+        with open(tmp_path, "w") as f:
+            json.dump(state, f, indent=2)
+
+        os.replace(tmp_path, self.server_dir / STATE_NAME)
+
+    def _has_sessions(self) -> bool:
+        """Whether any live pytest process holds a connection; leases of dead processes are dropped"""
+
+        active = False
+
+        for lease in (self.server_dir / LEASES_DIR_NAME).glob("*"):
+            if _is_alive(int(lease.name.split("-")[0])):
+                active = True
+            else:
+                lease.unlink(missing_ok=True)
+
+        return active
+
+    def _handle_signal(self, signum, frame):
+        self._stopping = True
+
+    def run(self):
+        """Start the servers and supervise them until stopped or idle"""
+
+        (self.server_dir / LEASES_DIR_NAME).mkdir(parents=True, exist_ok=True)
+        signal.signal(signal.SIGTERM, self._handle_signal)
+        signal.signal(signal.SIGINT, self._handle_signal)
+
+        try:
+            for browser_name in self.browsers:
+                if server := self._start_server(browser_name):
+                    self.servers[browser_name] = server
+
+            self._write_state()
+            last_active = time.monotonic()
+
+            while not self._stopping:
+                time.sleep(HEALTH_CHECK_INTERVAL)  # sleep-ok: daemon poll interval
+
+                for browser_name, server in list(self.servers.items()):
+                    if self._is_healthy(server):
+                        continue
+
+                    logger.warning(f"{browser_name} server stopped answering, restarting it")
+                    self._stop_server(server)
+                    restarted = self._start_server(browser_name)
+
+                    if restarted:
+                        self.servers[browser_name] = restarted
+                    else:
+                        del self.servers[browser_name]
+
+                    self._write_state()
+
+                if self._has_sessions():
+                    last_active = time.monotonic()
+                elif time.monotonic() - last_active > self.idle_timeout:
+                    logger.info(f"No session for {self.idle_timeout}s, shutting down")
+                    break
+        finally:
+            (self.server_dir / STATE_NAME).unlink(missing_ok=True)
+
+            for server in self.servers.values():
+                self._stop_server(server)
+
+
+class BrowserServerClient:
+    """Finds (or starts) the daemon and connects the pytest fixtures to its warm browsers"""
+
+    def __init__(self, server_dir: Optional[str] = None):
+        self.server_dir = Path(server_dir or Settings.BROWSER_SERVER_DIR)
+
+    @property
+    def state_path(self) -> Path:
+        return self.server_dir / STATE_NAME
+
+    def read_state(self) -> Optional[Dict]:
+        """State of the running daemon, or None when there is none"""
+
+        try:
+            with open(self.state_path, "r") as f:
+                state = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+        return state if _is_alive(state.get("pid")) else None
+
+    def start(self, browsers: Optional[List[str]] = None, idle_timeout: Optional[int] = None) -> Optional[Dict]:
+        """
+        Start the daemon in the background unless one is running, and wait for its browsers
+
+        Returns:
+            dict: Daemon state, or None if it did not come up within START_TIMEOUT, the installed
+            Playwright cannot run it, or another session held the start lock for LOCK_TIMEOUT
+        """
+
+        self.server_dir.mkdir(parents=True, exist_ok=True)
+
+        # Parallel sessions (e.g. xdist workers) must not start a daemon each
+        try:
+            with FileLock(str(self.server_dir / "daemon.lock"), timeout=LOCK_TIMEOUT):
+                return self._start_locked(browsers, idle_timeout)
+        except Timeout:
+            logger.warning(f"Another session is still starting the browser server after {LOCK_TIMEOUT}s, "
+                           f"launching locally")
+            return None
+
+    def _start_locked(self, browsers: Optional[List[str]], idle_timeout: Optional[int]) -> Optional[Dict]:
+        state = self.read_state()
+
+        if state:
+            return state
+
+        # Fail here, in the session, rather than only in the daemon's log
+        try:
+            driver_command()
+        except RuntimeError as e:
+            logger.warning(f"Browser server unavailable, launching locally: {e}")
+            return None
+
+        browsers = browsers or Settings.BROWSER_SERVER_BROWSERS
+        command = [sys.executable, "-m", "utils.browser_server", "serve", "--browsers", *browsers]
+
+        if idle_timeout is not None:
+            command += ["--idle-timeout", str(idle_timeout)]
+
+        with open(self.server_dir / "daemon.log", "a") as log_file:
+            daemon = subprocess.Popen(command, stdout=log_file, stderr=subprocess.STDOUT, stdin=subprocess.DEVNULL,
+                                      cwd=Path(__file__).resolve().parent.parent, start_new_session=True)
+
+        deadline = time.monotonic() + START_TIMEOUT
+
+        while time.monotonic() < deadline and daemon.poll() is None:
+            if state := self.read_state():
+                logger.info(f"Browser server started with {', '.join(state['browsers']) or 'no browsers'}")
+                return state
+
+            time.sleep(0.2)  # sleep-ok: polling for the daemon's state file
+
+        logger.warning(f"Browser server did not come up, see {self.server_dir}/daemon.log")
+        return None
+
+    def stop(self, timeout: float = 30) -> bool:
+        """Stop the running daemon; True once it is gone (or there was none)"""
+
+        state = self.read_state()
+
+        if not state:
+            return True
+
+        os.kill(state["pid"], signal.SIGTERM)
+        deadline = time.monotonic() + timeout
+
+        while time.monotonic() < deadline:
+            if not _is_alive(state["pid"]):
+                return True
+
+            time.sleep(0.2)  # sleep-ok: waiting for the daemon to exit
+
+        return False
+
+    def endpoint(self, browser_name: str, state: Optional[Dict] = None) -> Optional[str]:
+        """
+        WebSocket endpoint of a warm browser launched with the same options this session would use,
+        or None (no daemon, browser not served, or options changed since the daemon started)
+        """
+
+        state = state or self.read_state()
+        server = (state or {}).get("browsers", {}).get(browser_name)
+
+        if not server:
+            return None
+
+        options = server_launch_options(get_browser_profile(browser_name).launch_options)
+
+        if server["launch_options"] != options:
+            logger.warning(f"Browser server runs {browser_name} with other launch options; launching locally "
+                           f"('python -m utils.browser_server stop' to restart it with the current ones)")
+            return None
+
+        return server["ws_endpoint"]
+
+    def _lease(self, browser) -> None:
+        """Mark this process as connected until the browser disconnects, so the daemon doesn't go idle"""
+
+        lease = self.server_dir / LEASES_DIR_NAME / f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        lease.parent.mkdir(parents=True, exist_ok=True)
+        lease.touch()
+        browser.on("disconnected", lambda _: lease.unlink(missing_ok=True))
+
+    def connect(self, playwright, browser_name: str, start: bool = False, timeout: int = 10000):
+        """
+        Connect to the warm browser, starting the daemon first if start is set
+
+        Returns:
+            Browser, or None to fall back to launching one
+        """
+
+        state = self.start() if start else self.read_state()
+        ws_endpoint = self.endpoint(browser_name, state) if state else None
+
+        if not ws_endpoint:
+            return None
+
+        slow_mo = get_browser_profile(browser_name).launch_options.get("slow_mo", 0)
+
+        try:
+            browser = getattr(playwright, browser_name).connect(ws_endpoint, timeout=timeout, slow_mo=slow_mo)
+        except Exception as e:
+            logger.warning(f"Could not connect to the {browser_name} browser server, launching locally: {e}")
+            return None
+
+        self._lease(browser)
+        logger.info(f"Connected to the warm {browser_name} browser server at {ws_endpoint}")
+
+        return browser
+
+    async def connect_async(self, playwright, browser_name: str, start: bool = False, timeout: int = 10000):
+        """Async connect; the daemon is found or started synchronously, it only takes a file read"""
+
+        state = self.start() if start else self.read_state()
+        ws_endpoint = self.endpoint(browser_name, state) if state else None
+
+        if not ws_endpoint:
+            return None
+
+        slow_mo = get_browser_profile(browser_name).launch_options.get("slow_mo", 0)
+
+        try:
+            browser = await getattr(playwright, browser_name).connect(ws_endpoint, timeout=timeout, slow_mo=slow_mo)
+        except Exception as e:
+            logger.warning(f"Could not connect to the {browser_name} browser server, launching locally: {e}")
+            return None
+
+        self._lease(browser)
+        logger.info(f"Connected to the warm {browser_name} browser server at {ws_endpoint}")
+
+        return browser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Warm browser servers shared by pytest sessions")
+    parser.add_argument("command", choices=["start", "stop", "status", "serve"])
+    parser.add_argument("--browsers", nargs="+", choices=BROWSERS, default=None,
+                        help="Browsers to keep warm (default: BROWSER_SERVER_BROWSERS)")
+    parser.add_argument("--idle-timeout", type=int, default=None,
+                        help="Seconds without a connected session before the daemon exits "
+                             "(default: BROWSER_SERVER_IDLE_TIMEOUT)")
+    args = parser.parse_args(argv)
+    client = BrowserServerClient()
+
+    if args.command == "serve":
+        logging.basicConfig(level=logging.INFO, format="[%(asctime)s][%(name)s][%(levelname)s] %(message)s")
+        BrowserServerDaemon(args.browsers or Settings.BROWSER_SERVER_BROWSERS, idle_timeout=args.idle_timeout).run()
+        return 0
+
+    if args.command == "start":
+        state = client.start(args.browsers, args.idle_timeout)
+    elif args.command == "stop":
+        return 0 if client.stop() else 1
+    else:
+        state = client.read_state()
+
+    if not state:
+        print("Browser server is not running")
+        return 1
+
+    print(f"Browser server running (pid {state['pid']}, idle timeout {state['idle_timeout']}s)")
+
+    for browser_name, server in state["browsers"].items():
+        print(f"  {browser_name}: {server['ws_endpoint']}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
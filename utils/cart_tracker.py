@@ -0,0 +1,290 @@
+"""
+Cart Tracker
+Keeps the cart item count and totals of a browser context up to date from the add-to-cart and cart
+responses the context receives, so tests can check the cart without loading the cart page again
+"""
+
+import logging
+import re
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Any, Iterable, Optional, Tuple
+
+from utils.price_parser import parse_price
+
+logger = logging.getLogger(__name__)
+
+# Responses worth reading: the cart service and the add-to-cart endpoints of the item page
+CART_RESPONSE_PATTERN = re.compile(r"cart\.(payments\.)?ebay\.com|/atc\b|addtocart|/cart\b", re.IGNORECASE)
+ADD_TO_CART_URL_PATTERN = re.compile(r"/atc\b|addtocart|add[-_]to[-_]cart|/cart/add", re.IGNORECASE)
+
+# Only the cart service answers with the cart summary the state is read from
+CART_SUMMARY_URL_PATTERN = re.compile(r"^https://cart\.(payments\.)?ebay\.com/", re.IGNORECASE)
+CART_SUMMARY_KEYS = ("cartSummary",)
+
+# Keys of the cart summary object for the item count and the amounts, most specific first
+COUNT_KEYS = ("cartCount", "cartItemCount", "cartSize", "totalQuantity")
+TOTAL_KEYS = ("grandTotal", "orderTotal", "cartTotal", "totalPrice")
+SUBTOTAL_KEYS = ("itemSubtotal", "itemsSubtotal", "subtotal", "subTotal")
+
+# Keys an amount object keeps its number or display text under
+AMOUNT_VALUE_KEYS = ("value", "amount", "convertedFromValue")
+AMOUNT_TEXT_KEYS = ("text", "displayValue", "formattedValue")
+
+
+@dataclass
+class CartState:
+    """Cart as last reported by the cart service's summaries; None where no summary has said"""
+
+    item_count: Optional[int] = None
+    total: Optional[float] = None
+    subtotal: Optional[float] = None
+    currency: Optional[str] = None
+    items_added: int = 0  # successful add-to-cart responses since the tracker was attached
+    responses: int = 0  # cart responses read
+    summaries: int = 0  # recognized cart-summary responses among them
+    updated_at: Optional[float] = None
+
+    @property
+    def confirmed(self) -> bool:
+        """True once a recognized cart summary was read; until then the cart page is the only source"""
+
+        return self.summaries > 0
+
+    @property
+    def amount(self) -> Optional[float]:
+        """The total, or the subtotal when no response carried a total"""
+
+        return self.total if self.total is not None else self.subtotal
+
+
+def _find_value(data: Any, keys: Iterable[str]) -> Any:
+    """Value of the shallowest key from keys (case-insensitive) anywhere in a JSON document, or None"""
+
+    wanted = {key.lower(): rank for rank, key in enumerate(keys)}
+    level = [data]
+
+    while level:
+        found = []
+        next_level = []
+
+        for node in level:
+            items = node.items() if isinstance(node, dict) else enumerate(node) if isinstance(node, list) else ()
+
+            for key, value in items:
+                if isinstance(key, str) and key.lower() in wanted and value is not None:
+                    found.append((wanted[key.lower()], value))
+                elif isinstance(value, (dict, list)):
+                    next_level.append(value)
+
+        if found:
+            return min(found, key=lambda rank_value: rank_value[0])[1]
+
+        level = next_level
+
+    return None
+
+
+def _get_key(data: dict, keys: Iterable[str]) -> Any:
+    """Value of the first key from keys (case-insensitive) among the own keys of an object, or None"""
+
+    values = {key.lower(): value for key, value in data.items() if isinstance(key, str) and value is not None}
+
+    return next((values[key.lower()] for key in keys if key.lower() in values), None)
+
+
+def _cart_summary(url: str, data: Any) -> Optional[dict]:
+    """
+    The cart summary object of a cart service response: a 'cartSummary' object with a cart count or
+    amount of its own. None for other endpoints and bodies, whatever totals or counts they carry.
+    """
+
+    if data is None or not CART_SUMMARY_URL_PATTERN.search(url):
+        return None
+
+    summary = _find_value(data, CART_SUMMARY_KEYS)
+
+    if not isinstance(summary, dict):
+        return None
+
+    if all(_get_key(summary, keys) is None for keys in (COUNT_KEYS, TOTAL_KEYS, SUBTOTAL_KEYS)):
+        return None
+
+    return summary
+
+
+def _amount(value: Any) -> Tuple[Optional[float], Optional[str]]:
+    """(amount, currency) of a number, a price string or an amount object ({'value': .., 'currency': ..})"""
+
+    if isinstance(value, bool):
+        return None, None
+
+    if isinstance(value, (int, float)):
+        return float(value), None
+
+    if isinstance(value, str):
+        parsed = parse_price(value)
+
+        return (parsed.high, parsed.currency) if parsed else (None, None)
+
+    if isinstance(value, dict):
+        currency = value.get("currency") or value.get("currencyCode")
+
+        for key in AMOUNT_VALUE_KEYS + AMOUNT_TEXT_KEYS:
+            if key in value:
+                amount, text_currency = _amount(value[key])
+
+                if amount is not None:
+                    return amount, currency or text_currency
+
+        # Display-only amounts are split into text spans, e.g. {'textSpans': [{'text': 'US $245.97'}]}
+        spans = value.get("textSpans")
+
+        if isinstance(spans, list):
+            return _amount("".join(span.get("text", "") for span in spans if isinstance(span, dict)))
+
+    return None, None
+
+
+def _count(value: Any) -> Optional[int]:
+    if isinstance(value, bool):
+        return None
+
+    if isinstance(value, (int, float)):
+        return int(value)
+
+    if isinstance(value, str) and (match := re.search(r"\d+", value)):
+        return int(match.group())
+
+    return None
+
+
+class CartTracker:
+    """Listens to the responses of a browser context and maintains its CartState"""
+
+    # One tracker per context, so page objects can look it up from their page
+    _trackers: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+    def __init__(self, response_pattern: re.Pattern = CART_RESPONSE_PATTERN):
+        self.response_pattern = response_pattern
+        self.state = CartState()
+
+    @classmethod
+    def for_context(cls, context) -> Optional["CartTracker"]:
+        """Tracker attached to a context, if any"""
+
+        return cls._trackers.get(context)
+
+    def update(self, url: str, status: int, data: Any, method: str = "GET") -> bool:
+        """
+        Fold one cart response into the state
+
+        Args:
+            url: Response URL
+            status: HTTP status
+            data: Parsed JSON body, or None when the body isn't JSON
+            method: Method of the request
+
+        Returns:
+            bool: True if the response changed the state
+        """
+
+        if status >= 400:
+            return False
+
+        state = self.state
+        changed = False
+        summary = _cart_summary(url, data)
+        count = _count(_get_key(summary, COUNT_KEYS)) if summary is not None else None
+
+        if method == "POST" and ADD_TO_CART_URL_PATTERN.search(url):
+            state.items_added += 1
+            changed = True
+
+            # No summary in the response: the cart grew by one item if a summary told us its size
+            if count is None and state.item_count is not None:
+                state.item_count += 1
+
+        if summary is not None:
+            state.summaries += 1
+            changed = True
+
+            if count is not None:
+                state.item_count = count
+
+            for name, keys in (("total", TOTAL_KEYS), ("subtotal", SUBTOTAL_KEYS)):
+                amount, currency = _amount(_get_key(summary, keys))
+
+                if amount is not None:
+                    setattr(state, name, amount)
+                    state.currency = currency or state.currency
+
+        if changed:
+            state.responses += 1
+            state.updated_at = time.time()
+            logger.debug(f"Cart response {url}: {self.summary()}")
+
+        return changed
+
+    def _matches(self, response) -> bool:
+        return bool(self.response_pattern.search(response.url))
+
+    @staticmethod
+    def _is_json(response) -> bool:
+        return "json" in (response.headers.get("content-type") or "")
+
+    def _on_response(self, response):
+        if not self._matches(response):
+            return
+
+        data = None
+
+        if self._is_json(response):
+            try:
+                data = response.json()
+            except Exception as e:
+                # The body is gone once the page navigated away; the response still counts as an add-to-cart
+                logger.debug(f"Could not read cart response {response.url}: {e}")
+
+        self.update(response.url, response.status, data, response.request.method)
+
+    async def _on_response_async(self, response):
+        if not self._matches(response):
+            return
+
+        data = None
+
+        if self._is_json(response):
+            try:
+                data = await response.json()
+            except Exception as e:
+                logger.debug(f"Could not read cart response {response.url}: {e}")
+
+        self.update(response.url, response.status, data, response.request.method)
+
+    def attach(self, context) -> "CartTracker":
+        """Start listening to the responses of a sync BrowserContext (all of its pages and tabs)"""
+
+        context.on("response", self._on_response)
+        self._trackers[context] = self
+
+        return self
+
+    def attach_async(self, context) -> "CartTracker":
+        """Start listening to the responses of an async BrowserContext"""
+
+        context.on("response", self._on_response_async)
+        self._trackers[context] = self
+
+        return self
+
+    def summary(self) -> str:
+        """One-line summary for logs and reports"""
+
+        state = self.state
+        amount = f"${state.amount:.2f}" if state.amount is not None else "unknown"
+        count = state.item_count if state.item_count is not None else "unknown"
+
+        return (f"Cart tracker: {count} items, total {amount} "
+                f"({state.items_added} added, {state.responses} cart responses, {state.summaries} summaries)")
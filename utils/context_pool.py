@@ -0,0 +1,273 @@
+"""
+Context Pool
+Keeps browser contexts alive between tests and resets them instead of creating new ones
+"""
+
+import json
+import logging
+import time
+from typing import Callable, Dict, List, Optional, Set
+from urllib.parse import urlsplit
+
+from playwright.sync_api import Browser, BrowserContext, Page, Error as PlaywrightError
+
+from config.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+# Page served (without network) on every origin that is cleared, so its storage can be reached
+RESET_PATH = "__context_pool_reset__"
+RESET_PAGE = "<!doctype html><title>Context pool reset</title>"
+
+# Clears the origin's web storage, IndexedDB and service workers, then restores the snapshot's localStorage
+CLEAR_ORIGIN_JS = """async (localStorageItems) => {
+    localStorage.clear();
+    sessionStorage.clear();
+
+    if (indexedDB.databases) {
+        for (const database of await indexedDB.databases()) {
+            await new Promise(resolve => {
+                const request = indexedDB.deleteDatabase(database.name);
+                request.onsuccess = request.onerror = request.onblocked = resolve;
+            });
+        }
+    }
+
+    if (navigator.serviceWorker) {
+        for (const registration of await navigator.serviceWorker.getRegistrations()) {
+            await registration.unregister();
+        }
+    }
+
+    for (const {name, value} of localStorageItems) {
+        localStorage.setItem(name, value);
+    }
+}"""
+
+
+def _origin(url: str) -> Optional[str]:
+    """'https://www.ebay.com' for any http(s) URL on that origin, None for about:blank, data: etc."""
+
+    parts = urlsplit(url)
+
+    return f"{parts.scheme}://{parts.netloc}" if parts.scheme in ("http", "https") and parts.netloc else None
+
+
+class ContextPool:
+    """
+    Pool of pre-created BrowserContexts.
+
+    acquire() hands out an idle context (a hit) or creates one (a miss); release() resets it
+    (extra pages closed, cookies/permissions cleared, web storage and IndexedDB cleared on every
+    origin the context used, snapshot cookies and localStorage restored) and puts it back, or closes
+    it once it has been used max_uses times.
+    """
+
+    def __init__(self,
+                 browser: Browser,
+                 context_args: Optional[Dict] = None,
+                 size: Optional[int] = None,
+                 max_uses: Optional[int] = None,
+                 on_create: Optional[Callable[[BrowserContext], None]] = None):
+        """
+        Args:
+            browser: Browser the contexts are created in
+            context_args: browser.new_context() arguments; a 'storage_state' snapshot is also
+                          restored (cookies and localStorage) after every reset
+            size: Number of contexts created up front (default from settings)
+            max_uses: Tests a context serves before it is closed and replaced (default from settings)
+            on_create: Called with every new context, e.g. to attach routes that survive resets
+        """
+
+        self.browser = browser
+        self.context_args = dict(context_args or {})
+        self.size = Settings.CONTEXT_POOL_SIZE if size is None else size
+        self.max_uses = Settings.CONTEXT_POOL_MAX_USES if max_uses is None else max_uses
+        self.on_create = on_create
+
+        self._idle: List[BrowserContext] = []
+        self._in_use: Dict[BrowserContext, int] = {}
+        self._uses: Dict[BrowserContext, int] = {}
+        self._visited: Dict[BrowserContext, Set[str]] = {}
+
+        snapshot = self._load_snapshot(self.context_args.get("storage_state"))
+        self._snapshot_cookies: List[Dict] = snapshot.get("cookies", [])
+        self._snapshot_origins: Dict[str, List[Dict]] = {
+            origin["origin"]: origin.get("localStorage", []) for origin in snapshot.get("origins", [])
+        }
+
+        self.hits = 0
+        self.misses = 0
+        self.resets = 0
+        self.recycled = 0
+        self.reset_time_s = 0.0
+
+    @staticmethod
+    def _load_snapshot(storage_state) -> Dict:
+        if not storage_state:
+            return {}
+
+        if isinstance(storage_state, dict):
+            return storage_state
+
+        try:
+            with open(storage_state, "r") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Could not read storage state snapshot {storage_state}: {e}")
+            return {}
+
+    def _track_origins(self, context: BrowserContext):
+        """Record the origin of every page the context navigates, for the next reset to clear"""
+
+        visited = self._visited.setdefault(context, set())
+
+        def on_navigated(frame):
+            if frame.parent_frame is None and (origin := _origin(frame.url)):
+                visited.add(origin)
+
+        context.on("page", lambda page: page.on("framenavigated", on_navigated))
+
+    def _create_context(self) -> BrowserContext:
+        context = self.browser.new_context(**self.context_args)
+        context.set_default_navigation_timeout(Settings.NAVIGATION_TIMEOUT)
+        context.set_default_timeout(Settings.ACTION_TIMEOUT)
+
+        if self.on_create:
+            self.on_create(context)
+
+        self._track_origins(context)
+        context.new_page()
+        self._uses[context] = 0
+
+        return context
+
+    def prefill(self):
+        """Create contexts until `size` are idle"""
+
+        while len(self._idle) < self.size:
+            self._idle.append(self._create_context())
+
+    def acquire(self) -> BrowserContext:
+        """Take an idle context, or create one if the pool is empty"""
+
+        if self._idle:
+            context = self._idle.pop()
+            self.hits += 1
+        else:
+            context = self._create_context()
+            self.misses += 1
+
+        self._in_use[context] = self._uses[context]
+
+        return context
+
+    def release(self, context: BrowserContext):
+        """Reset a context and return it to the pool (or close it when it has served max_uses tests)"""
+
+        self._in_use.pop(context, None)
+        self._uses[context] = self._uses.get(context, 0) + 1
+
+        if self._uses[context] >= self.max_uses:
+            self.recycled += 1
+            self._discard(context)
+
+            return
+
+        started = time.monotonic()
+
+        try:
+            self.reset(context)
+        except PlaywrightError as e:
+            logger.warning(f"Context reset failed, discarding context: {e}")
+            self._discard(context)
+
+            return
+        finally:
+            self.reset_time_s += time.monotonic() - started
+
+        self.resets += 1
+        self._idle.append(context)
+
+    def reset(self, context: BrowserContext):
+        """Bring a used context back to a clean state, keeping one blank page open"""
+
+        pages = context.pages
+
+        for page in pages[1:]:
+            page.close()
+
+        page = pages[0] if pages else context.new_page()
+
+        # Storage is per origin: clear every origin the context holds storage for or has been on,
+        # and the snapshot's origins, which get their localStorage back
+        visited = self._visited.setdefault(context, set())
+        origins = visited | self._storage_origins(context) | set(self._snapshot_origins)
+        self._clear_origins(page, origins)
+        visited.clear()
+
+        context.clear_cookies()
+        context.clear_permissions()
+
+        if self._snapshot_cookies:
+            context.add_cookies(self._snapshot_cookies)
+
+        page.goto("about:blank")
+
+    @staticmethod
+    def _storage_origins(context: BrowserContext) -> Set[str]:
+        """Origins the context keeps localStorage (and, where Playwright reports it, IndexedDB) for"""
+
+        try:
+            state = context.storage_state(indexed_db=True)
+        except TypeError:
+            # Playwright before 1.51 has no indexed_db option
+            state = context.storage_state()
+
+        return {origin["origin"] for origin in state.get("origins", [])}
+
+    def _clear_origins(self, page: Page, origins: Set[str]):
+        """Open a locally served page on each origin and clear its storage from there"""
+
+        if not origins:
+            return
+
+        reset_url = f"**/{RESET_PATH}"
+        page.route(reset_url, lambda route: route.fulfill(status=200, content_type="text/html", body=RESET_PAGE))
+
+        try:
+            for origin in sorted(origins):
+                page.goto(f"{origin}/{RESET_PATH}", wait_until="domcontentloaded")
+                page.evaluate(CLEAR_ORIGIN_JS, self._snapshot_origins.get(origin, []))
+        finally:
+            page.unroute(reset_url)
+
+    def _discard(self, context: BrowserContext):
+        self._uses.pop(context, None)
+        self._visited.pop(context, None)
+
+        try:
+            context.close()
+        except PlaywrightError as e:
+            logger.debug(f"Error closing pooled context: {e}")
+
+    def close(self):
+        """Close every context of the pool"""
+
+        for context in self._idle + list(self._in_use):
+            self._discard(context)
+
+        self._idle.clear()
+        self._in_use.clear()
+
+    def stats(self) -> Dict:
+        """Hit/miss, reset and recycle counters"""
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "resets": self.resets,
+            "recycled": self.recycled,
+            "reset_time_s": round(self.reset_time_s, 3),
+            "avg_reset_ms": round(self.reset_time_s / self.resets * 1000, 1) if self.resets else 0.0,
+        }
@@ -0,0 +1,292 @@
+"""
+Grid Sessions
+Pre-created, health-checked Selenium Grid sessions shared over one pooled HTTP connection
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+# W3C WebDriver capabilities for Chrome with CDP support
+DEFAULT_CAPABILITIES = {
+    "capabilities": {
+        "alwaysMatch": {
+            "browserName": "chrome"
+        }
+    }
+}
+
+
+class GridSession:
+    """A WebDriver session on the Grid and the CDP endpoint Playwright connects to"""
+
+    def __init__(self, session_id: str, cdp_url: str, created_at: Optional[float] = None, uses: int = 0):
+        self.session_id = session_id
+        self.cdp_url = cdp_url
+        self.created_at = time.time() if created_at is None else created_at
+        self.uses = uses
+
+    def to_dict(self) -> Dict:
+        """Plain dict, e.g. to pass the session to an xdist worker"""
+
+        return {"session_id": self.session_id, "cdp_url": self.cdp_url, "created_at": self.created_at}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "GridSession":
+        return cls(data["session_id"], data["cdp_url"], data.get("created_at"))
+
+
+class GridSessionManager:
+    """
+    Pool of Selenium Grid sessions.
+
+    prefill() creates pool_size sessions in parallel, acquire() hands out a healthy one (creating a new
+    one if needed), release() puts it back or deletes it after max_uses, and close() DELETEs every
+    session this manager created so Grid slots never leak.
+    """
+
+    def __init__(self,
+                 grid_url: str,
+                 pool_size: Optional[int] = None,
+                 max_uses: Optional[int] = None,
+                 capabilities: Optional[Dict] = None,
+                 timeout: Optional[int] = None,
+                 max_retries: int = 3):
+        """
+        Args:
+            grid_url: Base URL of Selenium Grid (e.g., http://localhost:4444)
+            pool_size: Sessions created by prefill() (default from settings)
+            max_uses: Times a session is handed out before it is deleted, 0 for no limit (default from settings)
+            capabilities: New session payload (default: Chrome)
+            timeout: HTTP timeout in seconds for session creation (default from settings)
+            max_retries: Attempts per session creation on timeouts and connection errors
+        """
+
+        self.base_url = grid_url.rstrip("/")
+        self.pool_size = Settings.GRID_SESSION_POOL_SIZE if pool_size is None else pool_size
+        self.max_uses = Settings.GRID_SESSION_MAX_USES if max_uses is None else max_uses
+        self.capabilities = capabilities or DEFAULT_CAPABILITIES
+        self.timeout = Settings.GRID_HTTP_TIMEOUT if timeout is None else timeout
+        self.max_retries = max_retries
+
+        # One keep-alive connection pool for every Grid call, sized for parallel session creation
+        self.http = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(self.pool_size, 4))
+        self.http.mount("http://", adapter)
+        self.http.mount("https://", adapter)
+
+        self._lock = threading.Lock()
+        self._idle: List[GridSession] = []
+        self._owned: Dict[str, GridSession] = {}
+
+        self.created = 0
+        self.deleted = 0
+        self.unhealthy = 0
+
+    def __enter__(self) -> "GridSessionManager":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _cdp_url_for(self, session_id: str, capabilities: Dict) -> str:
+        # Grid 4 advertises the endpoint as the 'se:cdp' capability; older versions only at this fixed path
+        if capabilities.get("se:cdp"):
+            return capabilities["se:cdp"]
+
+        ws_base = self.base_url.replace("http://", "ws://").replace("https://", "wss://")
+
+        return f"{ws_base}/session/{session_id}/se/cdp"
+
+    def create_session(self) -> GridSession:
+        """POST /session, retrying timeouts and connection errors with exponential backoff"""
+
+        last_error = None
+
+        for attempt in range(self.max_retries):
+            try:
+                logger.info(f"Creating Selenium Grid session (attempt {attempt + 1}/{self.max_retries})...")
+
+                response = self.http.post(f"{self.base_url}/session", json=self.capabilities, timeout=self.timeout)
+
+                if response.status_code != 200:
+                    logger.warning(f"Selenium Grid response status: {response.status_code}")
+                    logger.debug(f"Response body: {response.text}")
+
+                response.raise_for_status()
+                session_data = response.json()
+                value = session_data.get("value") or {}
+
+                # W3C responses nest the id under 'value', legacy ones have it at the top level
+                session_id = session_data.get("sessionId") or value.get("sessionId")
+
+                if not session_id:
+                    raise ValueError("No sessionId found in Selenium Grid response")
+
+                session = GridSession(session_id, self._cdp_url_for(session_id, value.get("capabilities") or {}))
+
+                with self._lock:
+                    self._owned[session_id] = session
+                    self.created += 1
+
+                logger.info(f"Created Selenium Grid session: {session_id}")
+
+                return session
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+                last_error = e
+                logger.warning(f"Error creating session (attempt {attempt + 1}/{self.max_retries}): {e}")
+
+                if attempt < self.max_retries - 1:
+                    time.sleep(2 ** attempt)  # sleep-ok: exponential backoff 1s, 2s, 4s
+
+            except requests.exceptions.RequestException as e:
+                raise RuntimeError(f"Failed to create Selenium Grid session: {e}")
+
+            except (ValueError, KeyError) as e:
+                raise RuntimeError(f"Failed to parse Selenium Grid session response: {e}")
+
+        raise RuntimeError(f"Failed to create Selenium Grid session after {self.max_retries} attempts: {last_error}")
+
+    def prefill(self) -> int:
+        """Create sessions in parallel until pool_size are idle; returns how many are idle"""
+
+        missing = self.pool_size - len(self._idle)
+
+        if missing <= 0:
+            return len(self._idle)
+
+        started = time.monotonic()
+
+        with ThreadPoolExecutor(max_workers=missing) as executor:
+            futures = [executor.submit(self.create_session) for _ in range(missing)]
+
+        errors = []
+
+        for future in futures:
+            try:
+                session = future.result()
+            except RuntimeError as e:
+                errors.append(e)
+                continue
+
+            with self._lock:
+                self._idle.append(session)
+
+        if errors and not self._idle:
+            raise RuntimeError(f"Could not create any Selenium Grid session: {errors[0]}")
+
+        for error in errors:
+            logger.warning(f"Selenium Grid session creation failed during prefill: {error}")
+
+        logger.info(f"Prefilled {len(self._idle)} Selenium Grid session(s) in {time.monotonic() - started:.1f}s")
+
+        return len(self._idle)
+
+    def is_healthy(self, session: GridSession) -> bool:
+        """GET /session/{id}/url; a live session answers 200"""
+
+        try:
+            response = self.http.get(f"{self.base_url}/session/{session.session_id}/url", timeout=5)
+        except requests.exceptions.RequestException as e:
+            logger.debug(f"Health check of session {session.session_id} failed: {e}")
+            return False
+
+        return response.status_code == 200
+
+    def acquire(self, preferred: Optional[GridSession] = None) -> GridSession:
+        """
+        Hand out a healthy session
+
+        Args:
+            preferred: Session to use if it is still healthy, e.g. one assigned by the xdist controller
+        """
+
+        candidates = [preferred] if preferred else []
+
+        while True:
+            if not candidates:
+                with self._lock:
+                    if not self._idle:
+                        break
+
+                    candidates.append(self._idle.pop())
+
+            session = candidates.pop()
+
+            if self.is_healthy(session):
+                session.uses += 1
+                return session
+
+            self.unhealthy += 1
+            logger.warning(f"Selenium Grid session {session.session_id} is not healthy, replacing it")
+            self.delete_session(session)
+
+        session = self.create_session()
+        session.uses += 1
+
+        return session
+
+    def release(self, session: GridSession):
+        """Return a session to the pool, or delete it once it has been used max_uses times"""
+
+        if self.max_uses and session.uses >= self.max_uses:
+            self.delete_session(session)
+            return
+
+        with self._lock:
+            self._idle.append(session)
+
+    def delete_session(self, session: GridSession):
+        """DELETE /session/{id} for a session this manager created (others are left to their owner)"""
+
+        with self._lock:
+            if self._owned.pop(session.session_id, None) is None:
+                return
+
+            if session in self._idle:
+                self._idle.remove(session)
+
+        try:
+            response = self.http.delete(f"{self.base_url}/session/{session.session_id}", timeout=self.timeout)
+
+            if response.status_code not in (200, 404):
+                logger.warning(f"Deleting Selenium Grid session {session.session_id} returned {response.status_code}")
+        except requests.exceptions.RequestException as e:
+            logger.warning(f"Failed to delete Selenium Grid session {session.session_id}: {e}")
+            return
+
+        with self._lock:
+            self.deleted += 1
+
+        logger.info(f"Deleted Selenium Grid session: {session.session_id}")
+
+    def close(self):
+        """Delete every session this manager created and close the HTTP connection pool"""
+
+        sessions = list(self._owned.values())
+
+        if sessions:
+            with ThreadPoolExecutor(max_workers=len(sessions)) as executor:
+                list(executor.map(self.delete_session, sessions))
+
+        self.http.close()
+
+    def stats(self) -> Dict:
+        """Session counters"""
+
+        return {
+            "created": self.created,
+            "deleted": self.deleted,
+            "unhealthy": self.unhealthy,
+            "idle": len(self._idle),
+            "open": len(self._owned),
+        }
@@ -0,0 +1,148 @@
+"""
+HAR Archive
+Records the traffic of each test into its own HAR archive and replays it later with no network access
+"""
+
+import json
+import logging
+import os
+import re
+from pathlib import Path
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+class HarArchive:
+    """
+    Per-test HAR record/replay for browser contexts.
+
+    record: requests go to the network and are saved to <har_dir>/<test>[<browser>].har.zip when the
+            context closes
+    replay: requests are answered from the test's archive only; anything not in the archive is aborted
+            and reported as a miss
+    off:    contexts are left untouched
+    """
+
+    MODES = ("off", "record", "replay")
+
+    def __init__(self, mode: str = "off", har_dir: str = "har"):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown HAR mode: {mode}. Use one of: {', '.join(self.MODES)}")
+
+        self.mode = mode
+        self.har_dir = Path(har_dir)
+
+        # test id -> "METHOD url" of every request that was not found in the archive
+        self.misses: Dict[str, List[str]] = {}
+
+        # test ids that were replayed without an archive on disk
+        self.missing_archives: List[str] = []
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "off"
+
+    def path_for(self, test_id: str, browser_name: str) -> Path:
+        """Archive path of a test on a browser, e.g. har/tests_test_ebay.py_test_x[chromium].har.zip"""
+
+        slug = re.sub(r"[^A-Za-z0-9_.\-\[\]]+", "_", test_id).strip("_")
+
+        return self.har_dir / f"{slug}[{browser_name}].har.zip"
+
+    def attach(self, context, test_id: str, browser_name: str):
+        """Set up recording or replay on a sync BrowserContext"""
+
+        if not self.enabled:
+            return
+
+        path = self.path_for(test_id, browser_name)
+
+        if self.mode == "record":
+            path.parent.mkdir(parents=True, exist_ok=True)
+            context.route_from_har(path, update=True, update_content="attach", update_mode="minimal")
+            logger.info(f"Recording HAR archive: {path}")
+
+            return
+
+        misses = self.misses.setdefault(test_id, [])
+
+        def abort_miss(route):
+            misses.append(f"{route.request.method} {route.request.url}")
+            route.abort("internetdisconnected")
+
+        # Registered first so it only sees what the archive route falls back on
+        context.route("**/*", abort_miss)
+
+        if path.exists():
+            context.route_from_har(path, not_found="fallback")
+            logger.info(f"Replaying HAR archive: {path}")
+        else:
+            self.missing_archives.append(test_id)
+            logger.warning(f"No HAR archive for {test_id} on {browser_name} ({path}); every request will fail")
+
+    async def attach_async(self, context, test_id: str, browser_name: str):
+        """Set up recording or replay on an async BrowserContext"""
+
+        if not self.enabled:
+            return
+
+        path = self.path_for(test_id, browser_name)
+
+        if self.mode == "record":
+            path.parent.mkdir(parents=True, exist_ok=True)
+            await context.route_from_har(path, update=True, update_content="attach", update_mode="minimal")
+            logger.info(f"Recording HAR archive: {path}")
+
+            return
+
+        misses = self.misses.setdefault(test_id, [])
+
+        async def abort_miss(route):
+            misses.append(f"{route.request.method} {route.request.url}")
+            await route.abort("internetdisconnected")
+
+        await context.route("**/*", abort_miss)
+
+        if path.exists():
+            await context.route_from_har(path, not_found="fallback")
+            logger.info(f"Replaying HAR archive: {path}")
+        else:
+            self.missing_archives.append(test_id)
+            logger.warning(f"No HAR archive for {test_id} on {browser_name} ({path}); every request will fail")
+
+    def report(self) -> str:
+        """Human readable summary of replay misses"""
+
+        if self.mode != "replay":
+            return f"HAR mode: {self.mode}"
+
+        total = sum(len(urls) for urls in self.misses.values())
+        lines = [f"HAR replay: {total} request(s) missed the archive in {len(self.misses)} test(s)"]
+
+        for test_id in self.missing_archives:
+            lines.append(f"  {test_id}: no archive recorded")
+
+        for test_id, urls in self.misses.items():
+            if not urls:
+                continue
+
+            lines.append(f"  {test_id}: {len(urls)} miss(es)")
+            lines.extend(f"    {url}" for url in urls[:10])
+
+            if len(urls) > 10:
+                lines.append(f"    ... and {len(urls) - 10} more")
+
+        return "\n".join(lines)
+
+    def write_report(self, path: str):
+        """Write replay misses as JSON"""
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        with open(path, "w") as f:
+            json.dump({
+                "mode": self.mode,
+                "missing_archives": self.missing_archives,
+                "misses": {test_id: urls for test_id, urls in self.misses.items() if urls},
+            }, f, indent=2)
@@ -2,26 +2,21 @@ import time
 import allure
 from playwright.sync_api import Page
 
+from utils.screenshots import ScreenshotService
+from utils.waits import wait_for_count_change, wait_for_dom_quiet, wait_for_response, wait_for_text_change
+
 
 def take_screenshot(page: Page, filename: str = None, attach_to_allure: bool = True):
-    """Take a screenshot and optionally attach to Allure"""
-    import os
-    os.makedirs("reports", exist_ok=True)
-    
+    """Take a screenshot and optionally attach to Allure (written in the background by the screenshot service)"""
     if filename is None:
         filename = f"screenshot_{int(time.time())}.png"
     
-    screenshot_path = f"reports/{filename}"
-    screenshot_bytes = page.screenshot(path=screenshot_path)
-    
-    if attach_to_allure:
-        allure.attach(
-            screenshot_bytes,
-            name=filename,
-            attachment_type=allure.attachment_type.PNG
-        )
-    
-    return screenshot_path
+    return ScreenshotService.default().capture(
+        page,
+        f"reports/{filename}",
+        kind="manual",
+        attach_to_allure=attach_to_allure
+    )
 
 
 def attach_page_source(page: Page):
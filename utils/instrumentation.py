@@ -0,0 +1,317 @@
+"""
+Instrumentation
+Per-test timing of page-object methods and raw Playwright calls: wall time, browser round trips,
+explicit sleeps and time lost to fallback-selector timeouts
+"""
+
+import functools
+import inspect
+import json
+import logging
+import os
+import sys
+import time
+from collections import Counter
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Playwright methods that only build objects on the client side and never talk to the browser
+LOCAL_METHODS = frozenset({
+    "locator", "get_by_alt_text", "get_by_label", "get_by_placeholder", "get_by_role", "get_by_test_id",
+    "get_by_text", "get_by_title", "frame_locator", "first", "last", "nth", "filter", "or_", "and_",
+    "on", "once", "remove_listener", "expect_event", "expect_request", "expect_response", "expect_navigation",
+    "expect_popup", "expect_download", "expect_file_chooser", "expect_console_message", "expect_page",
+    "expect_request_finished", "expect_websocket", "expect_worker", "set_default_timeout",
+    "set_default_navigation_timeout", "is_closed", "frame", "content_frame", "describe", "within",
+})
+
+# Classes whose calls are counted, by name, in both the sync and the async API
+INSTRUMENTED_PLAYWRIGHT_CLASSES = ("Page", "Frame", "Locator", "ElementHandle", "Keyboard", "Mouse", "BrowserContext")
+
+
+class StepTimings:
+    """Timings recorded while one test runs"""
+
+    def __init__(self, test_id: str, previous: Optional["StepTimings"] = None):
+        self.test_id = test_id
+        self.previous = previous
+        self.started = time.monotonic()
+        self.wall_s = 0.0
+
+        # "EbayPage.add_item_to_cart" -> calls / total / max (inclusive of nested calls)
+        self.methods: Dict[str, Dict] = {}
+
+        # "Page.goto" -> number of calls, and their total time
+        self.round_trips: Counter = Counter()
+        self.round_trip_time: Counter = Counter()
+
+        self.sleeps = 0
+        self.sleep_s = 0.0
+
+        # "tests/pages/ebay_page.py:914" -> time spent in fixed sleeps called from that line
+        self.sleep_sites: Counter = Counter()
+        self.fallback_timeouts = 0
+        self.fallback_timeout_s = 0.0
+
+    def record_method(self, name: str, elapsed_s: float):
+        stats = self.methods.setdefault(name, {"calls": 0, "total_s": 0.0, "max_s": 0.0})
+        stats["calls"] += 1
+        stats["total_s"] += elapsed_s
+        stats["max_s"] = max(stats["max_s"], elapsed_s)
+
+    def record_round_trip(self, name: str, elapsed_s: float):
+        self.round_trips[name] += 1
+        self.round_trip_time[name] += elapsed_s
+
+    def record_sleep(self, elapsed_s: float, site: Optional[str] = None):
+        self.sleeps += 1
+        self.sleep_s += elapsed_s
+
+        if site:
+            self.sleep_sites[site] += elapsed_s
+
+    def record_fallback_timeout(self, elapsed_s: float):
+        self.fallback_timeouts += 1
+        self.fallback_timeout_s += elapsed_s
+
+    def finish(self):
+        self.wall_s = time.monotonic() - self.started
+
+    def to_dict(self) -> Dict:
+        return {
+            "test": self.test_id,
+            "wall_s": round(self.wall_s, 3),
+            "round_trips": sum(self.round_trips.values()),
+            "round_trip_s": round(sum(self.round_trip_time.values()), 3),
+            "sleeps": self.sleeps,
+            "sleep_s": round(self.sleep_s, 3),
+            "sleep_sites": {site: round(elapsed, 3) for site, elapsed in self.sleep_sites.most_common()},
+            "fallback_timeouts": self.fallback_timeouts,
+            "fallback_timeout_s": round(self.fallback_timeout_s, 3),
+            "methods": {
+                name: {"calls": stats["calls"], "total_s": round(stats["total_s"], 3), "max_s": round(stats["max_s"], 3)}
+                for name, stats in sorted(self.methods.items(), key=lambda item: -item[1]["total_s"])
+            },
+            "playwright_calls": {
+                name: {"calls": count, "total_s": round(self.round_trip_time[name], 3)}
+                for name, count in self.round_trips.most_common()
+            },
+        }
+
+    def report(self) -> str:
+        """Human readable breakdown"""
+
+        data = self.to_dict()
+        lines = [
+            f"{self.test_id}: {data['wall_s']:.2f}s wall, {data['round_trips']} browser round trip(s) "
+            f"({data['round_trip_s']:.2f}s), {data['sleeps']} sleep(s) ({data['sleep_s']:.2f}s), "
+            f"{data['fallback_timeouts']} fallback timeout(s) ({data['fallback_timeout_s']:.2f}s)",
+            "",
+            f"{'Page-object method (inclusive)':<60} {'calls':>6} {'total s':>9} {'max s':>8}",
+        ]
+
+        for name, stats in data["methods"].items():
+            lines.append(f"{name:<60} {stats['calls']:>6} {stats['total_s']:>9.2f} {stats['max_s']:>8.2f}")
+
+        lines += ["", f"{'Playwright call':<60} {'calls':>6} {'total s':>9}"]
+
+        for name, stats in data["playwright_calls"].items():
+            lines.append(f"{name:<60} {stats['calls']:>6} {stats['total_s']:>9.2f}")
+
+        return "\n".join(lines)
+
+
+_current: Optional[StepTimings] = None
+
+
+def start_recording(test_id: str) -> StepTimings:
+    """Start recording timings; a recording in progress is paused until this one stops"""
+
+    global _current
+    _current = StepTimings(test_id, previous=_current)
+
+    return _current
+
+
+def stop_recording() -> Optional[StepTimings]:
+    """Stop the current recording, resume the one it paused and return it"""
+
+    global _current
+    timings = _current
+
+    if timings:
+        timings.finish()
+        _current = timings.previous
+
+    return timings
+
+
+def current_timings() -> Optional[StepTimings]:
+    return _current
+
+
+def record_fallback_timeout(elapsed_s: float):
+    """Account time spent waiting for a fallback selector that never showed up"""
+
+    if _current is not None:
+        _current.record_fallback_timeout(elapsed_s)
+
+
+def timed(func: Callable) -> Callable:
+    """Record the wall time of a (sync or async) method while a recording is active"""
+
+    name = func.__qualname__
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            if _current is None:
+                return await func(*args, **kwargs)
+
+            timings, started = _current, time.monotonic()
+
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                timings.record_method(name, time.monotonic() - started)
+
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if _current is None:
+            return func(*args, **kwargs)
+
+        timings, started = _current, time.monotonic()
+
+        try:
+            return func(*args, **kwargs)
+        finally:
+            timings.record_method(name, time.monotonic() - started)
+
+    return wrapper
+
+
+def instrument_class(cls):
+    """
+    Class decorator: time every method defined on the class (public and _private).
+    Static/class methods, properties and generators are left alone.
+    """
+
+    for name, attr in list(vars(cls).items()):
+        if name.startswith("__") or not inspect.isfunction(attr) or inspect.isgeneratorfunction(attr) \
+                or inspect.isasyncgenfunction(attr):
+            continue
+
+        setattr(cls, name, timed(attr))
+
+    return cls
+
+
+def _call_site() -> Optional[str]:
+    """'path:line' of the first caller outside Playwright and this module"""
+
+    frame = sys._getframe(2)
+
+    while frame is not None and (frame.f_code.co_filename == __file__ or
+                                 f"{os.sep}playwright{os.sep}" in frame.f_code.co_filename):
+        frame = frame.f_back
+
+    if frame is None:
+        return None
+
+    try:
+        path = os.path.relpath(frame.f_code.co_filename)
+    except ValueError:
+        path = frame.f_code.co_filename
+
+    return f"{path.replace(os.sep, '/')}:{frame.f_lineno}"
+
+
+def _count_round_trip(class_name: str, method_name: str, func: Callable) -> Callable:
+    label = f"{class_name}.{method_name}"
+    is_sleep = method_name == "wait_for_timeout"
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            if _current is None:
+                return await func(*args, **kwargs)
+
+            timings, started = _current, time.monotonic()
+            site = _call_site() if is_sleep else None
+
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                elapsed = time.monotonic() - started
+                timings.record_round_trip(label, elapsed)
+
+                if is_sleep:
+                    timings.record_sleep(elapsed, site)
+
+        async_wrapper._instrumented = True
+
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if _current is None:
+            return func(*args, **kwargs)
+
+        timings, started = _current, time.monotonic()
+        site = _call_site() if is_sleep else None
+
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = time.monotonic() - started
+            timings.record_round_trip(label, elapsed)
+
+            if is_sleep:
+                timings.record_sleep(elapsed, site)
+
+    wrapper._instrumented = True
+
+    return wrapper
+
+
+def install_playwright_instrumentation():
+    """Count calls to the browser on Playwright's Page/Locator/... classes (sync and async API); idempotent"""
+
+    from playwright import async_api, sync_api
+
+    for api in (sync_api, async_api):
+        for class_name in INSTRUMENTED_PLAYWRIGHT_CLASSES:
+            cls = getattr(api, class_name)
+
+            for name, attr in list(vars(cls).items()):
+                if name.startswith("_") or name in LOCAL_METHODS or not inspect.isfunction(attr):
+                    continue
+
+                if getattr(attr, "_instrumented", False):
+                    continue
+
+                setattr(cls, name, _count_round_trip(class_name, name, attr))
+
+
+def write_timings_report(results: List[Dict], path: str):
+    """Write the per-test breakdowns of a run, with totals, as JSON"""
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    totals = {
+        key: round(sum(result[key] for result in results), 3)
+        for key in ("wall_s", "round_trips", "round_trip_s", "sleeps", "sleep_s", "fallback_timeouts", "fallback_timeout_s")
+    }
+
+    sleep_sites: Counter = Counter()
+
+    for result in results:
+        sleep_sites.update(result.get("sleep_sites", {}))
+
+    totals["sleep_sites"] = {site: round(elapsed, 3) for site, elapsed in sleep_sites.most_common()}
+
+    with open(path, "w") as f:
+        json.dump({"totals": totals, "tests": results}, f, indent=2)
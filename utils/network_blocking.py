@@ -0,0 +1,276 @@
+"""
+Network Blocking
+Named profiles that abort requests our assertions don't depend on (images, fonts, ads, trackers)
+"""
+
+import logging
+import re
+import weakref
+from collections import Counter
+from typing import Dict, Iterable, Optional, Tuple
+from urllib.parse import urlparse
+
+from config.browser_config import get_browser_capabilities
+from config.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+# Hosts treated as first party by the third-party rule
+FIRST_PARTY_DOMAINS = ("ebay.com", "ebaystatic.com", "ebayimg.com", "ebaydesc.com", "ebayrtm.com")
+
+# Well-known ad / analytics / tracking hosts
+TRACKER_URL_PATTERN = re.compile(
+    r"doubleclick\.net|googlesyndication\.com|googletagmanager\.com|google-analytics\.com|googleadservices\.com"
+    r"|facebook\.(net|com)/tr|connect\.facebook\.net|scorecardresearch\.com|criteo\.(com|net)|adnxs\.com"
+    r"|taboola\.com|outbrain\.com|quantserve\.com|bing\.com/bat|hotjar\.com|adsrvr\.org|rubiconproject\.com"
+    r"|pubmatic\.com|casalemedia\.com|/beacon|/pixel|/collect\?",
+    re.IGNORECASE,
+)
+
+# Rough transfer size of a blocked request by resource type, used when no allowed response of that
+# type has been measured yet (e.g. images under the 'media' profile are never allowed)
+ESTIMATED_BYTES_BY_RESOURCE_TYPE = {
+    "image": 40_000,
+    "media": 500_000,
+    "font": 30_000,
+    "script": 25_000,
+    "stylesheet": 15_000,
+    "texttrack": 5_000,
+    "manifest": 2_000,
+}
+DEFAULT_ESTIMATED_BYTES = 5_000
+
+# Allowed responses measured per resource type; each measurement costs a round trip to the browser
+MAX_SIZE_SAMPLES = 20
+
+
+class BlockingProfile:
+    """Rules deciding which requests to abort"""
+
+    def __init__(self,
+                 name: str,
+                 resource_types: Iterable[str] = (),
+                 block_third_party: bool = False,
+                 block_trackers: bool = False):
+        self.name = name
+        self.resource_types = frozenset(resource_types)
+        self.block_third_party = block_third_party
+        self.block_trackers = block_trackers
+
+    @property
+    def blocks_anything(self) -> bool:
+        return bool(self.resource_types) or self.block_third_party or self.block_trackers
+
+    def block_reason(self, url: str, resource_type: str, first_party_domains: Iterable[str]) -> Optional[str]:
+        """Why a request is blocked ('resource:<type>', 'tracker', 'third-party'), or None to allow it"""
+
+        if resource_type == "document":
+            return None
+
+        if resource_type in self.resource_types:
+            return f"resource:{resource_type}"
+
+        if self.block_trackers and TRACKER_URL_PATTERN.search(url):
+            return "tracker"
+
+        if self.block_third_party:
+            host = urlparse(url).hostname or ""
+
+            if host and not any(host == domain or host.endswith(f".{domain}") for domain in first_party_domains):
+                return "third-party"
+
+        return None
+
+
+BLOCKING_PROFILES: Dict[str, BlockingProfile] = {
+    "none": BlockingProfile("none"),
+    "media": BlockingProfile("media", resource_types=("image", "media", "font")),
+    "third-party": BlockingProfile("third-party", block_third_party=True, block_trackers=True),
+    "aggressive": BlockingProfile(
+        "aggressive",
+        resource_types=("image", "media", "font", "texttrack", "manifest"),
+        block_third_party=True,
+        block_trackers=True,
+    ),
+}
+
+
+def resolve_blocking_profile(browser_name: Optional[str] = None) -> str:
+    """
+    Name of the blocking profile to use: BLOCKING_PROFILE env var first, then the
+    'blocking_profile' capability of the browser in config/browser_config.json, then 'none'
+    """
+
+    if Settings.BLOCKING_PROFILE:
+        return Settings.BLOCKING_PROFILE
+
+    capabilities = get_browser_capabilities(browser_name or Settings.BROWSER)
+
+    return capabilities.get("blocking_profile", "none")
+
+
+class NetworkBlocker:
+    """Routes every request of a browser context through a blocking profile and counts the result"""
+
+    # One blocker per context, so stats can be looked up from the context later
+    _blockers: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+    # Transfer sizes of allowed responses by resource type, shared by the blockers of this process
+    _measured_bytes: Counter = Counter()
+    _measured_responses: Counter = Counter()
+
+    def __init__(self, profile: str = "none", first_party_domains: Iterable[str] = FIRST_PARTY_DOMAINS):
+        if profile not in BLOCKING_PROFILES:
+            raise ValueError(f"Unknown blocking profile: {profile}. Use one of: {', '.join(BLOCKING_PROFILES)}")
+
+        self.profile = BLOCKING_PROFILES[profile]
+        self.first_party_domains = tuple(first_party_domains)
+        self.allowed = 0
+        self.blocked = 0
+        self.blocked_by_reason: Counter = Counter()
+        self.blocked_by_type: Counter = Counter()
+
+    @classmethod
+    def for_context(cls, context) -> Optional["NetworkBlocker"]:
+        """Blocker attached to a context, if any"""
+
+        return cls._blockers.get(context)
+
+    def _block_reason(self, request) -> Optional[str]:
+        reason = self.profile.block_reason(request.url, request.resource_type, self.first_party_domains)
+
+        if reason is None:
+            self.allowed += 1
+        else:
+            self.blocked += 1
+            self.blocked_by_reason[reason] += 1
+            self.blocked_by_type[request.resource_type] += 1
+
+        return reason
+
+    def _wants_size_sample(self, request) -> bool:
+        return (self.profile.blocks_anything
+                and self._measured_responses[request.resource_type] < MAX_SIZE_SAMPLES)
+
+    @classmethod
+    def record_response_size(cls, resource_type: str, sizes: Dict):
+        """Add one allowed response's Request.sizes() to the measured average of its resource type"""
+
+        size = max(sizes.get("responseHeadersSize", 0), 0) + max(sizes.get("responseBodySize", 0), 0)
+
+        if size:
+            cls._measured_bytes[resource_type] += size
+            cls._measured_responses[resource_type] += 1
+
+    def _on_request_finished(self, request):
+        if not self._wants_size_sample(request):
+            return
+
+        try:
+            self.record_response_size(request.resource_type, request.sizes())
+        except Exception as e:
+            logger.debug(f"Could not measure {request.url}: {e}")
+
+    async def _on_request_finished_async(self, request):
+        if not self._wants_size_sample(request):
+            return
+
+        try:
+            self.record_response_size(request.resource_type, await request.sizes())
+        except Exception as e:
+            logger.debug(f"Could not measure {request.url}: {e}")
+
+    def _bytes_per_request(self, resource_type: str) -> Tuple[int, bool]:
+        """Average measured size of a resource type, or the fixed estimate; and whether it was measured"""
+
+        if self._measured_responses[resource_type]:
+            return self._measured_bytes[resource_type] // self._measured_responses[resource_type], True
+
+        return ESTIMATED_BYTES_BY_RESOURCE_TYPE.get(resource_type, DEFAULT_ESTIMATED_BYTES), False
+
+    def estimated_bytes_saved(self) -> Tuple[int, int]:
+        """
+        Bytes the blocked requests would have transferred: blocked count per resource type times the
+        average size of allowed responses of that type, falling back to a fixed guess per type
+
+        Returns:
+            (estimated total, part of it based on measured responses)
+        """
+
+        total = measured = 0
+
+        for resource_type, count in self.blocked_by_type.items():
+            size, is_measured = self._bytes_per_request(resource_type)
+            total += size * count
+            measured += size * count if is_measured else 0
+
+        return total, measured
+
+    def _handle_route(self, route):
+        if self._block_reason(route.request):
+            route.abort("blockedbyclient")
+        else:
+            route.fallback()
+
+    async def _handle_route_async(self, route):
+        if self._block_reason(route.request):
+            await route.abort("blockedbyclient")
+        else:
+            await route.fallback()
+
+    def attach(self, context) -> "NetworkBlocker":
+        """Apply the profile to a sync BrowserContext (no routing at all for the 'none' profile)"""
+
+        if self.profile.blocks_anything:
+            context.route("**/*", self._handle_route)
+            context.on("requestfinished", self._on_request_finished)
+
+        self._blockers[context] = self
+
+        return self
+
+    async def attach_async(self, context) -> "NetworkBlocker":
+        """Apply the profile to an async BrowserContext"""
+
+        if self.profile.blocks_anything:
+            await context.route("**/*", self._handle_route_async)
+            context.on("requestfinished", self._on_request_finished_async)
+
+        self._blockers[context] = self
+
+        return self
+
+    def reset_stats(self):
+        """Zero the counters, e.g. when a pooled context is handed to the next test"""
+
+        self.allowed = 0
+        self.blocked = 0
+        self.blocked_by_reason.clear()
+        self.blocked_by_type.clear()
+
+    def stats(self) -> Dict:
+        """Counters since the blocker was attached (or last reset)"""
+
+        estimated_bytes, measured_bytes = self.estimated_bytes_saved()
+
+        return {
+            "profile": self.profile.name,
+            "allowed": self.allowed,
+            "blocked": self.blocked,
+            "blocked_by_reason": dict(self.blocked_by_reason),
+            "blocked_by_resource_type": dict(self.blocked_by_type),
+            "estimated_bytes_saved": estimated_bytes,
+            "estimated_bytes_saved_from_measured_sizes": measured_bytes,
+        }
+
+    def summary(self) -> str:
+        """One-line summary for logs and reports"""
+
+        total = self.allowed + self.blocked
+        reasons = ", ".join(f"{reason}={count}" for reason, count in self.blocked_by_reason.most_common())
+        estimated_bytes, measured_bytes = self.estimated_bytes_saved()
+
+        return (f"Network blocking '{self.profile.name}': blocked {self.blocked}/{total} requests "
+                f"(estimated ~{estimated_bytes / 1024:.0f} KiB saved, "
+                f"{measured_bytes / 1024:.0f} KiB of it from measured response sizes)"
+                f"{f' [{reasons}]' if reasons else ''}")
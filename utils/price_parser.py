@@ -0,0 +1,152 @@
+"""
+Price Parser
+Parses eBay price strings ('$19.99', 'US $1,234.56 to US $2,000.00', 'EUR 12,50', '1.234,56 €')
+into (low, high, currency), one at a time or in batches
+"""
+
+import math
+import re
+from array import array
+from functools import lru_cache
+from typing import Iterable, List, NamedTuple, Optional
+
+# Currency markers, longest first so 'US $' wins over '$'
+CURRENCY_SYMBOLS = {
+    "US $": "USD",
+    "US$": "USD",
+    "C $": "CAD",
+    "C$": "CAD",
+    "AU $": "AUD",
+    "AU$": "AUD",
+    "$": "USD",
+    "£": "GBP",
+    "€": "EUR",
+    "¥": "JPY",
+    "₹": "INR",
+}
+CURRENCY_CODES = ("USD", "GBP", "EUR", "CAD", "AUD", "JPY", "INR", "CHF", "CNY", "MXN", "PLN", "SEK")
+
+_MARKER = "|".join([re.escape(symbol) for symbol in sorted(CURRENCY_SYMBOLS, key=len, reverse=True)]
+                   + [rf"\b{code}\b" for code in CURRENCY_CODES])
+
+# A number may use ',', '.', a no-break or a thin space as separators, e.g. 1,234.56 / 1.234,56 / 1 234,56.
+# A plain space only groups thousands between digits ('1 234,56'), so '2 items' stays a separate number.
+_NUMBER = r"\d{1,3}(?: \d{3})+(?:[.,]\d{1,2})?(?!\d)|\d(?:[\d.,\u00a0\u202f]*\d)?"
+_AMOUNT_RE = re.compile(
+    rf"(?P<prefix>{_MARKER})?\s*(?P<number>{_NUMBER})(?:\s*(?P<suffix>{_MARKER}))?"
+)
+_SEPARATORS_RE = re.compile(r"[.,\u00a0\u202f ]")
+
+# What may stand between the two ends of a range: '$19.99 to $29.99', '$19.99 - $29.99'
+_RANGE_JOIN_RE = re.compile(r"\s*(?:to|-|\u2013|\u2014)\s*", re.IGNORECASE)
+
+
+class ParsedPrice(NamedTuple):
+    """Lowest and highest amount of a price string (equal unless it is a range) and its currency"""
+
+    low: float
+    high: float
+    currency: Optional[str]
+
+
+class PriceBatch(NamedTuple):
+    """Parsed prices of a batch, index-aligned with the input; unparseable strings are NaN / None"""
+
+    lows: array
+    highs: array
+    currencies: List[Optional[str]]
+
+
+def _to_float(number: str) -> float:
+    """
+    Normalize a number with any thousands/decimal separators. The last separator is the decimal
+    point when 1-2 digits follow it ('12,50', '1.234,56'); otherwise every separator groups thousands.
+    """
+
+    separators = _SEPARATORS_RE.findall(number)
+
+    if not separators:
+        return float(number)
+
+    digits = _SEPARATORS_RE.split(number)
+
+    if len(digits[-1]) <= 2:
+        return float(f"{''.join(digits[:-1])}.{digits[-1]}")
+
+    return float("".join(digits))
+
+
+def _currency(marker: Optional[str]) -> Optional[str]:
+    if not marker:
+        return None
+
+    return CURRENCY_SYMBOLS.get(marker, marker)
+
+
+@lru_cache(maxsize=8192)
+def parse_price(text: Optional[str], default_currency: Optional[str] = None) -> Optional[ParsedPrice]:
+    """
+    Parse one price string
+
+    Amounts next to a currency marker win over bare numbers, so '2 items $49.99' is 49.99 and not 2.
+    Only an explicit range ('$19.99 to $29.99', '$19.99 - $29.99') gives low=19.99, high=29.99;
+    otherwise the first amount is the price, so '$399.99 + $15.00 shipping' is 399.99.
+
+    Args:
+        text: Price text as shown on the page
+        default_currency: Currency to report when the text has no marker
+
+    Returns:
+        ParsedPrice, or None if the text holds no amount
+    """
+
+    if not text:
+        return None
+
+    marked, bare = [], []
+    currency = None
+
+    for match in _AMOUNT_RE.finditer(text):
+        marker = match.group("prefix") or match.group("suffix")
+        amount = (_to_float(match.group("number")), match.start(), match.end())
+
+        if marker:
+            marked.append(amount)
+            currency = currency or _currency(marker.strip())
+        else:
+            bare.append(amount)
+
+    amounts = marked or bare
+
+    if not amounts:
+        return None
+
+    low = high = amounts[0][0]
+
+    if len(amounts) > 1 and _RANGE_JOIN_RE.fullmatch(text, amounts[0][2], amounts[1][1]):
+        low, high = sorted((amounts[0][0], amounts[1][0]))
+
+    return ParsedPrice(low, high, currency or default_currency)
+
+
+def parse_prices(texts: Iterable[Optional[str]], default_currency: Optional[str] = None) -> PriceBatch:
+    """
+    Parse a batch of price strings into index-aligned arrays of lows, highs (NaN when a string holds
+    no amount) and currencies. Repeated strings, common on result pages, are parsed once.
+    """
+
+    lows, highs, currencies = array("d"), array("d"), []
+
+    for text in texts:
+        parsed = parse_price(text, default_currency)
+
+        if parsed is None:
+            lows.append(math.nan)
+            highs.append(math.nan)
+            currencies.append(None)
+        else:
+            lows.append(parsed.low)
+            highs.append(parsed.high)
+            currencies.append(parsed.currency)
+
+    return PriceBatch(lows, highs, currencies)
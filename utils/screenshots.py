@@ -0,0 +1,270 @@
+"""
+Screenshot Service
+Central screenshot capture with policies; files are written by a background thread, off the test thread
+"""
+
+import logging
+import os
+import queue
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Optional
+
+import allure
+
+from config.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+
+class ScreenshotService:
+    """
+    Captures screenshots according to a policy and hands the bytes to a writer thread.
+
+    Policies:
+        never:      nothing is captured
+        on-failure: only failure, debug and manual captures (routine step captures are skipped)
+        sampled:    like on-failure, plus every Nth step capture (N = 1 / SCREENSHOT_SAMPLE_RATE)
+        always:     everything is captured
+
+    Kinds of capture:
+        step:    routine evidence (product page, cart page)
+        debug:   something went wrong but the test continues (e.g. a modal that would not close)
+        failure: the test failed
+        manual:  explicitly requested through take_screenshot()
+    """
+
+    POLICIES = ("never", "on-failure", "sampled", "always")
+    FORMATS = ("jpeg", "png")
+
+    _default: Optional["ScreenshotService"] = None
+
+    def __init__(self,
+                 policy: Optional[str] = None,
+                 image_format: Optional[str] = None,
+                 quality: Optional[int] = None,
+                 sample_rate: Optional[float] = None,
+                 full_page: Optional[bool] = None):
+        """
+        Args:
+            policy: One of POLICIES (default from settings)
+            image_format: jpeg or png (default from settings)
+            quality: JPEG quality 0-100, ignored for png (default from settings)
+            sample_rate: Share of step captures kept by the 'sampled' policy (default from settings)
+            full_page: Capture the whole scrollable page instead of the viewport (default from settings)
+        """
+
+        self.policy = (policy or Settings.SCREENSHOT_POLICY).lower()
+        self.image_format = (image_format or Settings.SCREENSHOT_FORMAT).lower()
+        self.quality = Settings.SCREENSHOT_QUALITY if quality is None else quality
+        self.sample_rate = Settings.SCREENSHOT_SAMPLE_RATE if sample_rate is None else sample_rate
+        self.full_page = Settings.SCREENSHOT_FULL_PAGE if full_page is None else full_page
+
+        if self.policy not in self.POLICIES:
+            raise ValueError(f"Unknown screenshot policy: {self.policy}. Use one of: {', '.join(self.POLICIES)}")
+
+        if self.image_format not in self.FORMATS:
+            raise ValueError(f"Unknown screenshot format: {self.image_format}. Use one of: {', '.join(self.FORMATS)}")
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._step_count = 0
+
+        self.captured: Counter = Counter()
+        self.skipped: Counter = Counter()
+        self.capture_time_s = 0.0
+        self.files_written = 0
+        self.bytes_written = 0
+        self.write_errors = 0
+
+    @classmethod
+    def default(cls) -> "ScreenshotService":
+        """Process-wide service configured from settings"""
+
+        if cls._default is None:
+            cls._default = cls()
+
+        return cls._default
+
+    @property
+    def extension(self) -> str:
+        return "jpg" if self.image_format == "jpeg" else "png"
+
+    def should_capture(self, kind: str = "step") -> bool:
+        """Whether the policy lets a capture of this kind through"""
+
+        if self.policy == "never":
+            return False
+
+        if self.policy == "always" or kind != "step":
+            return True
+
+        if self.policy == "sampled" and self.sample_rate > 0:
+            # Deterministic sampling: keep every Nth step capture
+            every = max(int(round(1 / self.sample_rate)), 1)
+
+            with self._lock:
+                self._step_count += 1
+                return (self._step_count - 1) % every == 0
+
+        return False
+
+    def _screenshot_args(self, full_page: Optional[bool], is_page: bool) -> Dict:
+        args = {"type": self.image_format}
+
+        if self.image_format == "jpeg":
+            args["quality"] = self.quality
+
+        if is_page:
+            args["full_page"] = self.full_page if full_page is None else full_page
+
+        return args
+
+    def _path_with_extension(self, path: str) -> str:
+        return str(Path(path).with_suffix(f".{self.extension}"))
+
+    def _record_capture(self, kind: str, started: float):
+        with self._lock:
+            self.captured[kind] += 1
+            self.capture_time_s += time.monotonic() - started
+
+    def _attach(self, data: bytes, name: str):
+        attachment_type = allure.attachment_type.JPG if self.image_format == "jpeg" else allure.attachment_type.PNG
+        allure.attach(data, name=name, attachment_type=attachment_type)
+
+    def capture(self,
+                target,
+                path: str,
+                kind: str = "step",
+                full_page: Optional[bool] = None,
+                attach_to_allure: bool = False,
+                attachment_name: Optional[str] = None) -> Optional[str]:
+        """
+        Capture a sync Page (viewport by default) or Locator (clipped to the element)
+
+        Args:
+            target: Page or Locator to capture
+            path: Destination; the extension is replaced to match the configured format
+            kind: step, debug, failure or manual
+            full_page: Override the full-page setting for a Page
+            attach_to_allure: Also attach the image to the current Allure test
+            attachment_name: Allure attachment name (default: the file name)
+
+        Returns:
+            The path the image will be written to, or None if the policy skipped it
+        """
+
+        if not self.should_capture(kind):
+            self.skipped[kind] += 1
+            return None
+
+        started = time.monotonic()
+        data = target.screenshot(**self._screenshot_args(full_page, is_page=hasattr(target, "goto")))
+        self._record_capture(kind, started)
+
+        return self._submit(data, path, attach_to_allure, attachment_name)
+
+    async def capture_async(self,
+                            target,
+                            path: str,
+                            kind: str = "step",
+                            full_page: Optional[bool] = None,
+                            attach_to_allure: bool = False,
+                            attachment_name: Optional[str] = None) -> Optional[str]:
+        """Async counterpart of capture() for async Pages and Locators"""
+
+        if not self.should_capture(kind):
+            self.skipped[kind] += 1
+            return None
+
+        started = time.monotonic()
+        data = await target.screenshot(**self._screenshot_args(full_page, is_page=hasattr(target, "goto")))
+        self._record_capture(kind, started)
+
+        return self._submit(data, path, attach_to_allure, attachment_name)
+
+    def _submit(self, data: bytes, path: str, attach_to_allure: bool, attachment_name: Optional[str]) -> str:
+        path = self._path_with_extension(path)
+
+        if attach_to_allure:
+            self._attach(data, attachment_name or Path(path).name)
+
+        self._ensure_writer()
+        self._queue.put((path, data))
+
+        return path
+
+    def _ensure_writer(self):
+        with self._lock:
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(target=self._write_loop, name="screenshot-writer", daemon=True)
+                self._writer.start()
+
+    def _write_loop(self):
+        while True:
+            item = self._queue.get()
+
+            try:
+                if item is None:
+                    return
+
+                path, data = item
+
+                try:
+                    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+                    with open(path, "wb") as f:
+                        f.write(data)
+
+                    with self._lock:
+                        self.files_written += 1
+                        self.bytes_written += len(data)
+                except OSError as e:
+                    with self._lock:
+                        self.write_errors += 1
+
+                    logger.warning(f"Could not write screenshot {path}: {e}")
+            finally:
+                self._queue.task_done()
+
+    def flush(self):
+        """Block until every queued screenshot is on disk"""
+
+        if self._writer is not None and self._writer.is_alive():
+            self._queue.join()
+
+    def close(self):
+        """Flush pending screenshots and stop the writer thread"""
+
+        if self._writer is not None and self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+
+        self._writer = None
+
+    def stats(self) -> Dict:
+        """Counts and bytes of this run"""
+
+        return {
+            "policy": self.policy,
+            "format": self.image_format,
+            "captured": sum(self.captured.values()),
+            "captured_by_kind": dict(self.captured),
+            "skipped": sum(self.skipped.values()),
+            "files_written": self.files_written,
+            "bytes_written": self.bytes_written,
+            "write_errors": self.write_errors,
+            "capture_time_s": round(self.capture_time_s, 3),
+        }
+
+    def summary(self) -> str:
+        """One-line summary for logs and the terminal report"""
+
+        stats = self.stats()
+
+        return (f"Screenshots ({self.policy}, {self.image_format}): captured {stats['captured']}, "
+                f"skipped {stats['skipped']}, wrote {stats['files_written']} file(s) / "
+                f"{stats['bytes_written'] / 1024:.0f} KiB in {stats['capture_time_s']:.2f}s capture time")
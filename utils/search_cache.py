@@ -0,0 +1,186 @@
+"""
+Search Cache
+On-disk memo of search result URLs keyed by query, price cap and sort order, shared by every test,
+browser and xdist worker of a run so each distinct search is performed once. Results of earlier runs
+are only reused when a TTL is configured.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from filelock import FileLock
+
+from config.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+
+class SearchCache:
+    """
+    Search results in one JSON store next to a lock file. Entries belong to the run (run_id) that
+    searched for them and only serve that run, unless ttl is set: then entries of earlier runs are
+    reused for ttl seconds. The oldest entries are evicted beyond max_entries. While one worker runs
+    a search, workers asking for the same key wait on that key's lock and then read its result
+    instead of searching again.
+    """
+
+    STORE_NAME = "search_results.json"
+
+    def __init__(self,
+                 cache_dir: Optional[str] = None,
+                 ttl: Optional[int] = None,
+                 max_entries: Optional[int] = None,
+                 lock_timeout: float = 300,
+                 run_id: Optional[str] = None):
+        """
+        Args:
+            cache_dir: Directory of the store and its locks (default from settings)
+            ttl: Seconds entries of earlier runs stay usable; 0 = never reuse them (default from settings)
+            max_entries: Entries kept in the store (default from settings)
+            lock_timeout: Seconds to wait for another worker's search of the same key
+            run_id: Id shared by every process of the run, e.g. the xdist controller's (default: a new one)
+        """
+
+        self.cache_dir = Path(cache_dir or Settings.SEARCH_CACHE_DIR)
+        self.ttl = Settings.SEARCH_CACHE_TTL if ttl is None else ttl
+        self.run_id = run_id or uuid.uuid4().hex
+        self.max_entries = Settings.SEARCH_CACHE_MAX_ENTRIES if max_entries is None else max_entries
+        self.lock_timeout = lock_timeout
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def store_path(self) -> Path:
+        return self.cache_dir / self.STORE_NAME
+
+    @staticmethod
+    def key(query: str, max_price: float, sort: Optional[int] = None) -> str:
+        """Cache key of a search; the browser doesn't matter, so it is not part of it"""
+
+        sort = Settings.SEARCH_SORT if sort is None else sort
+        raw = json.dumps([" ".join(query.lower().split()), float(max_price), sort])
+
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+    def _store_lock(self) -> FileLock:
+        return FileLock(f"{self.store_path}.lock", timeout=self.lock_timeout)
+
+    def _key_lock(self, key: str) -> FileLock:
+        return FileLock(str(self.cache_dir / f"{key}.lock"), timeout=self.lock_timeout)
+
+    def _read(self) -> Dict[str, Dict]:
+        try:
+            with open(self.store_path, "r") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _write(self, entries: Dict[str, Dict]):
+        # Write next to the target and rename, so a crash never leaves a half-written store
+        tmp_path = f"{self.store_path}.{os.getpid()}.tmp"
+
+        with open(tmp_path, "w") as f:
+            json.dump(entries, f, indent=2)
+
+        os.replace(tmp_path, self.store_path)
+
+    def _is_current(self, entry: Dict, now: float) -> bool:
+        """Searched by this run, or by an earlier one within the (opt-in) ttl"""
+
+        return entry.get("run_id") == self.run_id or (self.ttl > 0 and now - entry["created_at"] <= self.ttl)
+
+    def _is_usable(self, entry: Optional[Dict], limit: int) -> bool:
+        """Current, and either holds limit items or the search that filled it ran out of results"""
+
+        if not entry or not self._is_current(entry, time.time()):
+            return False
+
+        return entry["limit"] >= limit or len(entry["items"]) < entry["limit"]
+
+    def get(self, key: str, limit: int) -> Optional[List[str]]:
+        """Up to limit cached URLs for a key, or None on a miss"""
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        with self._store_lock():
+            entry = self._read().get(key)
+
+        return entry["items"][:limit] if self._is_usable(entry, limit) else None
+
+    def put(self, key: str, items: List[str], limit: int, **details):
+        """Store the URLs a search returned for limit; details (query, price...) are kept for reference"""
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        with self._store_lock():
+            entries = self._read()
+            entries[key] = {**details, "limit": limit, "items": items, "created_at": time.time(),
+                            "run_id": self.run_id}
+
+            now = time.time()
+            entries = {k: v for k, v in entries.items() if self._is_current(v, now)}
+
+            # Evict the oldest entries beyond max_entries
+            newest = sorted(entries.items(), key=lambda kv: kv[1]["created_at"], reverse=True)
+            self._write(dict(newest[:max(self.max_entries, 1)]))
+
+    def get_or_search(self,
+                      query: str,
+                      max_price: float,
+                      limit: int,
+                      search: Callable[[], List[str]],
+                      sort: Optional[int] = None,
+                      refresh: bool = False) -> List[str]:
+        """
+        Cached URLs for this search, running search() (and caching a non-empty result) on a miss
+
+        Args:
+            query: Search query
+            max_price: Price cap
+            limit: Number of URLs wanted
+            search: Performs the search and returns its URL list
+            sort: Sort order the search uses (default from settings)
+            refresh: Always run the search (its result still replaces the cached one)
+        """
+
+        sort = Settings.SEARCH_SORT if sort is None else sort
+        key = self.key(query, max_price, sort)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        with self._key_lock(key):
+            items = None if refresh else self.get(key, limit)
+
+            if items is not None:
+                self.hits += 1
+                logger.info(f"Search cache hit for '{query}' under ${max_price}: {len(items)} items")
+                return items
+
+            self.misses += 1
+            started = time.monotonic()
+            items = search()
+
+            # An empty result is more likely a failed search than a real answer; don't share it
+            if items:
+                self.put(key, items, limit, query=query, max_price=max_price, sort=sort)
+
+            logger.info(f"Search cache miss for '{query}' under ${max_price}: "
+                        f"searched in {time.monotonic() - started:.1f}s")
+
+            return items
+
+    def clear(self):
+        """Drop every cached search"""
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        with self._store_lock():
+            self._write({})
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
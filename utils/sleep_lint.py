@@ -0,0 +1,143 @@
+"""
+Sleep Lint
+Lists the fixed sleeps left in the code (wait_for_timeout, time.sleep, asyncio.sleep) and, from the
+timings reports of a run, how much time each of them cost.
+
+Usage:
+    python -m utils.sleep_lint [paths...] [--timings reports/timings*.json]
+
+Exits with 1 when a sleep is found. Mark a deliberate sleep (e.g. retry backoff) with '# sleep-ok'.
+Zero-duration sleeps such as asyncio.sleep(0) only yield to the event loop and are not reported.
+"""
+
+import argparse
+import ast
+import glob
+import json
+import os
+import sys
+from collections import Counter
+from typing import Iterable, List, NamedTuple, Optional
+
+SUPPRESS_COMMENT = "# sleep-ok"
+DEFAULT_PATHS = ("tests", "utils")
+DEFAULT_TIMINGS = "reports/timings*.json"
+
+
+class SleepCall(NamedTuple):
+    """A fixed sleep in the source; duration_s is None when it is not a literal"""
+
+    path: str
+    line: int
+    call: str
+    duration_s: Optional[float]
+
+    @property
+    def site(self) -> str:
+        return f"{self.path}:{self.line}"
+
+
+def _sleep_call(node: ast.Call) -> Optional[str]:
+    """Name of the sleep a call node makes, or None"""
+
+    func = node.func
+
+    if not isinstance(func, ast.Attribute):
+        return None
+
+    if func.attr == "wait_for_timeout":
+        return "wait_for_timeout"
+
+    if func.attr == "sleep" and isinstance(func.value, ast.Name) and func.value.id in ("time", "asyncio"):
+        return f"{func.value.id}.sleep"
+
+    return None
+
+
+def find_sleeps(source: str, path: str) -> List[SleepCall]:
+    """Unsuppressed fixed sleeps in one module's source"""
+
+    lines = source.splitlines()
+    sleeps = []
+
+    for node in ast.walk(ast.parse(source, filename=path)):
+        if not isinstance(node, ast.Call):
+            continue
+
+        call = _sleep_call(node)
+
+        if call is None or SUPPRESS_COMMENT in lines[node.lineno - 1]:
+            continue
+
+        duration_s = None
+
+        if node.args and isinstance(node.args[0], ast.Constant) and isinstance(node.args[0].value, (int, float)):
+            # wait_for_timeout takes milliseconds, the sleeps seconds
+            duration_s = node.args[0].value / 1000 if call == "wait_for_timeout" else float(node.args[0].value)
+
+        if duration_s == 0:
+            # A zero sleep yields to the event loop, it waits for nothing
+            continue
+
+        sleeps.append(SleepCall(path, node.lineno, call, duration_s))
+
+    return sorted(sleeps, key=lambda sleep: sleep.line)
+
+
+def scan(paths: Iterable[str]) -> List[SleepCall]:
+    """Fixed sleeps in every .py file under the given files/directories"""
+
+    sleeps = []
+
+    for root in paths:
+        files = [root] if os.path.isfile(root) else sorted(glob.glob(os.path.join(root, "**", "*.py"), recursive=True))
+
+        for file_path in files:
+            with open(file_path, "r", encoding="utf-8") as f:
+                sleeps += find_sleeps(f.read(), os.path.relpath(file_path).replace(os.sep, "/"))
+
+    return sleeps
+
+
+def runtime_cost(timings_pattern: str) -> Counter:
+    """Seconds spent in fixed sleeps per 'path:line', summed over the matching timings reports"""
+
+    cost: Counter = Counter()
+
+    for path in glob.glob(timings_pattern):
+        with open(path, "r") as f:
+            cost.update(json.load(f).get("totals", {}).get("sleep_sites", {}))
+
+    return cost
+
+
+def report(sleeps: List[SleepCall], cost: Counter) -> str:
+    """Lint-style lines, one per sleep, and the totals"""
+
+    lines = []
+
+    for sleep in sleeps:
+        duration = f"{sleep.duration_s:.2f}s" if sleep.duration_s is not None else "variable"
+        spent = f", {cost[sleep.site]:.2f}s this run" if sleep.site in cost else ""
+        lines.append(f"{sleep.site}: fixed sleep {sleep.call} ({duration} per call{spent})")
+
+    lines.append(f"{len(sleeps)} fixed sleep(s) in the code; {sum(cost.values()):.2f}s spent sleeping in the last run")
+
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Report fixed sleeps and the time they cost per run")
+    parser.add_argument("paths", nargs="*", default=list(DEFAULT_PATHS), help="Files or directories to scan")
+    parser.add_argument("--timings", default=DEFAULT_TIMINGS,
+                        help=f"Timings reports of a run, written by the test session (default: {DEFAULT_TIMINGS})")
+    args = parser.parse_args(argv)
+
+    sleeps = scan(args.paths)
+    print(report(sleeps, runtime_cost(args.timings)))
+
+    return 1 if sleeps else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+"""
+Storage State Cache
+Saves the cookies/localStorage of a warmed-up session (consent given, modals dismissed) once,
+so every new browser context can start from that snapshot
+"""
+
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from config.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+
+class StorageStateCache:
+    """
+    One storage-state snapshot per browser type on disk. A snapshot is reused while it is younger
+    than max_age seconds and was taken with the same browser version.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_age: Optional[int] = None):
+        self.cache_dir = Path(cache_dir or Settings.STORAGE_STATE_DIR)
+        self.max_age = Settings.STORAGE_STATE_MAX_AGE if max_age is None else max_age
+
+    def path_for(self, browser_name: str) -> Path:
+        """Storage state file of a browser type"""
+
+        return self.cache_dir / f"{browser_name}.json"
+
+    def _meta_path_for(self, browser_name: str) -> Path:
+        return self.cache_dir / f"{browser_name}.meta.json"
+
+    def _read_meta(self, browser_name: str) -> Optional[Dict]:
+        try:
+            with open(self._meta_path_for(browser_name), "r") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def load(self, browser_name: str, browser_version: str) -> Optional[str]:
+        """
+        Path of a valid snapshot for this browser, or None
+
+        Args:
+            browser_name: chromium, firefox or webkit
+            browser_version: Version of the running browser; a snapshot taken by another version is stale
+        """
+
+        path = self.path_for(browser_name)
+        meta = self._read_meta(browser_name)
+
+        if meta is None or not path.exists():
+            return None
+
+        age = time.time() - meta.get("created_at", 0)
+
+        if age > self.max_age:
+            logger.info(f"Storage state snapshot for {browser_name} is {age:.0f}s old, refreshing")
+            return None
+
+        if meta.get("browser_version") != browser_version:
+            logger.info(f"Storage state snapshot for {browser_name} was taken with version "
+                        f"{meta.get('browser_version')}, running {browser_version}; refreshing")
+            return None
+
+        return str(path)
+
+    def save(self, context, browser_name: str, browser_version: str) -> str:
+        """Write the storage state of a sync BrowserContext as this browser's snapshot"""
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self.path_for(browser_name)
+        meta_path = self._meta_path_for(browser_name)
+
+        # Write next to the target and rename, so parallel workers never read a half-written file
+        tmp_suffix = f".{os.getpid()}.tmp"
+        context.storage_state(path=f"{path}{tmp_suffix}")
+        os.replace(f"{path}{tmp_suffix}", path)
+
+        with open(f"{meta_path}{tmp_suffix}", "w") as f:
+            json.dump({"browser_name": browser_name, "browser_version": browser_version, "created_at": time.time()}, f)
+
+        os.replace(f"{meta_path}{tmp_suffix}", meta_path)
+
+        return str(path)
+
+    def invalidate(self, browser_name: str):
+        """Drop the snapshot of a browser type"""
+
+        for path in (self.path_for(browser_name), self._meta_path_for(browser_name)):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def get_or_create(self, browser, warm_up: Callable, context_args: Optional[Dict] = None) -> str:
+        """
+        Return a valid snapshot for the browser, creating it first if needed
+
+        Args:
+            browser: Sync Playwright Browser
+            warm_up: Called with a fresh Page; should visit the site and dismiss consent/modals
+            context_args: Extra browser.new_context() arguments for the warm-up context
+        """
+
+        browser_name = browser.browser_type.name
+        path = self.load(browser_name, browser.version)
+
+        if path:
+            logger.info(f"Using storage state snapshot: {path}")
+            return path
+
+        started = time.monotonic()
+        context = browser.new_context(**(context_args or {}))
+
+        try:
+            warm_up(context.new_page())
+            path = self.save(context, browser_name, browser.version)
+        finally:
+            context.close()
+
+        logger.info(f"Created storage state snapshot {path} in {time.monotonic() - started:.1f}s")
+
+        return path
@@ -0,0 +1,183 @@
+"""
+Waits
+Condition-based waits to use instead of fixed wait_for_timeout sleeps: a matching network response,
+DOM quiescence, and a change of an element's text or count
+"""
+
+import logging
+import re
+from typing import Callable, Optional, Pattern, Union
+
+from playwright.async_api import Locator as AsyncLocator, Page as AsyncPage, expect as async_expect
+from playwright.sync_api import Locator, Page, Response, TimeoutError as PlaywrightTimeoutError, expect
+
+logger = logging.getLogger(__name__)
+
+UrlPattern = Union[str, Pattern[str], Callable[[str], bool]]
+
+# Resolves true once no DOM mutation was seen for quietMs, or false when the deadline passes first
+DOM_QUIET_JS = """
+([selector, quietMs, timeoutMs]) => new Promise((resolve) => {
+    const root = (selector && document.querySelector(selector)) || document.documentElement;
+    const deadline = Date.now() + timeoutMs;
+    let quietTimer = null;
+    let deadlineTimer = null;
+
+    const finish = (quiet) => {
+        observer.disconnect();
+        clearTimeout(quietTimer);
+        clearTimeout(deadlineTimer);
+        resolve(quiet);
+    };
+    const restartQuietTimer = () => {
+        clearTimeout(quietTimer);
+        quietTimer = setTimeout(() => finish(true), Math.min(quietMs, Math.max(deadline - Date.now(), 0)));
+    };
+    const observer = new MutationObserver(restartQuietTimer);
+
+    observer.observe(root, {subtree: true, childList: true, attributes: true, characterData: true});
+    deadlineTimer = setTimeout(() => finish(false), timeoutMs);
+    restartQuietTimer();
+})
+"""
+
+
+def _response_matcher(url: UrlPattern, status: Optional[int]) -> Callable[[Response], bool]:
+    if callable(url):
+        url_matches = url
+    elif isinstance(url, str):
+        url_matches = lambda response_url: url in response_url
+    else:
+        url_matches = lambda response_url: re.search(url, response_url) is not None
+
+    return lambda response: url_matches(response.url) and (status is None or response.status == status)
+
+
+def wait_for_response(page: Page,
+                      url: UrlPattern,
+                      action: Optional[Callable[[], object]] = None,
+                      status: Optional[int] = None,
+                      timeout: int = 10000) -> Optional[Response]:
+    """
+    Run action (e.g. a click) and wait for the response it triggers
+
+    Args:
+        page: Page the request is made from
+        url: Substring, compiled regex or predicate of the response URL
+        action: Callable that triggers the request; without one, waits for the next matching response
+        status: Only accept this HTTP status
+        timeout: Milliseconds to wait for the response
+
+    Returns:
+        Response, or None if no matching response arrived in time
+    """
+
+    action_failed = False
+
+    try:
+        with page.expect_response(_response_matcher(url, status), timeout=timeout) as response_info:
+            if action is not None:
+                try:
+                    action()
+                except Exception:
+                    action_failed = True
+                    raise
+
+        return response_info.value
+    except PlaywrightTimeoutError:
+        # A timeout of the action itself (e.g. a click) is the caller's error, not a missing response
+        if action_failed:
+            raise
+
+        logger.debug(f"No response matching {url} within {timeout} ms")
+        return None
+
+
+def wait_for_dom_quiet(page: Page, quiet_ms: int = 300, timeout: int = 5000, selector: Optional[str] = None) -> bool:
+    """
+    Wait until the DOM (or the subtree under a CSS selector) had no mutations for quiet_ms
+
+    Returns:
+        bool: True once the DOM was quiet, False if it was still changing when timeout ran out
+    """
+
+    return page.evaluate(DOM_QUIET_JS, [selector, quiet_ms, timeout])
+
+
+def wait_for_text_change(locator: Locator, previous: str, timeout: int = 5000) -> bool:
+    """Wait until the element's text is no longer previous (capture it before the action); False on timeout"""
+
+    try:
+        expect(locator).not_to_have_text(previous, timeout=timeout)
+        return True
+    except AssertionError:
+        return False
+
+
+def wait_for_count_change(locator: Locator, previous: int, timeout: int = 5000) -> bool:
+    """Wait until the number of elements matching the locator is no longer previous; False on timeout"""
+
+    try:
+        expect(locator).not_to_have_count(previous, timeout=timeout)
+        return True
+    except AssertionError:
+        return False
+
+
+async def wait_for_response_async(page: AsyncPage,
+                                  url: UrlPattern,
+                                  action: Optional[Callable[[], object]] = None,
+                                  status: Optional[int] = None,
+                                  timeout: int = 10000):
+    """Async wait_for_response; action may return an awaitable (e.g. lambda: locator.click())"""
+
+    action_failed = False
+
+    try:
+        async with page.expect_response(_response_matcher(url, status), timeout=timeout) as response_info:
+            if action is not None:
+                try:
+                    result = action()
+
+                    if hasattr(result, "__await__"):
+                        await result
+                except Exception:
+                    action_failed = True
+                    raise
+
+        return await response_info.value
+    except PlaywrightTimeoutError:
+        if action_failed:
+            raise
+
+        logger.debug(f"No response matching {url} within {timeout} ms")
+        return None
+
+
+async def wait_for_dom_quiet_async(page: AsyncPage,
+                                   quiet_ms: int = 300,
+                                   timeout: int = 5000,
+                                   selector: Optional[str] = None) -> bool:
+    """Async wait_for_dom_quiet"""
+
+    return await page.evaluate(DOM_QUIET_JS, [selector, quiet_ms, timeout])
+
+
+async def wait_for_text_change_async(locator: AsyncLocator, previous: str, timeout: int = 5000) -> bool:
+    """Async wait_for_text_change"""
+
+    try:
+        await async_expect(locator).not_to_have_text(previous, timeout=timeout)
+        return True
+    except AssertionError:
+        return False
+
+
+async def wait_for_count_change_async(locator: AsyncLocator, previous: int, timeout: int = 5000) -> bool:
+    """Async wait_for_count_change"""
+
+    try:
+        await async_expect(locator).not_to_have_count(previous, timeout=timeout)
+        return True
+    except AssertionError:
+        return False
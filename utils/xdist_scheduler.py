@@ -0,0 +1,271 @@
+"""
+Xdist Scheduler
+Duration-aware, browser-affine replacement for xdist's 'load' scheduling: tests run longest-first
+(durations from earlier runs, kept in the pytest cache), and each browser parametrization is pinned
+to a subset of workers so a worker only ever launches one browser type
+"""
+
+import logging
+import re
+import statistics
+import time
+from collections import defaultdict
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+import pytest
+from xdist.scheduler import LoadScheduling
+
+from config.browser_config import BROWSERS
+
+logger = logging.getLogger(__name__)
+
+DURATIONS_CACHE_KEY = "xdist_scheduler/durations"
+DEFAULT_DURATION_S = 1.0  # for tests no run has timed yet, when nothing else is known
+
+# Items each worker holds: the one running and the next, which xdist needs to run teardown correctly
+WORKER_QUEUE_SIZE = 2
+
+_PARAMS_RE = re.compile(r"\[(.*)\]$")
+
+
+def browser_of_test(nodeid: str, browsers: Iterable[str] = BROWSERS) -> Optional[str]:
+    """Browser a test is parametrized with (e.g. 'test_cart[firefox]' or 'test_cart[webkit-3]'), or None"""
+
+    match = _PARAMS_RE.search(nodeid)
+
+    if not match:
+        return None
+
+    params = match.group(1).split("-")
+
+    return next((browser for browser in browsers if browser in params), None)
+
+
+def assign_browsers(loads: Dict[str, float], workers: List[str]) -> Dict[str, FrozenSet[str]]:
+    """
+    Pin browsers to workers in proportion to the predicted time of each browser's tests.
+    Every browser gets at least one worker; with more browsers than workers, some workers get several.
+
+    Args:
+        loads: Predicted seconds of the tests of each browser
+        workers: Worker ids (e.g. gw0, gw1...)
+
+    Returns:
+        dict: Browsers each worker may run (empty: any test)
+    """
+
+    pins: Dict[str, FrozenSet[str]] = {worker: frozenset() for worker in workers}
+    browsers = sorted(loads, key=lambda browser: loads[browser], reverse=True)
+
+    if not browsers or not workers:
+        return pins
+
+    if len(browsers) >= len(workers):
+        # Longest-first onto the least loaded worker
+        worker_loads = {worker: 0.0 for worker in workers}
+
+        for browser in browsers:
+            worker = min(workers, key=lambda w: worker_loads[w])
+            worker_loads[worker] += loads[browser]
+            pins[worker] = pins[worker] | {browser}
+
+        return pins
+
+    # One worker each, then every spare worker to the browser with the most time per worker
+    counts = {browser: 1 for browser in browsers}
+
+    for _ in range(len(workers) - len(browsers)):
+        counts[max(browsers, key=lambda browser: loads[browser] / counts[browser])] += 1
+
+    free_workers = iter(workers)
+
+    for browser in browsers:
+        for _ in range(counts[browser]):
+            pins[next(free_workers)] = frozenset({browser})
+
+    return pins
+
+
+def predict_makespan(items: Iterable[Tuple[float, Optional[str]]],
+                     pins: Dict[str, FrozenSet[str]]) -> Tuple[float, Dict[str, float]]:
+    """
+    Simulate longest-first scheduling: each test goes to the least loaded worker allowed to run it
+
+    Args:
+        items: (predicted seconds, browser or None) of each test
+        pins: Browsers each worker may run, as returned by assign_browsers
+
+    Returns:
+        tuple: Predicted makespan in seconds and the predicted busy time of each worker
+    """
+
+    worker_loads = {worker: 0.0 for worker in pins}
+
+    if not worker_loads:
+        return 0.0, worker_loads
+
+    for duration, browser in sorted(items, key=lambda item: item[0], reverse=True):
+        allowed = [worker for worker, browsers in pins.items() if not browsers or browser in browsers]
+        worker = min(allowed or list(pins), key=lambda w: worker_loads[w])
+        worker_loads[worker] += duration
+
+    return max(worker_loads.values()), worker_loads
+
+
+class DurationScheduling(LoadScheduling):
+    """
+    xdist 'load' scheduling that hands out the longest pending test a worker may run whenever the
+    worker's queue runs low, and shuts a worker down once nothing it may run is left
+    """
+
+    def __init__(self, config, log=None, durations: Optional[Dict[str, float]] = None):
+        super().__init__(config, log)
+        self.durations = durations or {}
+        self.default_duration = DEFAULT_DURATION_S
+        self.browsers: List[Optional[str]] = []
+        self.node2browsers: Dict = {}
+        self.predicted_makespan: Optional[float] = None
+        self.predicted_loads: Dict[str, float] = {}
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+
+    def _duration(self, index: int) -> float:
+        return self.durations.get(self.collection[index], self.default_duration)
+
+    @property
+    def actual_makespan(self) -> Optional[float]:
+        if self.started is None or self.finished is None:
+            return None
+
+        return self.finished - self.started
+
+    def schedule(self):
+        assert self.collection_is_completed
+
+        # Initial distribution already happened, reschedule on all nodes
+        if self.collection is not None:
+            for node in self.nodes:
+                self.check_schedule(node)
+            return
+
+        if not self._check_nodes_have_same_collection():
+            self.log("**Different tests collected, aborting run**")
+            return
+
+        self.collection = list(self.node2collection.values())[0]
+
+        if not self.collection:
+            return
+
+        known = [self.durations[nodeid] for nodeid in self.collection if nodeid in self.durations]
+        self.default_duration = statistics.median(known) if known else DEFAULT_DURATION_S
+        self.browsers = [browser_of_test(nodeid) for nodeid in self.collection]
+
+        # Longest first; ties keep pytest's order, which groups tests sharing fixtures
+        self.pending[:] = sorted(range(len(self.collection)), key=self._duration, reverse=True)
+
+        loads: Dict[str, float] = defaultdict(float)
+
+        for index, browser in enumerate(self.browsers):
+            if browser is not None:
+                loads[browser] += self._duration(index)
+
+        nodes = sorted(self.nodes, key=lambda node: node.gateway.id)
+        pins = assign_browsers(dict(loads), [node.gateway.id for node in nodes])
+        self.node2browsers = {node: pins[node.gateway.id] for node in nodes}
+        self.predicted_makespan, self.predicted_loads = predict_makespan(
+            [(self._duration(index), browser) for index, browser in enumerate(self.browsers)], pins)
+        self.started = time.monotonic()
+
+        for node in nodes:
+            self.check_schedule(node)
+
+    def _can_run(self, node, index: int) -> bool:
+        browser = self.browsers[index]
+        pins = self.node2browsers.get(node)
+
+        # Unparametrized tests and workers added after the initial plan run anything
+        if browser is None or not pins or browser in pins:
+            return True
+
+        # Nobody pinned to this browser is left (e.g. its worker crashed): any worker may take it
+        return not any(browser in browsers for other, browsers in self.node2browsers.items()
+                       if other in self.node2pending and not other.shutting_down)
+
+    def check_schedule(self, node, duration=0):
+        if node.shutting_down:
+            return
+
+        node_pending = self.node2pending[node]
+
+        if len(node_pending) < WORKER_QUEUE_SIZE:
+            self._send_tests(node, WORKER_QUEUE_SIZE - len(node_pending))
+
+        if not any(self._can_run(node, index) for index in self.pending):
+            node.shutdown()
+
+        self.log("num items waiting for node:", len(self.pending))
+
+    def mark_test_complete(self, node, item_index, duration=0):
+        super().mark_test_complete(node, item_index, duration)
+        self.finished = time.monotonic()
+
+    def _send_tests(self, node, num):
+        chosen = [index for index in self.pending if self._can_run(node, index)][:num]
+
+        if chosen:
+            self.pending[:] = [index for index in self.pending if index not in chosen]
+            self.node2pending[node].extend(chosen)
+            node.send_runtest_some(chosen)
+
+    def summary(self) -> str:
+        """Predicted vs actual makespan and the browsers each worker was pinned to"""
+
+        actual = f"{self.actual_makespan:.1f}s" if self.actual_makespan is not None else "n/a"
+        lines = [f"Predicted makespan {self.predicted_makespan:.1f}s, actual {actual} "
+                 f"over {len(self.node2browsers)} workers (longest first)"]
+
+        for node, browsers in sorted(self.node2browsers.items(), key=lambda item: item[0].gateway.id):
+            worker = node.gateway.id
+            lines.append(f"{worker}: {', '.join(sorted(browsers)) or 'any browser'}, "
+                         f"predicted {self.predicted_loads.get(worker, 0.0):.1f}s")
+
+        return "\n".join(lines)
+
+
+class DurationSchedulerPlugin:
+    """
+    Records the duration of every test into the pytest cache, and under 'pytest -n N' (dist 'load')
+    replaces xdist's scheduler with DurationScheduling. Registered on the controller only.
+    """
+
+    def __init__(self, config, enabled: bool = True):
+        self.cache = getattr(config, "cache", None)
+        self.enabled = enabled
+        self.durations: Dict[str, float] = self.cache.get(DURATIONS_CACHE_KEY, {}) if self.cache else {}
+        self.run_durations: Dict[str, float] = defaultdict(float)
+        self.scheduler: Optional[DurationScheduling] = None
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_xdist_make_scheduler(self, config, log):
+        if not self.enabled or config.getvalue("dist") != "load":
+            return None
+
+        self.scheduler = DurationScheduling(config, log, self.durations)
+
+        return self.scheduler
+
+    def pytest_runtest_logreport(self, report):
+        # Setup, call and teardown all take worker time
+        self.run_durations[report.nodeid] += report.duration
+
+    def pytest_sessionfinish(self, session):
+        if self.cache and self.run_durations:
+            durations = {**self.durations, **{nodeid: round(duration, 3)
+                                              for nodeid, duration in self.run_durations.items()}}
+            self.cache.set(DURATIONS_CACHE_KEY, durations)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.scheduler and self.scheduler.predicted_makespan is not None:
+            terminalreporter.write_sep("-", "xdist scheduling")
+            terminalreporter.write_line(self.scheduler.summary())